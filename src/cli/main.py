@@ -5,6 +5,7 @@ A command-line interface for managing and running DrawBot sketches.
 """
 
 import argparse
+import gc
 import sys
 from pathlib import Path
 from typing import Optional
@@ -238,6 +239,12 @@ def validate_sketch(args):
             return 1
 
         sm = SketchManager(project_path)
+        if args.all:
+            return validate_all_sketches(project_path, sm)
+        if not args.name:
+            print("❌ Give a sketch name, or --all to validate every sketch")
+            return 1
+
         sketch_path = sm.find_sketch(args.name)
 
         if not sketch_path:
@@ -261,6 +268,30 @@ def validate_sketch(args):
     return 0
 
 
+def validate_all_sketches(project_path: Path, sm: SketchManager) -> int:
+    """Validate every sketch and example, reporting the ones that fail."""
+    all_sketches = sm.list_all_sketches()
+    if not all_sketches:
+        print("📝 No sketches found.")
+        return 0
+
+    sr = SketchRunner(project_path)
+    results = sr.validate_many([sketch["path"] for sketch in all_sketches])
+
+    failed = 0
+    for sketch, result in zip(all_sketches, results):
+        if not result.success:
+            failed += 1
+            print(f"❌ {sketch['name']}: {result.error}")
+
+    if failed:
+        print(f"❌ Syntax errors in {failed} of {len(all_sketches)} sketches")
+        return 1
+
+    print(f"✅ All {len(all_sketches)} sketches have valid syntax")
+    return 0
+
+
 def project_info(args):
     """Show project information and status."""
     project_path = Path.cwd()
@@ -320,6 +351,10 @@ def start_live_server(args):
         try:
             import uvicorn
 
+            from ..core.preview_engine import (
+                DEFAULT_GC_THRESHOLD,
+                freeze_startup_objects,
+            )
             from ..server.live_preview_server import LivePreviewServer, create_app
         except ImportError as e:
             print(f"❌ Failed to import server dependencies: {e}")
@@ -352,6 +387,11 @@ def start_live_server(args):
         print("   Press Ctrl+C to stop the server")
         print()
 
+        # Long-lived server objects are built; keep them out of GC passes and
+        # collect less often while serving
+        gc.set_threshold(*DEFAULT_GC_THRESHOLD)
+        freeze_startup_objects()
+
         # Start server
         uvicorn.run(app, host="127.0.0.1", port=args.port)
 
@@ -426,7 +466,12 @@ Examples:
 
     # Validate command
     validate_parser = subparsers.add_parser("validate", help="Validate sketch syntax")
-    validate_parser.add_argument("name", help="Name of the sketch to validate")
+    validate_parser.add_argument(
+        "name", nargs="?", help="Name of the sketch to validate"
+    )
+    validate_parser.add_argument(
+        "--all", action="store_true", help="Validate every sketch and example"
+    )
     validate_parser.set_defaults(func=validate_sketch)
 
     # Info command
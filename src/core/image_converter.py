@@ -2,13 +2,14 @@
 ImageConverter - PDF to PNG conversion pipeline for preview generation.
 """
 
+import functools
 import io
 import tempfile
 import time
 import uuid
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Set, Union
 
 try:
     from PIL import Image
@@ -32,6 +33,12 @@ except ImportError:
     PSUTIL_AVAILABLE = False
 
 
+@functools.lru_cache(maxsize=32)
+def _scale_matrix(scale: float) -> "fitz.Matrix":
+    """Return a cached uniform scaling matrix for page rendering."""
+    return fitz.Matrix(scale, scale)
+
+
 @dataclass
 class ConversionResult:
     """Result of PDF to PNG conversion."""
@@ -66,6 +73,9 @@ class ImageConverter:
         self.quality = quality
         self.retina_scale = retina_scale
 
+        # Output directories already created by this converter
+        self._known_dirs: Set[Path] = set()
+
         # Check available conversion backends
         self.conversion_backends = []
         if PYMUPDF_AVAILABLE:
@@ -83,22 +93,72 @@ class ImageConverter:
         Returns:
             ConversionResult with conversion status and output path
         """
-        start_time = time.time()
-        peak_memory = None
+        start_time = time.perf_counter()
+
+        # Validate input
+        if not pdf_data:
+            return ConversionResult(success=False, error="Empty PDF data provided")
+
+        if len(pdf_data) < 10:
+            return ConversionResult(
+                success=False, error="PDF data too small to be valid"
+            )
+
+        return self._convert(pdf_data, output_dir, start_time)
+
+    def convert_pdf_file_to_png(
+        self, pdf_path: Path, output_dir: Path
+    ) -> ConversionResult:
+        """Convert a PDF file on disk to PNG image.
+
+        Opening by path lets PyMuPDF read the file directly rather than
+        copying it into memory first.
+
+        Args:
+            pdf_path: Path to the PDF file
+            output_dir: Directory to save the PNG file
+
+        Returns:
+            ConversionResult with conversion status and output path
+        """
+        start_time = time.perf_counter()
 
+        pdf_path = Path(pdf_path)
         try:
-            # Validate input
-            if not pdf_data:
-                return ConversionResult(success=False, error="Empty PDF data provided")
+            file_size = pdf_path.stat().st_size
+        except OSError:
+            return ConversionResult(
+                success=False, error=f"PDF file not found: {pdf_path}"
+            )
 
-            if len(pdf_data) < 10:
-                return ConversionResult(
-                    success=False, error="PDF data too small to be valid"
-                )
+        if file_size < 10:
+            return ConversionResult(
+                success=False, error="PDF data too small to be valid"
+            )
+
+        return self._convert(pdf_path, output_dir, start_time)
+
+    def _convert(
+        self, pdf_source: Union[bytes, Path], output_dir: Path, start_time: float
+    ) -> ConversionResult:
+        """Run the available backends on PDF bytes or a PDF file path.
 
-            # Ensure output directory exists
+        Args:
+            pdf_source: Raw PDF data or path to a PDF file
+            output_dir: Directory to save the PNG file
+            start_time: Time the conversion request started
+
+        Returns:
+            ConversionResult with conversion status and output path
+        """
+        peak_memory = None
+
+        try:
+            # Ensure output directory exists (once per converter)
             output_dir = Path(output_dir)
-            output_dir.mkdir(parents=True, exist_ok=True)
+            if output_dir not in self._known_dirs:
+                output_dir.mkdir(parents=True, exist_ok=True)
+                self._known_dirs.add(output_dir)
 
             # Monitor memory usage if available
             if PSUTIL_AVAILABLE:
@@ -110,9 +170,9 @@ class ImageConverter:
             for backend in self.conversion_backends:
                 try:
                     if backend == "pymupdf":
-                        result = self._convert_with_pymupdf(pdf_data, output_dir)
+                        result = self._convert_with_pymupdf(pdf_source, output_dir)
                     elif backend == "pil":
-                        result = self._convert_with_pil(pdf_data, output_dir)
+                        result = self._convert_with_pil(pdf_source, output_dir)
 
                     if result and result.success:
                         break
@@ -129,7 +189,7 @@ class ImageConverter:
                 )
 
             # Calculate final metrics
-            conversion_time = time.time() - start_time
+            conversion_time = time.perf_counter() - start_time
 
             if PSUTIL_AVAILABLE:
                 final_memory = process.memory_info().rss / 1024 / 1024  # MB
@@ -141,7 +201,7 @@ class ImageConverter:
             return result
 
         except Exception as e:
-            conversion_time = time.time() - start_time
+            conversion_time = time.perf_counter() - start_time
             return ConversionResult(
                 success=False,
                 error=f"Conversion failed: {str(e)}",
@@ -150,29 +210,28 @@ class ImageConverter:
             )
 
     def _convert_with_pymupdf(
-        self, pdf_data: bytes, output_dir: Path
+        self, pdf_source: Union[bytes, Path], output_dir: Path
     ) -> ConversionResult:
         """Convert PDF using PyMuPDF backend.
 
         Args:
-            pdf_data: Raw PDF data
+            pdf_source: Raw PDF data or path to a PDF file
             output_dir: Output directory
 
         Returns:
             ConversionResult with conversion status
         """
         try:
-            # Open PDF from memory
-            pdf_document = fitz.open(stream=pdf_data, filetype="pdf")
+            # Open PDF from disk when a path is given, otherwise from memory
+            if isinstance(pdf_source, Path):
+                pdf_document = fitz.open(str(pdf_source))
+            else:
+                pdf_document = fitz.open(stream=pdf_source, filetype="pdf")
 
             if pdf_document.page_count == 0:
                 pdf_document.close()
                 return ConversionResult(success=False, error="PDF contains no pages")
 
-            # Convert all pages to images and combine vertically
-            page_count = pdf_document.page_count
-            page_pixmaps = []
-
             # Calculate scaling for retina display quality using first page
             first_page = pdf_document[0]
             page_rect = first_page.rect
@@ -184,35 +243,42 @@ class ImageConverter:
 
             # Prefer retina scale, but cap at max dimensions
             scale = min(self.retina_scale, max_scale)
-            matrix = fitz.Matrix(scale, scale)
+            matrix = _scale_matrix(scale)
+
+            # Most sketches produce a single page; render it directly
+            page_count = pdf_document.page_count
+            if page_count == 1:
+                result = self._convert_single_page(first_page, matrix, output_dir)
+                pdf_document.close()
+                return result
 
-            # Render all pages to pixmaps
+            # Render all pages to pixmaps and combine vertically
+            page_pixmaps = []
             for page_num in range(page_count):
                 page = pdf_document[page_num]
                 pixmap = page.get_pixmap(matrix=matrix)
                 page_pixmaps.append(pixmap)
 
-            # If single page, use it directly
-            if page_count == 1:
-                final_pixmap = page_pixmaps[0]
-            else:
-                # Combine multiple pages vertically
-                page_width = page_pixmaps[0].width
-                page_height = page_pixmaps[0].height
-                total_height = page_height * page_count
+            page_width = page_pixmaps[0].width
+            page_height = page_pixmaps[0].height
+            total_height = page_height * page_count
 
-                # Create combined pixmap
-                final_pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, page_width, total_height))
-                final_pixmap.clear_with(value=255)  # White background
-
-                # Copy each page into the combined pixmap
-                for i, page_pixmap in enumerate(page_pixmaps):
-                    y_offset = i * page_height
-                    final_pixmap.copy(page_pixmap, fitz.IRect(0, y_offset, page_width, y_offset + page_height))
+            # Create combined pixmap
+            final_pixmap = fitz.Pixmap(
+                fitz.csRGB, fitz.IRect(0, 0, page_width, total_height)
+            )
+            final_pixmap.clear_with(value=255)  # White background
+
+            # Copy each page into the combined pixmap
+            for i, page_pixmap in enumerate(page_pixmaps):
+                y_offset = i * page_height
+                final_pixmap.copy(
+                    page_pixmap,
+                    fitz.IRect(0, y_offset, page_width, y_offset + page_height),
+                )
 
-                # Cleanup individual page pixmaps
-                for pixmap in page_pixmaps:
-                    pixmap = None
+            # Cleanup individual page pixmaps
+            page_pixmaps = None
 
             # Generate unique filename
             output_filename = f"preview_{uuid.uuid4().hex[:8]}.png"
@@ -232,11 +298,33 @@ class ImageConverter:
                 success=False, error=f"PyMuPDF conversion failed: {str(e)}"
             )
 
-    def _convert_with_pil(self, pdf_data: bytes, output_dir: Path) -> ConversionResult:
+    def _convert_single_page(
+        self, page: "fitz.Page", matrix: "fitz.Matrix", output_dir: Path
+    ) -> ConversionResult:
+        """Render a single PDF page straight to PNG.
+
+        Args:
+            page: PDF page to render
+            matrix: Scaling matrix for rendering
+            output_dir: Output directory
+
+        Returns:
+            ConversionResult with conversion status
+        """
+        pixmap = page.get_pixmap(matrix=matrix, alpha=False)
+
+        output_path = output_dir / f"preview_{uuid.uuid4().hex[:8]}.png"
+        pixmap.save(str(output_path))
+
+        return ConversionResult(success=True, png_path=output_path)
+
+    def _convert_with_pil(
+        self, pdf_source: Union[bytes, Path], output_dir: Path
+    ) -> ConversionResult:
         """Convert PDF using PIL backend (limited support).
 
         Args:
-            pdf_data: Raw PDF data
+            pdf_source: Raw PDF data or path to a PDF file
             output_dir: Output directory
 
         Returns:
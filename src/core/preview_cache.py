@@ -2,21 +2,491 @@
 PreviewCache - Preview image storage and cleanup system for live preview.
 """
 
+import atexit
+import heapq
 import json
+import multiprocessing
+import os
+import queue
 import shutil
+import subprocess
 import threading
 import time
 import uuid
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
 from dataclasses import asdict, dataclass
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 try:
-    from PIL import Image
+    from PIL import Image, features
+    from PIL.PngImagePlugin import PngInfo
     PIL_AVAILABLE = True
+    WEBP_AVAILABLE = features.check("webp")
 except ImportError:
     PIL_AVAILABLE = False
+    WEBP_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import pyvips
+    VIPS_AVAILABLE = True
+except (ImportError, OSError):
+    VIPS_AVAILABLE = False
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Thumbnails are WebP when an encoder is available: smaller and faster to
+# encode than PNG
+THUMBNAIL_SUFFIX = ".webp" if WEBP_AVAILABLE else ".png"
+
+# File types written to the cache directory
+CACHE_FILE_SUFFIXES = (".png", ".webp")
+
+# Seconds after which a leftover ".tmp" file is taken to be from a crashed
+# write rather than one still in progress
+STALE_TEMP_SECONDS = 60
+
+# Background colour used to letterbox thumbnails
+THUMBNAIL_BACKGROUND = (240, 240, 240)
+
+# Minimum seconds between background metadata writes
+METADATA_FLUSH_INTERVAL = 0.5
+
+# Write-ahead log size at which it is compacted into the metadata snapshot
+WAL_COMPACT_BYTES = 1024 * 1024
+
+# Worker processes must not be forked from a parent running background
+# threads, which can leave locks held in the child
+_POOL_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# Queued thumbnail requests are dispatched to the process pool in batches
+THUMBNAIL_BATCH_SIZE = 16
+THUMBNAIL_BATCH_WAIT = 0.02
+
+# Background executors shared by every cache, created on first use
+_executors_lock = threading.Lock()
+_thumb_pool: Optional[ProcessPoolExecutor] = None
+_optimizer_pool: Optional[ThreadPoolExecutor] = None
+
+# Open caches, whose pending metadata is compacted at exit
+_live_caches: "weakref.WeakSet[PreviewCache]" = weakref.WeakSet()
+
+
+def _get_thumb_pool() -> ProcessPoolExecutor:
+    """Process pool for CPU-bound thumbnail resampling."""
+    global _thumb_pool
+    with _executors_lock:
+        if _thumb_pool is None:
+            _thumb_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count(), mp_context=_POOL_CONTEXT
+            )
+        return _thumb_pool
+
+
+def _discard_thumb_pool(pool: ProcessPoolExecutor):
+    """Drop a crashed pool so the next request starts a fresh one."""
+    global _thumb_pool
+    with _executors_lock:
+        if _thumb_pool is pool:
+            _thumb_pool = None
+    pool.shutdown(wait=False)
+
+
+def _get_optimizer_pool() -> ThreadPoolExecutor:
+    """Single thread recompressing stored PNGs to save cache space."""
+    global _optimizer_pool
+    with _executors_lock:
+        if _optimizer_pool is None:
+            _optimizer_pool = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="preview-cache-optimizer"
+            )
+        return _optimizer_pool
+
+
+def _metadata_writer(cache_ref, dirty: threading.Event, stop: threading.Event):
+    """Background loop that compacts the metadata log when it grows too large.
+
+    Holds only a weak reference so an unused cache can be garbage collected.
+    """
+    while not stop.is_set():
+        if not dirty.wait(METADATA_FLUSH_INTERVAL):
+            if cache_ref() is None:
+                return
+            continue
+        if stop.is_set():
+            return  # close() flushes whatever is pending
+
+        cache = cache_ref()
+        if cache is None:
+            return
+        cache.flush_metadata()
+        del cache
+
+        # Coalesce further changes into the next write
+        stop.wait(METADATA_FLUSH_INTERVAL)
+
+
+def _thumbnail_batcher(cache_ref, jobs: queue.SimpleQueue, stop: threading.Event):
+    """Background loop that renders queued thumbnails in batches.
+
+    Waits for one request, then collects more for up to
+    THUMBNAIL_BATCH_WAIT seconds so a burst of saves is submitted together.
+    """
+    while not stop.is_set():
+        try:
+            job = jobs.get(timeout=METADATA_FLUSH_INTERVAL)
+        except queue.Empty:
+            if cache_ref() is None:
+                return
+            continue
+        if job is None:
+            return
+
+        batch = [job]
+        deadline = time.monotonic() + THUMBNAIL_BATCH_WAIT
+        while len(batch) < THUMBNAIL_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                job = jobs.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if job is None:
+                stop.set()
+                break
+            batch.append(job)
+
+        cache = cache_ref()
+        if cache is None:
+            return
+        try:
+            cache._process_thumbnail_batch(batch)
+        except Exception:
+            pass  # Thumbnails are regenerated on demand
+        del cache
+
+
+def _dump_json(data: Any) -> bytes:
+    """Encode metadata compactly, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def _load_json(payload: bytes) -> Any:
+    """Decode metadata, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def _entry_size_bytes(entry: "CacheEntry") -> int:
+    """Bytes on disk for an entry's preview plus its thumbnail."""
+    size = entry.file_size_bytes
+    if entry.thumbnail_path:
+        size += entry.thumbnail_size_bytes or 0
+    return size
+
+
+@atexit.register
+def _flush_at_exit():
+    """Compact pending metadata for caches still open at exit."""
+    for cache in list(_live_caches):
+        if cache._dirty.is_set():
+            cache.flush_metadata()
+
+
+def _render_path_for(thumbnail_path: Path) -> Path:
+    """Private file a thumbnail is rendered to before being published.
+
+    Keeps the final suffix, which selects the encoder.
+    """
+    return thumbnail_path.with_name(
+        f"{thumbnail_path.stem}.{uuid.uuid4().hex[:8]}.tmp{thumbnail_path.suffix}"
+    )
+
+
+def _unlink_quietly(path: Path):
+    """Remove a file, ignoring errors such as it not existing."""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _png_save_metadata(img: "Image.Image") -> Dict[str, Any]:
+    """Keyword arguments that make Pillow re-save a PNG's metadata.
+
+    Pillow drops ancillary chunks unless they are passed back explicitly:
+    the colour profile, physical pixel density (pHYs, 216 dpi for DrawBot
+    renders), transparency, EXIF and text chunks.
+    """
+    kwargs = {
+        key: img.info[key]
+        for key in ("icc_profile", "dpi", "transparency", "exif")
+        if img.info.get(key) is not None
+    }
+    text = getattr(img, "text", None)
+    if text:
+        pnginfo = PngInfo()
+        for key, value in text.items():
+            pnginfo.add_text(key, value)
+        kwargs["pnginfo"] = pnginfo
+    return kwargs
+
+
+def _generate_thumbnail_worker(
+    full_image_path: Path,
+    thumbnail_path: Path,
+    thumbnail_size: tuple,
+    letterbox: bool = False,
+) -> bool:
+    """Generate thumbnail from full-size image.
+
+    Defined at module level so it can run in a worker process. Uses libvips
+    when available and falls back to Pillow.
+
+    Args:
+        full_image_path: Path to the full-size image
+        thumbnail_path: Path where thumbnail should be saved
+        thumbnail_size: Maximum thumbnail dimensions (width, height)
+        letterbox: Pad the thumbnail to exactly thumbnail_size
+
+    Returns:
+        True if thumbnail was generated successfully
+    """
+    if VIPS_AVAILABLE and _generate_thumbnail_vips(
+        full_image_path, thumbnail_path, thumbnail_size, letterbox
+    ):
+        return True
+
+    return _generate_thumbnail_pil(
+        full_image_path, thumbnail_path, thumbnail_size, letterbox
+    )
+
+
+def _generate_thumbnail_vips(
+    full_image_path: Path,
+    thumbnail_path: Path,
+    thumbnail_size: tuple,
+    letterbox: bool = False,
+) -> bool:
+    """Generate thumbnail with libvips' streaming shrink-on-load pipeline.
+
+    Args:
+        full_image_path: Path to the full-size image
+        thumbnail_path: Path where thumbnail should be saved
+        thumbnail_size: Maximum thumbnail dimensions (width, height)
+        letterbox: Pad the thumbnail to exactly thumbnail_size
+
+    Returns:
+        True if thumbnail was generated successfully
+    """
+    try:
+        thumb_width, thumb_height = thumbnail_size
+
+        # Header-only open; pixels are not decoded here
+        source = pyvips.Image.new_from_file(str(full_image_path))
+        if (
+            thumbnail_path.suffix == ".png"
+            and source.get("vips-loader").startswith("pngload")
+            and source.width <= thumb_width
+            and source.height <= thumb_height
+            and not letterbox
+        ):
+            shutil.copyfile(full_image_path, thumbnail_path)
+            return True
+
+        img = pyvips.Image.thumbnail(
+            str(full_image_path), thumb_width, height=thumb_height, size="down"
+        )
+
+        # Pad to the exact thumbnail size only when asked to
+        if letterbox and (img.width, img.height) != (thumb_width, thumb_height):
+            if img.hasalpha():
+                img = img.flatten(background=list(THUMBNAIL_BACKGROUND))
+            img = img.gravity(
+                "centre",
+                thumb_width,
+                thumb_height,
+                extend="background",
+                background=list(THUMBNAIL_BACKGROUND),
+            )
+
+        if thumbnail_path.suffix == ".webp":
+            img.write_to_file(f"{thumbnail_path}[Q=80,strip]")
+        else:
+            img.write_to_file(f"{thumbnail_path}[compression=1,strip]")
+        return True
+
+    except Exception:
+        return False
+
+
+def _generate_thumbnail_pil(
+    full_image_path: Path,
+    thumbnail_path: Path,
+    thumbnail_size: tuple,
+    letterbox: bool = False,
+) -> bool:
+    """Generate thumbnail with Pillow.
+
+    Args:
+        full_image_path: Path to the full-size image
+        thumbnail_path: Path where thumbnail should be saved
+        thumbnail_size: Maximum thumbnail dimensions (width, height)
+        letterbox: Pad the thumbnail to exactly thumbnail_size
+
+    Returns:
+        True if thumbnail was generated successfully
+    """
+    if not PIL_AVAILABLE:
+        return False
+        
+    try:
+        with Image.open(full_image_path) as img:
+            thumb_width, thumb_height = thumbnail_size
+
+            # Small PNGs already fit; reuse the original bytes as-is
+            if (
+                thumbnail_path.suffix == ".png"
+                and img.format == "PNG"
+                and img.size[0] <= thumb_width
+                and img.size[1] <= thumb_height
+                and not letterbox
+            ):
+                shutil.copyfile(full_image_path, thumbnail_path)
+                return True
+
+            # Let JPEG decoding downscale via DCT before resampling
+            img.draft("RGB", (thumb_width * 2, thumb_height * 2))
+
+            # Convert to RGB if necessary (for consistent output)
+            if img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGB")
+
+            # Calculate thumbnail size maintaining aspect ratio; reducing_gap
+            # does a cheap pre-shrink before the LANCZOS pass
+            img.thumbnail(thumbnail_size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+
+            # Variable-size thumbnails are centred by the browser
+            if not letterbox or (img.size == thumbnail_size and img.mode == "RGB"):
+                _save_thumbnail(img, thumbnail_path)
+                return True
+
+            # Create a canvas with the exact thumbnail size and center the image
+            canvas = Image.new("RGB", (thumb_width, thumb_height), THUMBNAIL_BACKGROUND)
+
+            # Calculate position to center the image
+            img_width, img_height = img.size
+            x = (thumb_width - img_width) // 2
+            y = (thumb_height - img_height) // 2
+            
+            # Paste the image onto the canvas
+            if img.mode == "RGBA":
+                canvas.paste(img, (x, y), img)
+            else:
+                canvas.paste(img, (x, y))
+            
+            # Save thumbnail
+            _save_thumbnail(canvas, thumbnail_path)
+            return True
+            
+    except Exception:
+        return False
+
+
+def _save_thumbnail(img: "Image.Image", thumbnail_path: Path):
+    """Encode a thumbnail in the format given by its file suffix."""
+    if thumbnail_path.suffix == ".webp":
+        img.save(thumbnail_path, "WEBP", quality=80, method=4)
+    else:
+        # Fast deflate; thumbnails are small and rewritten often
+        img.save(thumbnail_path, "PNG", compress_level=1)
+
+
+class _ReadWriteLock:
+    """Reentrant readers-writer lock.
+
+    Any number of threads may hold the read lock at once; the write lock is
+    exclusive. A thread holding the write lock may also take the read lock,
+    but a reader cannot upgrade to a writer. Waiting writers block new
+    readers so writes are not starved.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers: Dict[int, int] = {}
+        self._writer: Optional[int] = None
+        self._writer_depth = 0
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read_lock(self):
+        """Hold the lock shared with other readers."""
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer != me and me not in self._readers:
+                while self._writer is not None or self._writers_waiting:
+                    self._cond.wait()
+            self._readers[me] = self._readers.get(me, 0) + 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                count = self._readers[me] - 1
+                if count:
+                    self._readers[me] = count
+                else:
+                    del self._readers[me]
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write_lock(self):
+        """Hold the lock exclusively."""
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._writer_depth += 1
+            else:
+                if me in self._readers:
+                    raise RuntimeError("Cannot upgrade a read lock to a write lock")
+                self._writers_waiting += 1
+                try:
+                    while self._writer is not None or self._readers:
+                        self._cond.wait()
+                finally:
+                    self._writers_waiting -= 1
+                self._writer = me
+                self._writer_depth = 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer_depth -= 1
+                if not self._writer_depth:
+                    self._writer = None
+                    self._cond.notify_all()
 
 
 @dataclass
@@ -26,18 +496,23 @@ class CacheEntry:
     sketch_name: str
     version: int
     file_path: Path
-    created_at: datetime
+    created_at_ms: int  # Epoch milliseconds
     file_size_bytes: int
     thumbnail_path: Optional[Path] = None
     thumbnail_size_bytes: Optional[int] = None
 
+    @property
+    def created_at(self) -> datetime:
+        """Creation time as a local datetime."""
+        return datetime.fromtimestamp(self.created_at_ms / 1000)
+
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
         return {
             "sketch_name": self.sketch_name,
             "version": self.version,
             "file_path": str(self.file_path),
-            "created_at": self.created_at.isoformat(),
+            "created_at_ms": self.created_at_ms,
             "file_size_bytes": self.file_size_bytes,
             "thumbnail_path": str(self.thumbnail_path) if self.thumbnail_path else None,
             "thumbnail_size_bytes": self.thumbnail_size_bytes,
@@ -46,11 +521,18 @@ class CacheEntry:
     @classmethod
     def from_dict(cls, data: dict) -> "CacheEntry":
         """Create from dictionary."""
+        if "created_at_ms" in data:
+            created_at_ms = data["created_at_ms"]
+        else:
+            # Metadata written before timestamps were stored as integers
+            created_at = datetime.fromisoformat(data["created_at"])
+            created_at_ms = int(created_at.timestamp() * 1000)
+
         return cls(
             sketch_name=data["sketch_name"],
             version=data["version"],
             file_path=Path(data["file_path"]),
-            created_at=datetime.fromisoformat(data["created_at"]),
+            created_at_ms=created_at_ms,
             file_size_bytes=data["file_size_bytes"],
             thumbnail_path=Path(data["thumbnail_path"]) if data.get("thumbnail_path") else None,
             thumbnail_size_bytes=data.get("thumbnail_size_bytes"),
@@ -80,6 +562,7 @@ class PreviewCache:
         max_total_size_mb: float = 100,
         max_age_hours: int = 24,
         thumbnail_size: tuple = (300, 200),
+        letterbox_thumbnails: bool = False,
     ):
         """Initialize preview cache.
 
@@ -88,42 +571,123 @@ class PreviewCache:
             max_versions_per_sketch: Maximum versions to keep per sketch
             max_total_size_mb: Maximum total cache size in MB
             max_age_hours: Maximum age for cache entries in hours
-            thumbnail_size: Thumbnail dimensions (width, height)
+            thumbnail_size: Maximum thumbnail dimensions (width, height)
+            letterbox_thumbnails: Pad thumbnails to exactly thumbnail_size
+                instead of keeping the image's own aspect ratio
         """
         self.cache_dir = Path(cache_dir)
+        # Path prefix for cache files, built once so stores only concatenate
+        self._cache_dir_str = str(self.cache_dir) + os.sep
         self.max_versions_per_sketch = max_versions_per_sketch
         self.max_total_size_mb = max_total_size_mb
         self.max_age_hours = max_age_hours
         self.thumbnail_size = thumbnail_size
+        self.letterbox_thumbnails = letterbox_thumbnails
+
+        # Thread safety: lookups share the lock, mutations hold it exclusively
+        self._rw = _ReadWriteLock()
+
+        # PNG recompressions submitted to the shared optimizer, until done
+        self._optimizing: Set[Future] = set()
 
-        # Thread safety
-        self.lock = threading.RLock()
+        # Thumbnail requests queued by queue_thumbnail()
+        self._thumb_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+        # Changes are appended to a write-ahead log; a background thread
+        # compacts it into the metadata snapshot once it grows too large
+        self._dirty = threading.Event()
+        self._stop = threading.Event()
+        self._save_lock = threading.Lock()
 
         # Cache metadata
         self.metadata_file = self.cache_dir / ".cache_metadata.json"
+        self.wal_file = self.cache_dir / ".cache_wal.jsonl"
+        self._wal = None
+        # Cleared when another live instance holds the change log
+        self._owns_metadata = True
+        self._wal_bytes = 0
         self.entries: Dict[str, List[CacheEntry]] = {}
+        self._by_version: Dict[Tuple[str, int], CacheEntry] = {}
+
+        # Running total of bytes held by all entries and their thumbnails
+        self._total_bytes = 0
+
+        # Incremented on every change to the entries, so callers can tell
+        # whether anything derived from them is stale
+        self.generation = 0
 
         # Initialize cache
         self._initialize_cache()
 
+        self._metadata_writer = threading.Thread(
+            target=_metadata_writer,
+            args=(weakref.ref(self), self._dirty, self._stop),
+            name="preview-cache-metadata",
+            daemon=True,
+        )
+        self._metadata_writer.start()
+        self._thumbnail_batcher = threading.Thread(
+            target=_thumbnail_batcher,
+            args=(weakref.ref(self), self._thumb_queue, self._stop),
+            name="preview-cache-thumbnails",
+            daemon=True,
+        )
+        self._thumbnail_batcher.start()
+        _live_caches.add(self)
+
     def _initialize_cache(self):
         """Initialize cache directory and load existing metadata."""
-        with self.lock:
+        with self._rw.write_lock():
             # Create cache directory
             self.cache_dir.mkdir(parents=True, exist_ok=True)
 
+            # Take the change log before reading it, so no other instance
+            # compacts it while it is replayed
+            self._wal = self._open_wal()
+
             # Load existing metadata
             self._load_metadata()
 
-            # Clean up orphaned files and validate entries
-            self._validate_cache_integrity()
+            # Validate entries; only the owner may treat unknown files as
+            # orphans, since the live owner may be writing them
+            self._validate_cache_integrity(remove_orphans=self._owns_metadata)
+
+            # Start from a compact snapshot so the log stays short to replay
+            if self._wal is not None:
+                self._wal_bytes = self._wal.tell()
+                if self._wal_bytes:
+                    self._save_metadata()
+
+    def _open_wal(self):
+        """Open the change log for appending and lock it for this instance.
+
+        The log has a single writer. Compaction writes only this instance's
+        entries to the snapshot before truncating the log, which would drop
+        records appended by anyone else. An instance that finds the log
+        locked by another live instance works from the metadata as loaded,
+        keeps its own changes in memory only and never compacts.
+
+        Returns:
+            The open log, or None if it cannot be opened or is locked
+        """
+        try:
+            wal = open(self.wal_file, "ab", buffering=0)
+        except OSError:
+            return None
+        if FCNTL_AVAILABLE:
+            try:
+                fcntl.flock(wal.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                wal.close()
+                self._owns_metadata = False
+                return None
+        return wal
 
     def _load_metadata(self):
-        """Load cache metadata from disk."""
+        """Load the metadata snapshot from disk and replay the change log."""
         try:
             if self.metadata_file.exists():
-                with open(self.metadata_file, "r") as f:
-                    data = json.load(f)
+                data = _load_json(self.metadata_file.read_bytes())
 
                 # Convert to CacheEntry objects
                 for sketch_name, entry_list in data.items():
@@ -134,8 +698,68 @@ class PreviewCache:
             # If metadata is corrupted, start fresh
             self.entries = {}
 
+        try:
+            if not self.wal_file.exists():
+                return
+            with open(self.wal_file, "rb") as f:
+                records = f.read().splitlines()
+        except OSError:
+            return
+
+        entries = {
+            (entry.sketch_name, entry.version): entry
+            for entry_list in self.entries.values()
+            for entry in entry_list
+        }
+        for line in records:
+            try:
+                record = _load_json(line)
+                if record["op"] == "put":
+                    entry = CacheEntry.from_dict(record["entry"])
+                    entries[(entry.sketch_name, entry.version)] = entry
+                elif record["op"] == "del":
+                    entries.pop((record["sketch"], record["version"]), None)
+            except Exception:
+                break  # Torn write at the end of the log
+
+        # Regroup per sketch, newest first
+        self.entries = {}
+        for entry in sorted(entries.values(), key=lambda e: e.version, reverse=True):
+            self.entries.setdefault(entry.sketch_name, []).append(entry)
+
+    def _log_metadata(self, record: Dict[str, Any]):
+        """Append one metadata change to the write-ahead log.
+
+        Args:
+            record: Change record, either a "put" of an entry or a "del"
+        """
+        self.generation += 1
+        if self._wal is None:
+            return
+        try:
+            line = _dump_json(record) + b"\n"
+            self._wal.write(line)
+            self._wal_bytes += len(line)
+        except Exception:
+            return  # The snapshot is rebuilt from files on next load
+
+        if self._wal_bytes > WAL_COMPACT_BYTES:
+            self._dirty.set()
+
+    def _log_put(self, entry: CacheEntry):
+        """Record an added or updated entry in the write-ahead log."""
+        self._log_metadata({"op": "put", "entry": entry.to_dict()})
+
+    def flush_metadata(self):
+        """Compact the write-ahead log into the metadata snapshot now."""
+        with self._rw.read_lock():
+            self._dirty.clear()
+            self._save_metadata()
+
     def _save_metadata(self):
-        """Save cache metadata to disk."""
+        """Save a metadata snapshot to disk and truncate the change log."""
+        if not self._owns_metadata:
+            return  # The instance holding the log writes the snapshot
         try:
             # Convert to serializable format
             data = {}
@@ -143,20 +767,37 @@ class PreviewCache:
                 data[sketch_name] = [entry.to_dict() for entry in entry_list]
 
             # Write atomically
-            temp_file = self.metadata_file.with_suffix(".tmp")
-            with open(temp_file, "w") as f:
-                json.dump(data, f, indent=2)
+            payload = _dump_json(data)
+            with self._save_lock:
+                temp_file = self.metadata_file.with_suffix(".tmp")
+                temp_file.write_bytes(payload)
+                os.replace(temp_file, self.metadata_file)
 
-            temp_file.replace(self.metadata_file)
+                # Everything logged so far is now in the snapshot
+                if self._wal is not None:
+                    self._wal.truncate(0)
+                    self._wal_bytes = 0
 
         except Exception:
             # Ignore metadata save errors - cache will rebuild from files
             pass
 
-    def _validate_cache_integrity(self):
-        """Validate cache integrity and remove orphaned files."""
-        # Find all PNG files in cache directory
-        existing_files = set(self.cache_dir.glob("*.png"))
+    def _validate_cache_integrity(self, remove_orphans: bool = True):
+        """Validate cache integrity and remove orphaned files.
+
+        Args:
+            remove_orphans: Delete cache files no entry refers to, and
+                temporary files left behind by interrupted writes
+        """
+        # Find all image and temporary files with a single directory scan
+        existing_files = set()
+        temp_files = []
+        with os.scandir(self.cache_dir) as it:
+            for e in it:
+                if e.name.endswith(CACHE_FILE_SUFFIXES) and e.is_file():
+                    existing_files.add(e.name)
+                elif e.name.endswith(".tmp") and e.is_file():
+                    temp_files.append(e)
 
         # Find referenced files in metadata
         referenced_files = set()
@@ -165,11 +806,17 @@ class PreviewCache:
         for sketch_name, entry_list in self.entries.items():
             valid_entry_list = []
             for entry in entry_list:
-                if entry.file_path.exists():
-                    referenced_files.add(entry.file_path)
+                if entry.file_path.name in existing_files:
+                    referenced_files.add(entry.file_path.name)
                     # Also track thumbnail files
-                    if entry.thumbnail_path and entry.thumbnail_path.exists():
-                        referenced_files.add(entry.thumbnail_path)
+                    if (
+                        entry.thumbnail_path
+                        and entry.thumbnail_path.name in existing_files
+                    ):
+                        referenced_files.add(entry.thumbnail_path.name)
+                    else:
+                        entry.thumbnail_path = None
+                        entry.thumbnail_size_bytes = None
                     valid_entry_list.append(entry)
 
             if valid_entry_list:
@@ -178,14 +825,33 @@ class PreviewCache:
         # Update entries to only valid ones
         self.entries = valid_entries
 
+        # Rebuild the version index and size total from the surviving entries
+        self._by_version = {}
+        self._total_bytes = 0
+        for entry_list in self.entries.values():
+            for entry in reversed(entry_list):
+                self._by_version[(entry.sketch_name, entry.version)] = entry
+                self._total_bytes += _entry_size_bytes(entry)
+
         # Remove orphaned files
+        if not remove_orphans:
+            return
         orphaned_files = existing_files - referenced_files
         for orphaned_file in orphaned_files:
             try:
-                orphaned_file.unlink()
+                os.unlink(self._cache_dir_str + orphaned_file)
             except:
                 pass  # Ignore cleanup errors
 
+        # Remove temporary files too old to belong to a write in progress
+        stale_before = time.time() - STALE_TEMP_SECONDS
+        for temp_file in temp_files:
+            try:
+                if temp_file.stat().st_mtime < stale_before:
+                    os.unlink(temp_file.path)
+            except OSError:
+                pass  # Ignore cleanup errors
+
     def store_preview(self, sketch_name: str, image_data: bytes) -> CacheResult:
         """Store a preview image in the cache.
 
@@ -196,10 +862,51 @@ class PreviewCache:
         Returns:
             CacheResult with storage status and preview information
         """
-        with self.lock:
+        if not image_data:
+            return CacheResult(success=False, error="Empty image data provided")
+        return self._store_preview(sketch_name, image_data=image_data)
+
+    def store_preview_from_path(
+        self, sketch_name: str, source_path: Path
+    ) -> CacheResult:
+        """Store an image file in the cache without reading it into memory.
+
+        The file is copied with ``shutil.copyfile``, which copies in the
+        kernel (``sendfile`` on Linux, ``fcopyfile`` on macOS) where it can.
+
+        Args:
+            sketch_name: Name of the sketch
+            source_path: Path to the image file to store
+
+        Returns:
+            CacheResult with storage status and preview information
+        """
+        return self._store_preview(sketch_name, source_path=Path(source_path))
+
+    def _store_preview(
+        self,
+        sketch_name: str,
+        image_data: Optional[bytes] = None,
+        source_path: Optional[Path] = None,
+    ) -> CacheResult:
+        """Store preview bytes or a copy of an image file in the cache.
+
+        Args:
+            sketch_name: Name of the sketch
+            image_data: Image data to write, or None to copy source_path
+            source_path: Image file to copy when image_data is None
+
+        Returns:
+            CacheResult with storage status and preview information
+        """
+        with self._rw.write_lock():
             try:
                 # Validate input
-                if not image_data:
+                if image_data is not None:
+                    file_size = len(image_data)
+                else:
+                    file_size = os.stat(source_path).st_size
+                if not file_size:
                     return CacheResult(success=False, error="Empty image data provided")
 
                 if not sketch_name or not sketch_name.strip():
@@ -207,47 +914,60 @@ class PreviewCache:
                         success=False, error="Invalid sketch name provided"
                     )
 
-                # Generate version number (timestamp-based)
+                # Generate version number (timestamp-based), kept unique per
+                # sketch so (sketch, version) identifies one entry
                 version = int(time.time() * 1000)  # Millisecond timestamp
-
-                # Generate filename
-                filename = f"{sketch_name}_v{version}.png"
-                file_path = self.cache_dir / filename
-
-                # Ensure unique filename
-                counter = 1
-                while file_path.exists():
-                    filename = f"{sketch_name}_v{version}_{counter}.png"
-                    file_path = self.cache_dir / filename
-                    counter += 1
-
-                # Write image data
-                with open(file_path, "wb") as f:
-                    f.write(image_data)
+                newest = self.get_current_preview(sketch_name)
+                if newest and newest.version >= version:
+                    version = newest.version + 1
+
+                # Generate a unique filename; the random suffix makes
+                # collisions between same-millisecond stores effectively impossible
+                filename = f"{sketch_name}_v{version}_{uuid.uuid4().hex[:8]}.png"
+                full_path = self._cache_dir_str + filename
+
+                # Write to a temporary file and rename so a crash never leaves
+                # a truncated preview behind
+                temp_path = full_path + ".tmp"
+                try:
+                    if image_data is not None:
+                        with open(temp_path, "wb") as f:
+                            f.write(image_data)
+                    else:
+                        shutil.copyfile(source_path, temp_path)
+                    os.replace(temp_path, full_path)
+                except BaseException:
+                    _unlink_quietly(temp_path)
+                    raise
+                file_path = Path(full_path)
 
                 # Create cache entry
                 entry = CacheEntry(
                     sketch_name=sketch_name,
                     version=version,
                     file_path=file_path,
-                    created_at=datetime.now(),
-                    file_size_bytes=len(image_data),
+                    created_at_ms=version,
+                    file_size_bytes=file_size,
                 )
 
-                # Add to cache entries
-                if sketch_name not in self.entries:
-                    self.entries[sketch_name] = []
-
-                self.entries[sketch_name].append(entry)
-
-                # Sort by version (newest first)
-                self.entries[sketch_name].sort(key=lambda x: x.version, reverse=True)
+                # Add to cache entries; the new version is always the newest
+                self.entries.setdefault(sketch_name, []).insert(0, entry)
+                self._by_version[(sketch_name, version)] = entry
+                self._total_bytes += entry.file_size_bytes
+                self._log_put(entry)
 
                 # Cleanup old versions for this sketch
                 self._cleanup_sketch_versions(sketch_name)
 
-                # Save metadata
-                self._save_metadata()
+                # Recompress in the background; the file is usable meanwhile
+                if (
+                    image_data.startswith(PNG_SIGNATURE)
+                    if image_data is not None
+                    else source_path.suffix.lower() == ".png"
+                ):
+                    future = _get_optimizer_pool().submit(self._optimize_png, entry)
+                    self._optimizing.add(future)
+                    future.add_done_callback(self._optimizing.discard)
 
                 # Generate preview URL
                 preview_url = f"/preview/{filename}?v={version}"
@@ -267,6 +987,64 @@ class PreviewCache:
                     success=False, error=f"Failed to store preview: {str(e)}"
                 )
 
+    def _optimize_png(self, entry: CacheEntry):
+        """Losslessly recompress a cached PNG and update its recorded size.
+
+        Uses ``oxipng`` when it is on the PATH, otherwise Pillow's optimizer.
+        The result replaces the original atomically and only if smaller.
+
+        Args:
+            entry: Cache entry whose file should be recompressed
+        """
+        file_path = entry.file_path
+        temp_path = file_path.with_suffix(".opt.tmp")
+
+        try:
+            oxipng = shutil.which("oxipng")
+            if oxipng:
+                subprocess.run(
+                    [
+                        oxipng,
+                        "-o",
+                        "2",
+                        "--strip",
+                        "safe",
+                        "--out",
+                        str(temp_path),
+                        str(file_path),
+                    ],
+                    check=True,
+                    capture_output=True,
+                    timeout=60,
+                )
+            elif PIL_AVAILABLE:
+                with Image.open(file_path) as img:
+                    img.save(temp_path, "PNG", optimize=True, **_png_save_metadata(img))
+            else:
+                return
+
+            optimized_size = temp_path.stat().st_size
+
+            with self._rw.write_lock():
+                # Skip entries evicted while optimizing, or no gain
+                if optimized_size >= entry.file_size_bytes:
+                    return
+                if not self._is_cached(entry):
+                    return
+
+                os.replace(temp_path, file_path)
+                self._total_bytes += optimized_size - entry.file_size_bytes
+                entry.file_size_bytes = optimized_size
+                self._log_put(entry)
+
+        except Exception:
+            pass  # Keep the original file on any optimizer error
+        finally:
+            try:
+                temp_path.unlink()
+            except FileNotFoundError:
+                pass
+
     def _generate_thumbnail(self, full_image_path: Path, thumbnail_path: Path) -> bool:
         """Generate thumbnail from full-size image.
         
@@ -277,43 +1055,34 @@ class PreviewCache:
         Returns:
             True if thumbnail was generated successfully
         """
-        if not PIL_AVAILABLE:
-            return False
-            
+        pool = _get_thumb_pool()
         try:
-            with Image.open(full_image_path) as img:
-                # Convert to RGB if necessary (for consistent output)
-                if img.mode not in ('RGB', 'RGBA'):
-                    img = img.convert('RGB')
-                
-                # Calculate thumbnail size maintaining aspect ratio
-                img.thumbnail(self.thumbnail_size, Image.Resampling.LANCZOS)
-                
-                # Create a canvas with the exact thumbnail size and center the image
-                thumb_width, thumb_height = self.thumbnail_size
-                canvas = Image.new('RGB', (thumb_width, thumb_height), (240, 240, 240))  # Light gray background
-                
-                # Calculate position to center the image
-                img_width, img_height = img.size
-                x = (thumb_width - img_width) // 2
-                y = (thumb_height - img_height) // 2
-                
-                # Paste the image onto the canvas
-                if img.mode == 'RGBA':
-                    canvas.paste(img, (x, y), img)
-                else:
-                    canvas.paste(img, (x, y))
-                
-                # Save thumbnail
-                canvas.save(thumbnail_path, 'PNG', optimize=True)
-                return True
-                
-        except Exception:
-            return False
+            future = pool.submit(
+                _generate_thumbnail_worker,
+                full_image_path,
+                thumbnail_path,
+                self.thumbnail_size,
+                self.letterbox_thumbnails,
+            )
+            return future.result()
+        except (BrokenProcessPool, RuntimeError) as e:
+            # Pool unavailable (shut down or crashed) - render in-process
+            if isinstance(e, BrokenProcessPool):
+                _discard_thumb_pool(pool)
+            return _generate_thumbnail_worker(
+                full_image_path,
+                thumbnail_path,
+                self.thumbnail_size,
+                self.letterbox_thumbnails,
+            )
 
     def generate_thumbnail_for_entry(self, sketch_name: str, version: Optional[int] = None) -> Optional[str]:
         """Generate thumbnail for an existing cache entry.
         
+        The lock is only held to look up and update the entry; resampling
+        happens in the thumbnail process pool so other cache operations
+        are not blocked.
+
         Args:
             sketch_name: Name of the sketch
             version: Specific version, or None for current version
@@ -321,7 +1090,7 @@ class PreviewCache:
         Returns:
             Thumbnail URL if successful, None otherwise
         """
-        with self.lock:
+        with self._rw.read_lock():
             # Get the cache entry
             if version is not None:
                 entry = self.get_preview_version(sketch_name, version)
@@ -335,26 +1104,141 @@ class PreviewCache:
             if entry.thumbnail_path and entry.thumbnail_path.exists():
                 return f"/thumbnail/{entry.thumbnail_path.name}"
             
-            # Generate thumbnail filename
-            base_filename = entry.file_path.stem  # e.g., "sketch_v123456789"
-            thumbnail_filename = f"{base_filename}_thumb.png"
-            thumbnail_path = self.cache_dir / thumbnail_filename
-            
-            # Generate thumbnail
-            if self._generate_thumbnail(entry.file_path, thumbnail_path):
-                # Update cache entry with thumbnail info
-                entry.thumbnail_path = thumbnail_path
-                try:
-                    entry.thumbnail_size_bytes = thumbnail_path.stat().st_size
-                except:
-                    entry.thumbnail_size_bytes = 0
-                
-                # Save updated metadata
-                self._save_metadata()
-                
-                return f"/thumbnail/{thumbnail_filename}"
-            
+            thumbnail_path = self._thumbnail_path_for(entry)
+            render_path = _render_path_for(thumbnail_path)
+            source_path = entry.file_path
+
+        # Generate thumbnail outside the lock
+        if not self._generate_thumbnail(source_path, render_path):
+            _unlink_quietly(render_path)
+            return None
+
+        with self._rw.write_lock():
+            if not self._attach_thumbnail(entry, render_path, thumbnail_path):
+                return None
+            return f"/thumbnail/{entry.thumbnail_path.name}"
+
+    def get_thumbnail_url(self, sketch_name: str, version: int) -> Optional[str]:
+        """URL a cache entry's thumbnail is, or will be, served at.
+
+        Args:
+            sketch_name: Name of the sketch
+            version: Version of the preview
+
+        Returns:
+            Thumbnail URL, or None if the version is not cached
+        """
+        entry = self.get_preview_version(sketch_name, version)
+        if entry is None:
             return None
+        if entry.thumbnail_path is not None:
+            return f"/thumbnail/{entry.thumbnail_path.name}"
+        return f"/thumbnail/{self._thumbnail_path_for(entry).name}"
+
+    def queue_thumbnail(self, sketch_name: str, version: int):
+        """Queue thumbnail generation for a cache entry.
+
+        Requests are rendered in the background in batches, so a burst of
+        saves costs one pool round trip and one lock acquisition per batch.
+
+        Args:
+            sketch_name: Name of the sketch
+            version: Version to generate a thumbnail for
+        """
+        self._thumb_queue.put((sketch_name, version))
+
+    def _process_thumbnail_batch(self, batch: List[Tuple[str, int]]):
+        """Render and record thumbnails for a batch of queued requests.
+
+        Args:
+            batch: (sketch_name, version) pairs to process
+        """
+        jobs = []
+        with self._rw.read_lock():
+            for sketch_name, version in batch:
+                entry = self.get_preview_version(sketch_name, version)
+                if not entry or entry.thumbnail_path:
+                    continue
+                thumbnail_path = self._thumbnail_path_for(entry)
+                jobs.append((entry, _render_path_for(thumbnail_path), thumbnail_path))
+
+        if not jobs:
+            return
+
+        sources = [entry.file_path for entry, _, _ in jobs]
+        targets = [render_path for _, render_path, _ in jobs]
+        sizes = [self.thumbnail_size] * len(jobs)
+        letterbox = [self.letterbox_thumbnails] * len(jobs)
+        pool = _get_thumb_pool()
+        try:
+            results = list(
+                pool.map(_generate_thumbnail_worker, sources, targets, sizes, letterbox)
+            )
+        except (BrokenProcessPool, RuntimeError) as e:
+            # Pool unavailable (shut down or crashed) - render in-process
+            if isinstance(e, BrokenProcessPool):
+                _discard_thumb_pool(pool)
+            results = list(
+                map(_generate_thumbnail_worker, sources, targets, sizes, letterbox)
+            )
+
+        with self._rw.write_lock():
+            for (entry, render_path, thumbnail_path), ok in zip(jobs, results):
+                if ok:
+                    self._attach_thumbnail(entry, render_path, thumbnail_path)
+                else:
+                    _unlink_quietly(render_path)
+
+    def _thumbnail_path_for(self, entry: CacheEntry) -> Path:
+        """Path of the thumbnail file for a cache entry."""
+        # e.g., "sketch_v123456789_ab12cd34_thumb.webp"
+        return Path(
+            f"{self._cache_dir_str}{entry.file_path.stem}_thumb{THUMBNAIL_SUFFIX}"
+        )
+
+    def _attach_thumbnail(
+        self, entry: CacheEntry, render_path: Path, thumbnail_path: Path
+    ) -> bool:
+        """Publish a rendered thumbnail and record it on its entry.
+
+        Caller holds the write lock. Renders go to a private file first, so
+        concurrent requests for the same entry never write the same path.
+
+        Args:
+            entry: Cache entry the thumbnail belongs to
+            render_path: Path the thumbnail was rendered to
+            thumbnail_path: Final path of the thumbnail
+
+        Returns:
+            True if the entry is still cached and has a thumbnail
+        """
+        # Entry may have been evicted while the thumbnail was rendering
+        if not self._is_cached(entry):
+            _unlink_quietly(render_path)
+            return False
+
+        # A concurrent request may already have recorded this thumbnail
+        if entry.thumbnail_path:
+            _unlink_quietly(render_path)
+            return True
+
+        try:
+            os.replace(render_path, thumbnail_path)
+        except OSError:
+            _unlink_quietly(render_path)
+            return False
+
+        # Update cache entry with thumbnail info
+        entry.thumbnail_path = thumbnail_path
+        try:
+            entry.thumbnail_size_bytes = thumbnail_path.stat().st_size
+        except:
+            entry.thumbnail_size_bytes = 0
+        self._total_bytes += entry.thumbnail_size_bytes
+
+        # Record the thumbnail in the metadata log
+        self._log_put(entry)
+        return True
 
     def get_current_preview(self, sketch_name: str) -> Optional[CacheEntry]:
         """Get the current (most recent) preview for a sketch.
@@ -365,7 +1249,7 @@ class PreviewCache:
         Returns:
             CacheEntry for the most recent preview, or None if not found
         """
-        with self.lock:
+        with self._rw.read_lock():
             if sketch_name in self.entries and self.entries[sketch_name]:
                 # Return the most recent (first in sorted list)
                 return self.entries[sketch_name][0]
@@ -383,12 +1267,7 @@ class PreviewCache:
         Returns:
             CacheEntry for the specified version, or None if not found
         """
-        with self.lock:
-            if sketch_name in self.entries:
-                for entry in self.entries[sketch_name]:
-                    if entry.version == version:
-                        return entry
-            return None
+        return self._by_version.get((sketch_name, version))
 
     def get_available_versions(self, sketch_name: str) -> List[int]:
         """Get all available versions for a sketch.
@@ -399,7 +1278,7 @@ class PreviewCache:
         Returns:
             List of version numbers, sorted newest first
         """
-        with self.lock:
+        with self._rw.read_lock():
             if sketch_name in self.entries:
                 return [entry.version for entry in self.entries[sketch_name]]
             return []
@@ -417,6 +1296,7 @@ class PreviewCache:
             to_remove = entries[self.max_versions_per_sketch :]
 
             for entry in to_remove:
+                self._forget_entry(entry)
                 try:
                     if entry.file_path.exists():
                         entry.file_path.unlink()
@@ -427,7 +1307,20 @@ class PreviewCache:
                     pass  # Ignore cleanup errors
 
             # Update entries list
-            self.entries[sketch_name] = entries[: self.max_versions_per_sketch]
+            del entries[self.max_versions_per_sketch :]
+
+    def _is_cached(self, entry: CacheEntry) -> bool:
+        """Check whether an entry is still held by the cache."""
+        return self._by_version.get((entry.sketch_name, entry.version)) is entry
+
+    def _forget_entry(self, entry: CacheEntry):
+        """Drop an evicted entry from the version index, size total and log."""
+        if self._is_cached(entry):
+            del self._by_version[(entry.sketch_name, entry.version)]
+        self._total_bytes -= _entry_size_bytes(entry)
+        self._log_metadata(
+            {"op": "del", "sketch": entry.sketch_name, "version": entry.version}
+        )
 
     def _trigger_global_cleanup(self):
         """Trigger global cache cleanup if needed."""
@@ -438,9 +1331,8 @@ class PreviewCache:
 
     def cleanup_old_previews(self):
         """Clean up old previews based on age and size limits."""
-        with self.lock:
-            current_time = datetime.now()
-            cutoff_time = current_time - timedelta(hours=self.max_age_hours)
+        with self._rw.write_lock():
+            cutoff_ms = int(time.time() * 1000) - self.max_age_hours * 3_600_000
 
             # Remove entries older than max_age
             for sketch_name in list(self.entries.keys()):
@@ -448,10 +1340,11 @@ class PreviewCache:
                 valid_entries = []
 
                 for entry in entries:
-                    if entry.created_at > cutoff_time:
+                    if entry.created_at_ms > cutoff_ms:
                         valid_entries.append(entry)
                     else:
                         # Remove old file and thumbnail
+                        self._forget_entry(entry)
                         try:
                             if entry.file_path.exists():
                                 entry.file_path.unlink()
@@ -470,55 +1363,54 @@ class PreviewCache:
             if total_size_mb > self.max_total_size_mb:
                 self._aggressive_cleanup()
 
-            # Save updated metadata
-            self._save_metadata()
-
     def _aggressive_cleanup(self):
         """Aggressively clean up cache to meet size limits."""
-        # Collect all entries with timestamps
-        all_entries = []
-        for sketch_name, entries in self.entries.items():
-            for entry in entries:
-                all_entries.append((entry.created_at, sketch_name, entry))
-
-        # Sort by age (oldest first)
-        all_entries.sort(key=lambda x: x[0])
+        # Each sketch's list is newest first, so merging the reversed lists
+        # yields entries oldest first; only the evicted prefix is ever ordered
+        oldest_first = heapq.merge(
+            *(reversed(entries) for entries in self.entries.values()),
+            key=lambda entry: entry.created_at_ms,
+        )
 
-        # Remove oldest entries until under size limit
-        current_size_mb = self.get_total_cache_size()
-        target_size_mb = self.max_total_size_mb * 0.8  # Clean to 80% of limit
+        # Pick the oldest entries whose removal brings the cache under target
+        # Clean to 80% of limit
+        target_bytes = self.max_total_size_mb * 0.8 * 1024 * 1024
+        remaining_bytes = self._total_bytes
+        to_remove = set()
+        victims = []
 
-        for created_at, sketch_name, entry in all_entries:
-            if current_size_mb <= target_size_mb:
+        for entry in oldest_first:
+            if remaining_bytes <= target_bytes:
                 break
+            to_remove.add((entry.sketch_name, entry.version))
+            victims.append(entry)
+            remaining_bytes -= _entry_size_bytes(entry)
+
+        # Drop victims from each affected sketch in a single pass
+        for sketch_name in {name for name, _ in to_remove}:
+            kept = [
+                e
+                for e in self.entries[sketch_name]
+                if (sketch_name, e.version) not in to_remove
+            ]
+            if kept:
+                self.entries[sketch_name] = kept
+            else:
+                # Remove sketch entry if no versions left
+                del self.entries[sketch_name]
 
-            # Remove this entry
+        # Then delete their files
+        for entry in victims:
+            self._forget_entry(entry)
             try:
-                if entry.file_path.exists():
-                    file_size_mb = entry.file_size_bytes / (1024 * 1024)
-                    entry.file_path.unlink()
-                    current_size_mb -= file_size_mb
-                
-                # Also remove thumbnail
-                if entry.thumbnail_path and entry.thumbnail_path.exists():
-                    thumb_size_mb = (entry.thumbnail_size_bytes or 0) / (1024 * 1024)
-                    entry.thumbnail_path.unlink()
-                    current_size_mb -= thumb_size_mb
-
-                # Remove from entries
-                if sketch_name in self.entries:
-                    self.entries[sketch_name] = [
-                        e
-                        for e in self.entries[sketch_name]
-                        if e.version != entry.version
-                    ]
-
-                    # Remove sketch entry if no versions left
-                    if not self.entries[sketch_name]:
-                        del self.entries[sketch_name]
-
-            except:
+                entry.file_path.unlink()
+            except OSError:
                 pass  # Ignore cleanup errors
+            if entry.thumbnail_path:
+                try:
+                    entry.thumbnail_path.unlink()
+                except OSError:
+                    pass
 
     def get_total_cache_size(self) -> float:
         """Get total cache size in MB.
@@ -526,16 +1418,7 @@ class PreviewCache:
         Returns:
             Total size of cached files in MB (including thumbnails)
         """
-        total_bytes = 0
-        for entry_list in self.entries.values():
-            for entry in entry_list:
-                if entry.file_path.exists():
-                    total_bytes += entry.file_size_bytes
-                # Include thumbnail size if it exists
-                if entry.thumbnail_path and entry.thumbnail_path.exists():
-                    total_bytes += entry.thumbnail_size_bytes or 0
-
-        return total_bytes / (1024 * 1024)
+        return self._total_bytes / (1024 * 1024)
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get cache statistics.
@@ -543,7 +1426,7 @@ class PreviewCache:
         Returns:
             Dictionary with cache statistics
         """
-        with self.lock:
+        with self._rw.read_lock():
             total_sketches = len(self.entries)
             total_versions = sum(len(entries) for entries in self.entries.values())
             total_size_mb = self.get_total_cache_size()
@@ -560,7 +1443,7 @@ class PreviewCache:
 
     def clear_cache(self):
         """Clear all cached previews."""
-        with self.lock:
+        with self._rw.write_lock():
             # Remove all files and thumbnails
             for entry_list in self.entries.values():
                 for entry in entry_list:
@@ -574,10 +1457,42 @@ class PreviewCache:
 
             # Clear entries
             self.entries = {}
+            self._by_version = {}
+            self._total_bytes = 0
+            self.generation += 1
+            self._dirty.clear()
 
-            # Remove metadata file
+            # Remove metadata file and empty the change log
             try:
-                if self.metadata_file.exists():
+                if self._owns_metadata and self.metadata_file.exists():
                     self.metadata_file.unlink()
+                if self._wal is not None:
+                    self._wal.truncate(0)
+                    self._wal_bytes = 0
             except:
                 pass
+
+    def close(self):
+        """Shut down background workers and flush pending metadata.
+
+        The shared thumbnail and optimizer pools stay up for other caches;
+        only this cache's pending recompressions are waited for.
+        """
+        _live_caches.discard(self)
+        self._stop.set()
+        self._thumb_queue.put(None)
+        self._thumbnail_batcher.join()
+
+        wait_futures(list(self._optimizing))
+
+        # Wake the metadata writer so it sees the stop request
+        pending = self._dirty.is_set()
+        self._dirty.set()
+        self._metadata_writer.join()
+        if pending:
+            self.flush_metadata()
+
+        with self._rw.write_lock():
+            if self._wal is not None:
+                self._wal.close()
+                self._wal = None
@@ -5,139 +5,300 @@ PreviewEngine - Core preview execution system for live preview functionality.
 import asyncio
 import gc
 import os
+import re
+import stat
 import subprocess
 import sys
 import tempfile
-import threading
 import time
 from dataclasses import dataclass
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 # Note: ImageConverter removed - we now use DrawBot's native PNG output only
-from .preview_cache import CacheResult, PreviewCache
+from .preview_cache import CacheEntry, CacheResult, PreviewCache
 from .sketch_runner import ExecutionResult, SketchRunner
 
-
-@dataclass
+# Collection thresholds the live preview server applies at startup.
+# Generation 0 collects after this many net allocations instead of CPython's
+# default 700, so a preview request does not trigger repeated collections
+# mid-flight.
+DEFAULT_GC_THRESHOLD = (50000, 20, 20)
+
+# Maximum number of sketches whose page listings are memoized
+PAGE_FILES_CACHE_SIZE = 256
+
+# Page number and extension following a "<sketch>_page_" filename prefix
+_PAGE_RE = re.compile(r"(\d+)\.png")
+
+# Output extensions stored in the cache as-is
+_IMAGE_EXTS = frozenset({".png", ".gif", ".jpg", ".jpeg", ".webp", ".bmp"})
+
+
+def freeze_startup_objects():
+    """Exempt every object alive now from future garbage collections.
+
+    Meant to be called once by a long-running server after its components
+    are built, so later collections skip the engine, cache and everything
+    imported so far. This affects the whole process: code that replaces
+    long-lived globals afterwards should call ``gc.unfreeze()`` first so the
+    old objects can still be reclaimed.
+    """
+    # Collect twice so garbage freed by finalizers in the first pass is not
+    # frozen
+    gc.collect()
+    gc.collect()
+    gc.freeze()
+
+
+def _scan_page_files(directory: Path, sketch_name: str) -> List[Path]:
+    """List a sketch's ``<name>_page_<n>.png`` files sorted by page number.
+
+    Args:
+        directory: Directory to scan
+        sketch_name: Sketch whose pages to find
+
+    Returns:
+        Page file paths, first page first
+    """
+    prefix = f"{sketch_name}_page_"
+    start = len(prefix)
+    pages = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            name = entry.name
+            if not name.startswith(prefix):
+                continue
+            # Match right after the prefix; skips names like "x_page_01_v2.png"
+            match = _PAGE_RE.fullmatch(name, start)
+            if match:
+                pages.append((int(match.group(1)), entry.path))
+    pages.sort(key=itemgetter(0))
+    return [Path(path) for _, path in pages]
+
+
+@dataclass(init=False)
 class PreviewResult:
-    """Result of preview generation."""
+    """Result of preview generation.
+
+    Fields live in ``__slots__``, so they are declared without class-level
+    defaults and ``__init__`` is written out. The run's start time is kept as
+    epoch nanoseconds; ``timestamp`` builds the datetime only when it is read.
+    """
+
+    __slots__ = (
+        "success",
+        "error",
+        "execution_time",
+        "preview_url",
+        "preview_path",
+        "thumbnail_url",
+        "thumbnail_path",
+        "sketch_path",
+        "timestamp_ns",
+        "version",
+    )
 
     success: bool
-    error: Optional[str] = None
-    execution_time: float = 0.0
-    preview_url: Optional[str] = None
-    preview_path: Optional[Path] = None
-    thumbnail_url: Optional[str] = None
-    thumbnail_path: Optional[Path] = None
-    sketch_path: Optional[Path] = None
-    timestamp: Optional[datetime] = None
-    version: Optional[int] = None
+    error: Optional[str]
+    execution_time: float
+    preview_url: Optional[str]
+    preview_path: Optional[Path]
+    thumbnail_url: Optional[str]
+    thumbnail_path: Optional[Path]
+    sketch_path: Optional[Path]
+    timestamp_ns: Optional[int]
+    version: Optional[int]
+
+    def __init__(
+        self,
+        success: bool,
+        error: Optional[str] = None,
+        execution_time: float = 0.0,
+        preview_url: Optional[str] = None,
+        preview_path: Optional[Path] = None,
+        thumbnail_url: Optional[str] = None,
+        thumbnail_path: Optional[Path] = None,
+        sketch_path: Optional[Path] = None,
+        timestamp: Optional[datetime] = None,
+        version: Optional[int] = None,
+        timestamp_ns: Optional[int] = None,
+    ):
+        self.success = success
+        self.error = error
+        self.execution_time = execution_time
+        self.preview_url = preview_url
+        self.preview_path = preview_path
+        self.thumbnail_url = thumbnail_url
+        self.thumbnail_path = thumbnail_path
+        self.sketch_path = sketch_path
+        self.timestamp_ns = timestamp_ns
+        self.version = version
+        if timestamp is not None:
+            self.timestamp = timestamp
+
+    @property
+    def timestamp(self) -> Optional[datetime]:
+        """Local time the execution started, if recorded."""
+        if self.timestamp_ns is None:
+            return None
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
+
+    @timestamp.setter
+    def timestamp(self, value: Optional[datetime]):
+        if value is None:
+            self.timestamp_ns = None
+        else:
+            # Whole seconds plus microseconds, so the datetime round-trips
+            self.timestamp_ns = (
+                int(value.timestamp()) * 1_000_000_000 + value.microsecond * 1000
+            )
 
 
 class PreviewEngine:
     """Manages sketch execution and preview generation with safety and monitoring."""
 
-    def __init__(self, project_path: Path, cache: PreviewCache, timeout: float = 30.0):
+    def __init__(
+        self,
+        project_path: Path,
+        cache: PreviewCache,
+        timeout: float = 30.0,
+        gc_threshold: Optional[Tuple[int, int, int]] = None,
+    ):
         """Initialize preview engine.
 
         Args:
             project_path: Path to the project directory
             cache: PreviewCache instance for storing generated previews
             timeout: Maximum execution time in seconds
+            gc_threshold: Process-wide ``gc.set_threshold`` values to apply,
+                e.g. DEFAULT_GC_THRESHOLD. None (the default) keeps the
+                interpreter's current thresholds
         """
         self.project_path = project_path
         self.cache = cache
         self.timeout = timeout
 
         # Initialize components
-        self.sketch_runner = SketchRunner(project_path, timeout)
+        # Syntax check results live alongside the previews, outside the
+        # sketches tree the server may be pointed at
+        self.sketch_runner = SketchRunner(
+            project_path, timeout, validation_cache_dir=cache.cache_dir / "validation"
+        )
+
+        # Page listings per sketch, keyed by the directory mtimes they were
+        # scanned at: sketch_name -> ((dir_mtime_ns, folder_mtime_ns), pages)
+        self._page_files_cache: Dict[
+            str, Tuple[Tuple[int, int], Optional[List[Path]]]
+        ] = {}
+
+        # Sketch listing built at a given cache generation and cache
+        # directory mtime
+        self._sketches_memo: Optional[
+            Tuple[Tuple[int, int], List[Dict[str, Any]]]
+        ] = None
 
         # Execution management
         self.current_execution: Optional[asyncio.Task] = None
-        self.execution_lock = threading.Lock()
+
+        if gc_threshold is not None:
+            gc.set_threshold(*gc_threshold)
 
     def execute_sketch(
-        self, sketch_path: Path, sketch_name: Optional[str] = None
+        self,
+        sketch_path: Path,
+        sketch_name: Optional[str] = None,
+        wait_for_thumbnail: bool = False,
     ) -> PreviewResult:
         """Execute a sketch and generate preview image.
 
+        The thumbnail is queued on the cache's background batcher unless
+        ``wait_for_thumbnail`` is set; the returned thumbnail URL is where it
+        will be served once rendered.
+
         Args:
             sketch_path: Path to the sketch file to execute
             sketch_name: Optional logical name for caching (defaults to path stem)
+            wait_for_thumbnail: Render the thumbnail before returning
 
         Returns:
             PreviewResult containing execution status and preview information
         """
-        start_time = time.time()
-        timestamp = datetime.now()
+        # One clock read serves as both start time and result timestamp
+        start_ns = time.time_ns()
 
         # Cancel any running execution
         self._cancel_current_execution()
 
         try:
-            # Force garbage collection before execution
-            gc.collect()
-
-            # Validate sketch file exists
-            if not sketch_path.exists():
+            # Validate sketch file exists; the runner reuses this stat
+            try:
+                sketch_stat = os.stat(sketch_path)
+            except OSError:
                 return PreviewResult(
                     success=False,
                     error=f"Sketch file not found: {sketch_path}",
-                    timestamp=timestamp,
+                    timestamp_ns=start_ns,
                     sketch_path=sketch_path,
                 )
 
             # Execute sketch safely
-            execution_result = self.sketch_runner.run_sketch(sketch_path)
+            execution_result = self.sketch_runner.run_sketch(
+                sketch_path, stat_result=sketch_stat
+            )
 
             if not execution_result.success:
-                execution_time = time.time() - start_time
+                execution_time = (time.time_ns() - start_ns) / 1e9
                 return PreviewResult(
                     success=False,
                     error=execution_result.error,
                     execution_time=execution_time,
                     sketch_path=sketch_path,
-                    timestamp=timestamp,
+                    timestamp_ns=start_ns,
                 )
 
             # Convert output to preview image if available
             preview_result = self._generate_preview_image(
-                sketch_path, execution_result, sketch_name
+                sketch_path, execution_result, sketch_name, wait_for_thumbnail
             )
 
-            execution_time = time.time() - start_time
+            execution_time = (time.time_ns() - start_ns) / 1e9
             preview_result.execution_time = execution_time
             preview_result.sketch_path = sketch_path
-            preview_result.timestamp = timestamp
+            preview_result.timestamp_ns = start_ns
 
             return preview_result
 
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = (time.time_ns() - start_ns) / 1e9
             return PreviewResult(
                 success=False,
                 error=f"Preview generation failed: {str(e)}",
                 execution_time=execution_time,
                 sketch_path=sketch_path,
-                timestamp=timestamp,
+                timestamp_ns=start_ns,
             )
-        finally:
-            # Force cleanup even on errors
-            gc.collect()
+
+    def close(self):
+        """Stop the sketch runner's worker processes."""
+        self.sketch_runner.close()
 
     def _cancel_current_execution(self):
         """Cancel any currently running execution."""
-        with self.execution_lock:
-            if self.current_execution and not self.current_execution.done():
-                self.current_execution.cancel()
+        # execute_sketch is synchronous and Task.cancel() is a no-op on a
+        # finished task, so no lock is needed around the check
+        task = self.current_execution
+        if task is not None and not task.done():
+            task.cancel()
 
     def _generate_preview_image(
         self,
         sketch_path: Path,
         execution_result: ExecutionResult,
         sketch_name: Optional[str] = None,
+        wait_for_thumbnail: bool = False,
     ) -> PreviewResult:
         """Generate preview image from sketch execution result.
 
@@ -145,6 +306,7 @@ class PreviewEngine:
             sketch_path: Path to the executed sketch
             execution_result: Result from sketch execution
             sketch_name: Optional logical name for caching
+            wait_for_thumbnail: Render the thumbnail before returning
 
         Returns:
             PreviewResult with preview image information
@@ -165,60 +327,20 @@ class PreviewEngine:
                 # Multi-page output - use first page as primary preview
                 # TODO: Later we can enhance this to show all pages in sequence
                 primary_file = execution_result.output_files[0]
-
-                with open(primary_file, "rb") as f:
-                    image_data = f.read()
-
-                cache_result = self.cache.store_preview(cache_key, image_data)
-                if cache_result.success:
-                    # Try to generate thumbnail immediately
-                    thumbnail_url = self.cache.generate_thumbnail_for_entry(cache_key)
-
-                    return PreviewResult(
-                        success=True,
-                        preview_url=cache_result.preview_url,
-                        preview_path=cache_result.preview_path,
-                        thumbnail_url=thumbnail_url,
-                        thumbnail_path=cache_result.thumbnail_path,
-                        version=cache_result.version,
-                    )
-                else:
-                    return PreviewResult(
-                        success=False,
-                        error=f"Failed to cache preview: {cache_result.error}",
-                    )
+                return self._store_and_build_result(
+                    cache_key, primary_file, wait_for_thumbnail
+                )
 
             # Single file output
             else:
                 # Check if output is a direct image format (PNG, GIF, JPEG, etc.)
-                image_formats = {".png", ".gif", ".jpg", ".jpeg", ".webp", ".bmp"}
                 file_ext = execution_result.output_path.suffix.lower()
 
-                if file_ext in image_formats:
+                if file_ext in _IMAGE_EXTS:
                     # Direct image output - store in cache
-                    with open(execution_result.output_path, "rb") as f:
-                        image_data = f.read()
-
-                    cache_result = self.cache.store_preview(cache_key, image_data)
-                    if cache_result.success:
-                        # Try to generate thumbnail immediately
-                        thumbnail_url = self.cache.generate_thumbnail_for_entry(
-                            cache_key
-                        )
-
-                        return PreviewResult(
-                            success=True,
-                            preview_url=cache_result.preview_url,
-                            preview_path=cache_result.preview_path,
-                            thumbnail_url=thumbnail_url,
-                            thumbnail_path=cache_result.thumbnail_path,
-                            version=cache_result.version,
-                        )
-                    else:
-                        return PreviewResult(
-                            success=False,
-                            error=f"Failed to cache preview: {cache_result.error}",
-                        )
+                    return self._store_and_build_result(
+                        cache_key, execution_result.output_path, wait_for_thumbnail
+                    )
 
                 # For PDF files, look for auto-extracted pages
                 elif file_ext == ".pdf":
@@ -227,29 +349,9 @@ class PreviewEngine:
                     )
                     if extracted_pages:
                         # Use first page as primary preview
-                        with open(extracted_pages[0], "rb") as f:
-                            image_data = f.read()
-
-                        cache_result = self.cache.store_preview(cache_key, image_data)
-                        if cache_result.success:
-                            # Try to generate thumbnail immediately
-                            thumbnail_url = self.cache.generate_thumbnail_for_entry(
-                                cache_key
-                            )
-
-                            return PreviewResult(
-                                success=True,
-                                preview_url=cache_result.preview_url,
-                                preview_path=cache_result.preview_path,
-                                thumbnail_url=thumbnail_url,
-                                thumbnail_path=cache_result.thumbnail_path,
-                                version=cache_result.version,
-                            )
-                        else:
-                            return PreviewResult(
-                                success=False,
-                                error=f"Failed to cache preview: {cache_result.error}",
-                            )
+                        return self._store_and_build_result(
+                            cache_key, extracted_pages[0], wait_for_thumbnail
+                        )
                     else:
                         # No extracted pages found, return error with helpful message
                         return PreviewResult(
@@ -269,6 +371,46 @@ class PreviewEngine:
                 success=False, error=f"Preview image generation failed: {str(e)}"
             )
 
+    def _store_and_build_result(
+        self, cache_key: str, image_path: Path, wait_for_thumbnail: bool = False
+    ) -> PreviewResult:
+        """Store an output image in the cache and describe the new preview.
+
+        Args:
+            cache_key: Cache key for the sketch
+            image_path: Rendered image to store
+            wait_for_thumbnail: Render the thumbnail before returning
+
+        Returns:
+            PreviewResult for the stored preview
+        """
+        cache_result = self.cache.store_preview_from_path(cache_key, image_path)
+        if not cache_result.success:
+            return PreviewResult(
+                success=False,
+                error=f"Failed to cache preview: {cache_result.error}",
+            )
+
+        if wait_for_thumbnail:
+            thumbnail_url = self.cache.generate_thumbnail_for_entry(
+                cache_key, cache_result.version
+            )
+        else:
+            # Render off the request path; clients fetch the thumbnail lazily
+            self.cache.queue_thumbnail(cache_key, cache_result.version)
+            thumbnail_url = self.cache.get_thumbnail_url(
+                cache_key, cache_result.version
+            )
+
+        return PreviewResult(
+            success=True,
+            preview_url=cache_result.preview_url,
+            preview_path=cache_result.preview_path,
+            thumbnail_url=thumbnail_url,
+            thumbnail_path=cache_result.thumbnail_path,
+            version=cache_result.version,
+        )
+
     def _extract_pdf_pages(
         self, pdf_path: Path, cache_key: str
     ) -> Optional[List[Path]]:
@@ -283,15 +425,9 @@ class PreviewEngine:
         """
         try:
             # Look for auto-generated page files in the same directory as the PDF
-            pdf_dir = pdf_path.parent
-            page_pattern = pdf_dir / f"{cache_key}_page_*.png"
-
-            # Find all page files
-            page_files = list(pdf_dir.glob(f"{cache_key}_page_*.png"))
+            page_files = _scan_page_files(pdf_path.parent, cache_key)
 
             if page_files:
-                # Sort by page number
-                page_files.sort(key=lambda f: int(f.stem.split("_page_")[-1]))
                 return page_files
 
             # If no auto-generated pages found, return None for now
@@ -304,6 +440,9 @@ class PreviewEngine:
     def get_multi_page_files(self, sketch_name: str) -> Optional[List[Path]]:
         """Get all page files for a multi-page sketch.
 
+        Results are reused until the sketches directory or the sketch's
+        folder is modified, so repeat lookups cost one or two stats.
+
         Args:
             sketch_name: Name of the sketch
 
@@ -318,30 +457,59 @@ class PreviewEngine:
                 sketches_dir = self.project_path
             else:
                 sketches_dir = self.project_path / "sketches"
+            sketch_folder = sketches_dir / sketch_name
 
-            page_pattern = f"{sketch_name}_page_*.png"
+            # Adding or removing a page file changes its directory's mtime
+            try:
+                folder_stat = os.stat(sketch_folder)
+                folder_mtime = (
+                    folder_stat.st_mtime_ns if stat.S_ISDIR(folder_stat.st_mode) else 0
+                )
+            except OSError:
+                folder_mtime = 0
+            mtimes = (os.stat(sketches_dir).st_mtime_ns, folder_mtime)
 
-            # First, try to find page files in the sketch's own folder (folder-based structure)
-            sketch_folder = sketches_dir / sketch_name
-            if sketch_folder.exists() and sketch_folder.is_dir():
-                page_files = list(sketch_folder.glob(page_pattern))
-                if page_files:
-                    # Sort by page number
-                    page_files.sort(key=lambda f: int(f.stem.split("_page_")[-1]))
-                    return page_files
+            cached = self._page_files_cache.get(sketch_name)
+            if cached is not None and cached[0] == mtimes:
+                return list(cached[1]) if cached[1] else None
 
-            # Fall back to flat structure: look in root sketches directory
-            page_files = list(sketches_dir.glob(page_pattern))
+            page_files = self._find_multi_page_files(
+                sketches_dir, sketch_folder if folder_mtime else None, sketch_name
+            )
 
-            if page_files:
-                # Sort by page number
-                page_files.sort(key=lambda f: int(f.stem.split("_page_")[-1]))
-                return page_files
+            # Bound the memo; the oldest sketch listing is dropped first
+            if len(self._page_files_cache) >= PAGE_FILES_CACHE_SIZE:
+                self._page_files_cache.pop(next(iter(self._page_files_cache)))
+            self._page_files_cache[sketch_name] = (mtimes, page_files)
 
-            return None
+            return list(page_files) if page_files else None
         except Exception:
             return None
 
+    def _find_multi_page_files(
+        self, sketches_dir: Path, sketch_folder: Optional[Path], sketch_name: str
+    ) -> Optional[List[Path]]:
+        """Scan for a sketch's page files.
+
+        Args:
+            sketches_dir: Root sketches directory
+            sketch_folder: The sketch's own folder, or None if it has none
+            sketch_name: Name of the sketch
+
+        Returns:
+            List of paths to page files sorted by page number, or None
+        """
+        # First, try to find page files in the sketch's own folder (folder-based structure)
+        if sketch_folder is not None:
+            page_files = _scan_page_files(sketch_folder, sketch_name)
+            if page_files:
+                return page_files
+
+        # Fall back to flat structure: look in root sketches directory
+        page_files = _scan_page_files(sketches_dir, sketch_name)
+
+        return page_files or None
+
     def _get_python_executable(self) -> str:
         """Get the appropriate Python executable, preferring virtual environment if available."""
         return self.sketch_runner._get_python_executable()
@@ -388,37 +556,67 @@ class PreviewEngine:
     def get_available_sketches_with_thumbnails(self) -> List[Dict[str, Any]]:
         """Get all sketches with their thumbnail information.
 
+        The listing is rebuilt only when the cache generation or the cache
+        directory's mtime has changed since the last call; the returned
+        dictionaries are shared and must not be modified.
+
         Returns:
             List of sketch dictionaries with thumbnail URLs
         """
-        sketches = []
-
-        # Get all cache entries
-        for sketch_name, entry_list in self.cache.entries.items():
-            if entry_list:
-                current_entry = entry_list[0]  # Most recent
-
-                sketch_info = {
-                    "name": sketch_name,
-                    "has_preview": True,
-                    "preview_url": f"/preview/{current_entry.file_path.name}",
-                    "version": current_entry.version,
-                    "created_at": current_entry.created_at.isoformat(),
-                    "file_size_bytes": current_entry.file_size_bytes,
-                }
-
-                # Add thumbnail info if available
-                if (
-                    current_entry.thumbnail_path
-                    and current_entry.thumbnail_path.exists()
-                ):
-                    sketch_info[
-                        "thumbnail_url"
-                    ] = f"/thumbnail/{current_entry.thumbnail_path.name}"
-                    sketch_info["has_thumbnail"] = True
-                else:
-                    sketch_info["has_thumbnail"] = False
+        cache_dir = self.cache.cache_dir
+        try:
+            dir_mtime = os.stat(cache_dir).st_mtime_ns
+        except OSError:
+            dir_mtime = 0
+        key = (self.cache.generation, dir_mtime)
+        if self._sketches_memo is not None and self._sketches_memo[0] == key:
+            return list(self._sketches_memo[1])
+
+        # One directory scan validates every recorded thumbnail at once
+        try:
+            with os.scandir(cache_dir) as it:
+                on_disk = {entry.name for entry in it}
+        except OSError:
+            on_disk = set()
+
+        sketches = [
+            self._sketch_info(sketch_name, entry_list[0], on_disk)  # Most recent
+            for sketch_name, entry_list in list(self.cache.entries.items())
+            if entry_list
+        ]
+
+        self._sketches_memo = (key, sketches)
+        return list(sketches)
+
+    @staticmethod
+    def _sketch_info(
+        sketch_name: str, entry: CacheEntry, on_disk: Set[str]
+    ) -> Dict[str, Any]:
+        """Describe a sketch's current preview for listings.
 
-                sketches.append(sketch_info)
+        Args:
+            sketch_name: Name of the sketch
+            entry: The sketch's most recent cache entry
+            on_disk: Names of the files in the cache directory
 
-        return sketches
+        Returns:
+            Sketch dictionary with preview and thumbnail information
+        """
+        sketch_info = {
+            "name": sketch_name,
+            "has_preview": True,
+            "preview_url": f"/preview/{entry.file_path.name}",
+            "version": entry.version,
+            "created_at": entry.created_at.isoformat(),
+            "file_size_bytes": entry.file_size_bytes,
+        }
+
+        thumbnail_path = entry.thumbnail_path
+        has_thumbnail = thumbnail_path is not None and thumbnail_path.name in on_disk
+        sketch_info["has_thumbnail"] = has_thumbnail
+
+        # Add thumbnail info if available
+        if has_thumbnail:
+            sketch_info["thumbnail_url"] = f"/thumbnail/{entry.thumbnail_path.name}"
+
+        return sketch_info
@@ -2,6 +2,7 @@
 Project structure management for DrawBot VSCode Sketchbook.
 """
 
+import os
 from pathlib import Path
 from typing import List, Set
 
@@ -34,11 +35,23 @@ class ProjectStructure:
 
         self.project_path = project_path
 
+        # Full path of each required directory, joined once
+        self._required_paths = tuple(
+            (project_path / dir_name, dir_name)
+            for dir_name in self.REQUIRED_DIRECTORIES
+        )
+
     def create_directories(self) -> None:
         """Create all required directories if they don't exist."""
-        for dir_name in self.REQUIRED_DIRECTORIES:
-            dir_path = self.project_path / dir_name
-            dir_path.mkdir(exist_ok=True)
+        existing = self._scan_existing_dirs()
+        for dir_path, dir_name in self._required_paths:
+            if dir_name not in existing:
+                dir_path.mkdir(exist_ok=True)
+
+    def _scan_existing_dirs(self) -> Set[str]:
+        """Names of the directories directly inside the project, in one scan."""
+        with os.scandir(self.project_path) as it:
+            return {entry.name for entry in it if entry.is_dir()}
 
     def validate_structure(self) -> bool:
         """Validate that all required directories exist.
@@ -46,11 +59,7 @@ class ProjectStructure:
         Returns:
             True if all directories exist, False otherwise
         """
-        for dir_name in self.REQUIRED_DIRECTORIES:
-            dir_path = self.project_path / dir_name
-            if not dir_path.exists() or not dir_path.is_dir():
-                return False
-        return True
+        return all(os.path.isdir(dir_path) for dir_path, _ in self._required_paths)
 
     def get_missing_directories(self) -> List[str]:
         """Get list of missing required directories.
@@ -58,9 +67,7 @@ class ProjectStructure:
         Returns:
             List of missing directory names
         """
-        missing = []
-        for dir_name in self.REQUIRED_DIRECTORIES:
-            dir_path = self.project_path / dir_name
-            if not dir_path.exists() or not dir_path.is_dir():
-                missing.append(dir_name)
-        return missing
+        existing = self._scan_existing_dirs()
+        return [
+            dir_name for _, dir_name in self._required_paths if dir_name not in existing
+        ]
@@ -3,10 +3,108 @@ Sketch file management for DrawBot VSCode Sketchbook.
 """
 
 import ast
+import os
 import re
+import time
+import tokenize
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from .validation_cache import VALIDATION_CACHE_DIR, ValidationCache
+
+# Maximum number of threads scanning example categories concurrently
+CATEGORY_SCAN_WORKERS = 8
+
+# Maximum number of syntax check results kept per manager
+SYNTAX_CACHE_SIZE = 256
+
+# Seconds a sketch listing is reused without rescanning the source
+# directories' subfolders; the source directories themselves are always checked
+LISTING_TTL = 2.0
+
+# "Key: value" metadata lines in a sketch docstring
+_META_RE = re.compile(r"^\s*(title|author|description|tags):\s*(.+)$", re.M | re.I)
+
+# Tokens that may precede a module docstring
+_PRE_DOCSTRING_TOKENS = frozenset(
+    {tokenize.ENCODING, tokenize.COMMENT, tokenize.NL, tokenize.NEWLINE}
+)
+
+
+def _read_module_docstring(sketch_path: Path) -> Optional[str]:
+    """Read a file's module docstring without reading past it.
+
+    Args:
+        sketch_path: Path to the Python file
+
+    Returns:
+        The docstring text, or None if the file does not start with one
+    """
+    with open(sketch_path, "rb") as f:
+        for token in tokenize.tokenize(f.readline):
+            if token.type in _PRE_DOCSTRING_TOKENS:
+                continue
+            if token.type != tokenize.STRING:
+                return None
+            value = ast.literal_eval(token.string)
+            return value if isinstance(value, str) else None
+    return None
+
+
+def _scan_sketches_dir(source_dir: Path) -> List[Dict[str, Any]]:
+    """List folder-based and flat sketches in the sketches directory."""
+    sketches = []
+    with os.scandir(source_dir) as it:
+        for entry in it:
+            if entry.is_dir():
+                # Folder-based structure: sketches/sketch_name/sketch_name.py
+                sketch_file = os.path.join(entry.path, f"{entry.name}.py")
+                if os.path.isfile(sketch_file):
+                    sketches.append(
+                        {
+                            "name": entry.name,
+                            "display_name": entry.name,
+                            "path": Path(sketch_file),
+                            "source_type": "sketch",
+                            "category": "Sketches",
+                        }
+                    )
+            elif entry.name.endswith(".py") and entry.is_file():
+                # Flat file structure: sketches/sketch_name.py
+                sketch_name = entry.name[:-3]
+                sketches.append(
+                    {
+                        "name": sketch_name,
+                        "display_name": sketch_name,
+                        "path": Path(entry.path),
+                        "source_type": "sketch",
+                        "category": "Sketches",
+                    }
+                )
+    return sketches
+
+
+def _scan_example_category(category_dir: os.DirEntry) -> List[Dict[str, Any]]:
+    """List the example sketches in one examples/<category> directory."""
+    category_name = category_dir.name
+    examples = []
+    with os.scandir(category_dir.path) as it:
+        for entry in it:
+            if entry.name.endswith(".py") and entry.is_file():
+                stem = entry.name[:-3]
+                examples.append(
+                    {
+                        # Unique name for CLI usage
+                        "name": f"{category_name}_{stem}",
+                        "display_name": f"{category_name}: {stem}",
+                        "path": Path(entry.path),
+                        "source_type": "example",
+                        "category": f"Examples: {category_name.title()}",
+                    }
+                )
+    return examples
 
 
 class SketchManager:
@@ -50,6 +148,23 @@ drawbot.saveImage("sketch_output.png")
             ("examples", self.examples_dir),
         ]
 
+        # Sketch name -> path index for find_sketch, with the source directory
+        # mtimes it was built at
+        self._sketch_index: Optional[Dict[str, Path]] = None
+        self._index_mtimes: Tuple[int, ...] = ()
+
+        # Full sketch listing, with the directory snapshot it was built from,
+        # the source directory mtimes and when that snapshot was last taken
+        self._all_sketches: Optional[List[Dict[str, Any]]] = None
+        self._all_sketches_key: Tuple[Any, ...] = ()
+        self._all_sketches_mtimes: Tuple[int, ...] = ()
+        self._all_sketches_checked = 0.0
+
+        # Syntax check results keyed by (path, mtime_ns, size), backed by the
+        # project's persistent content-hash cache
+        self._syntax_cache: Dict[Tuple[str, int, int], bool] = {}
+        self._validation_cache = ValidationCache(project_path / VALIDATION_CACHE_DIR)
+
     def create_sketch(self, name: str, template: Optional[str] = None) -> Path:
         """Create a new sketch folder with <folder_name>.py file.
 
@@ -90,10 +205,11 @@ drawbot.saveImage("sketch_output.png")
         else:
             content = self.DEFAULT_TEMPLATE
 
-        # Replace timestamp placeholder - only if it exists
+        # Replace timestamp placeholder - only if it exists. Plain replacement
+        # leaves the template's other braces (dicts, f-strings) untouched
         if "{timestamp}" in content:
-            content = content.format(
-                timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            content = content.replace(
+                "{timestamp}", datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             )
 
         # Create the <folder_name>.py file
@@ -109,19 +225,38 @@ drawbot.saveImage("sketch_output.png")
         Returns:
             True if syntax is valid, False otherwise
         """
-        if not sketch_path.exists():
+        if sketch_path.suffix != ".py":
             return False
 
-        if sketch_path.suffix != ".py":
+        try:
+            st = os.stat(sketch_path)
+        except OSError:
             return False
 
+        # Unchanged files reuse the previous result
+        key = (str(sketch_path), st.st_mtime_ns, st.st_size)
+        cached = self._syntax_cache.get(key)
+        if cached is not None:
+            return cached
+
         try:
-            content = sketch_path.read_text(encoding="utf-8")
-            ast.parse(content)
-            return True
-        except (SyntaxError, UnicodeDecodeError, OSError):
+            # Compiling catches everything ast.parse does, plus errors only
+            # raised at code generation (e.g. 'return' outside a function)
+            error = self._validation_cache.check(
+                sketch_path.read_bytes(), str(sketch_path)
+            )
+            valid = error is None
+        except (ValueError, UnicodeDecodeError):
+            valid = False
+        except OSError:
             return False
 
+        # Bound the cache; the oldest result is dropped first
+        if len(self._syntax_cache) >= SYNTAX_CACHE_SIZE:
+            self._syntax_cache.pop(next(iter(self._syntax_cache)))
+        self._syntax_cache[key] = valid
+        return valid
+
     def list_sketches_by_category(self, category: str) -> List[Path]:
         """List sketches in a specific category directory.
 
@@ -132,10 +267,18 @@ drawbot.saveImage("sketch_output.png")
             List of sketch file paths in the category
         """
         category_dir = self.sketches_dir / category
-        if not category_dir.exists() or not category_dir.is_dir():
+        try:
+            it = os.scandir(category_dir)
+        except (FileNotFoundError, NotADirectoryError):
             return []
 
-        return [f for f in category_dir.glob("*.py") if f.is_file()]
+        # Directory entries carry their file type, so no extra stat per file
+        with it:
+            return [
+                Path(entry.path)
+                for entry in it
+                if entry.name.endswith(".py") and entry.is_file()
+            ]
 
     def find_sketch(self, name: str) -> Optional[Path]:
         """Find a sketch by name across all source directories.
@@ -152,14 +295,33 @@ drawbot.saveImage("sketch_output.png")
         if name.endswith(".py"):
             name = name[:-3]
 
-        # Get all available sketches and find by name
-        all_sketches = self.list_all_sketches()
-
-        for sketch_info in all_sketches:
-            if sketch_info["name"] == name:
-                return Path(sketch_info["path"])
-
-        return None
+        # Serve from the index while the source directories are unchanged and
+        # the indexed file still exists
+        mtimes = self._source_mtimes()
+        if self._sketch_index is not None and mtimes == self._index_mtimes:
+            path = self._sketch_index.get(name)
+            if path is not None and path.is_file():
+                return path
+
+        # Rebuild on a miss too: a file added inside an existing sketch folder
+        # does not change the source directories' mtimes
+        index: Dict[str, Path] = {}
+        for sketch_info in self.list_all_sketches():
+            index.setdefault(sketch_info["name"], Path(sketch_info["path"]))
+        self._sketch_index = index
+        self._index_mtimes = mtimes
+
+        return index.get(name)
+
+    def _source_mtimes(self) -> Tuple[int, ...]:
+        """Modification times of the source directories (0 if missing)."""
+        mtimes = []
+        for _, source_dir in self.source_directories:
+            try:
+                mtimes.append(os.stat(source_dir).st_mtime_ns)
+            except OSError:
+                mtimes.append(0)
+        return tuple(mtimes)
 
     def get_sketch_metadata(self, sketch_path: Path) -> Dict[str, Any]:
         """Extract metadata from sketch file docstring.
@@ -181,61 +343,26 @@ drawbot.saveImage("sketch_output.png")
             return metadata
 
         try:
-            content = sketch_path.read_text(encoding="utf-8")
-
-            # Look for docstring at the beginning of the file
-            lines = content.strip().split("\n")
-            if len(lines) > 0 and lines[0].strip().startswith('"""'):
-                # Find the end of the docstring
-                docstring_lines = []
-                in_docstring = True
-
-                for i, line in enumerate(lines):
-                    if i == 0:
-                        # First line, remove opening """
-                        line = line.strip()[3:]
-                        if line.endswith('"""'):
-                            # Single line docstring
-                            docstring_lines.append(line[:-3])
-                            break
-                        elif line:
-                            docstring_lines.append(line)
-                    else:
-                        if line.strip().endswith('"""'):
-                            # End of docstring
-                            line = line.replace('"""', "").strip()
-                            if line:
-                                docstring_lines.append(line)
-                            break
-                        else:
-                            docstring_lines.append(line.strip())
-
-                # Parse docstring for metadata
-                docstring_text = "\n".join(docstring_lines)
-
-                # Look for metadata patterns
-                title_match = re.search(r"Title:\s*(.+)", docstring_text, re.IGNORECASE)
-                if title_match:
-                    metadata["title"] = title_match.group(1).strip()
-
-                author_match = re.search(
-                    r"Author:\s*(.+)", docstring_text, re.IGNORECASE
-                )
-                if author_match:
-                    metadata["author"] = author_match.group(1).strip()
-
-                desc_match = re.search(
-                    r"Description:\s*(.+)", docstring_text, re.IGNORECASE
-                )
-                if desc_match:
-                    metadata["description"] = desc_match.group(1).strip()
-
-                tags_match = re.search(r"Tags:\s*(.+)", docstring_text, re.IGNORECASE)
-                if tags_match:
-                    tags_text = tags_match.group(1).strip()
-                    metadata["tags"] = [tag.strip() for tag in tags_text.split(",")]
-
-        except (OSError, UnicodeDecodeError):
+            docstring_text = _read_module_docstring(sketch_path)
+            if docstring_text:
+                # One pass over the docstring; the first value for a key wins
+                found = {}
+                for match in _META_RE.finditer(docstring_text):
+                    found.setdefault(match.group(1).lower(), match.group(2).strip())
+
+                for key in ("title", "author", "description"):
+                    if key in found:
+                        metadata[key] = found[key]
+                if "tags" in found:
+                    metadata["tags"] = [tag.strip() for tag in found["tags"].split(",")]
+
+        except (
+            OSError,
+            UnicodeDecodeError,
+            SyntaxError,
+            ValueError,
+            tokenize.TokenError,
+        ):
             pass
 
         return metadata
@@ -243,6 +370,11 @@ drawbot.saveImage("sketch_output.png")
     def list_all_sketches(self) -> List[Dict[str, Any]]:
         """List all sketches from both sketches and examples directories.
 
+        The listing is rebuilt only when a source directory or one of its
+        subdirectories has changed; the returned dictionaries are shared and
+        must not be modified. Changes inside subdirectories are noticed
+        within LISTING_TTL seconds.
+
         Returns:
             List of dictionaries containing sketch information:
             {
@@ -253,6 +385,22 @@ drawbot.saveImage("sketch_output.png")
                 'category': str        # Category for examples (e.g., 'drawbotgrid')
             }
         """
+        # Within the TTL only the source directories themselves are statted
+        now = time.monotonic()
+        mtimes = self._source_mtimes()
+        if (
+            self._all_sketches is not None
+            and mtimes == self._all_sketches_mtimes
+            and now - self._all_sketches_checked < LISTING_TTL
+        ):
+            return list(self._all_sketches)
+
+        key = self._listing_key()
+        if self._all_sketches is not None and key == self._all_sketches_key:
+            self._all_sketches_mtimes = mtimes
+            self._all_sketches_checked = now
+            return list(self._all_sketches)
+
         all_sketches = []
 
         for source_type, source_dir in self.source_directories:
@@ -261,54 +409,46 @@ drawbot.saveImage("sketch_output.png")
 
             if source_type == "sketches":
                 # Handle sketches directory - both folder-based and flat file structure
-                for item in source_dir.iterdir():
-                    if item.is_dir():
-                        # Folder-based structure: sketches/sketch_name/sketch_name.py
-                        sketch_file = item / f"{item.name}.py"
-                        if sketch_file.exists() and sketch_file.is_file():
-                            all_sketches.append(
-                                {
-                                    "name": item.name,
-                                    "display_name": item.name,
-                                    "path": sketch_file,
-                                    "source_type": "sketch",
-                                    "category": "Sketches",
-                                }
-                            )
-                    elif item.is_file() and item.suffix == ".py":
-                        # Flat file structure: sketches/sketch_name.py
-                        sketch_name = item.stem
-                        all_sketches.append(
-                            {
-                                "name": sketch_name,
-                                "display_name": sketch_name,
-                                "path": item,
-                                "source_type": "sketch",
-                                "category": "Sketches",
-                            }
-                        )
+                all_sketches.extend(_scan_sketches_dir(source_dir))
 
             elif source_type == "examples":
-                # Handle examples directory - can have nested categories
-                for category_item in source_dir.iterdir():
-                    if category_item.is_dir():
-                        category_name = category_item.name
-
-                        # Look for Python files in the category directory
-                        for py_file in category_item.glob("*.py"):
-                            if py_file.is_file():
-                                # Create unique name for CLI usage
-                                unique_name = f"{category_name}_{py_file.stem}"
-                                display_name = f"{category_name}: {py_file.stem}"
-
-                                all_sketches.append(
-                                    {
-                                        "name": unique_name,
-                                        "display_name": display_name,
-                                        "path": py_file,
-                                        "source_type": "example",
-                                        "category": f"Examples: {category_name.title()}",
-                                    }
-                                )
-
-        return all_sketches
+                # Handle examples directory - one independent scan per category
+                with os.scandir(source_dir) as it:
+                    categories = [entry for entry in it if entry.is_dir()]
+                if len(categories) > 1:
+                    workers = min(CATEGORY_SCAN_WORKERS, len(categories))
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        scans = list(executor.map(_scan_example_category, categories))
+                else:
+                    scans = [_scan_example_category(c) for c in categories]
+                for examples in scans:
+                    all_sketches.extend(examples)
+
+        self._all_sketches = all_sketches
+        self._all_sketches_key = key
+        self._all_sketches_mtimes = mtimes
+        self._all_sketches_checked = now
+        return list(all_sketches)
+
+    def _listing_key(self) -> Tuple[Any, ...]:
+        """Snapshot of the directory mtimes list_all_sketches depends on.
+
+        Covers each source directory and its immediate subdirectories (sketch
+        folders and example categories), since adding a file inside a
+        subdirectory does not change the source directory's own mtime.
+        """
+        key = []
+        for _, source_dir in self.source_directories:
+            try:
+                dir_mtime = os.stat(source_dir).st_mtime_ns
+                with os.scandir(source_dir) as it:
+                    subdirs = tuple(
+                        (entry.name, entry.stat().st_mtime_ns)
+                        for entry in it
+                        if entry.is_dir()
+                    )
+            except OSError:
+                key.append(None)
+                continue
+            key.append((dir_mtime, subdirs))
+        return tuple(key)
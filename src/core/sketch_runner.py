@@ -5,15 +5,41 @@ Sketch execution engine for DrawBot VSCode Sketchbook.
 import contextlib
 import io
 import os
+import re
+import select
 import subprocess
 import sys
 import tempfile
 import threading
 import time
+import weakref
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .sketch_worker import REPLY_HEADER, decode_reply, encode_frame
+from .validation_cache import VALIDATION_CACHE_DIR, ValidationCache
+
+# Script run by worker processes
+WORKER_SCRIPT = Path(__file__).with_name("sketch_worker.py")
+
+# Loads WORKER_SCRIPT (argv[1]) through the import system, which reuses its
+# cached bytecode; running the file directly as __main__ recompiles it on
+# every spawn. Loading by path keeps src/core off the sketch's sys.path.
+_WORKER_BOOTSTRAP = (
+    "import importlib.util, sys\n"
+    "spec = importlib.util.spec_from_file_location('sketch_worker', sys.argv[1])\n"
+    "worker = importlib.util.module_from_spec(spec)\n"
+    "spec.loader.exec_module(worker)\n"
+    "worker.main()\n"
+)
+
+# Extensions of files a sketch may produce
+OUTPUT_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg", ".pdf", ".svg", ".gif", ".mp4"})
+
+# Multi-page output files are named page_1.png, page_2.png, ...
+_PAGE_STEM_RE = re.compile(r"page_(\d+)")
 
 
 @dataclass
@@ -31,27 +57,157 @@ class ExecutionResult:
     timestamp: Optional[datetime] = None
 
 
+def _stop_workers(workers: List[subprocess.Popen], kill: bool = False):
+    """Stop worker processes and empty the list.
+
+    Workers exit on their own once stdin is closed; ``kill`` skips the wait.
+    """
+    for worker in workers:
+        try:
+            worker.stdin.close()
+        except OSError:
+            pass
+        if kill:
+            worker.kill()
+        try:
+            worker.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            worker.kill()
+            worker.wait()
+        worker.stdout.close()
+    del workers[:]
+
+
+def _output_candidates(output_dir: Path) -> List[Tuple[str, os.DirEntry]]:
+    """List (stem, entry) pairs for possible output files in one directory.
+
+    Hidden files are skipped, as glob did. A missing directory has none.
+    """
+    candidates = []
+    try:
+        with os.scandir(output_dir) as it:
+            for entry in it:
+                if entry.name.startswith("."):
+                    continue
+                stem, ext = os.path.splitext(entry.name)
+                if ext in OUTPUT_EXTENSIONS and entry.is_file():
+                    candidates.append((stem, entry))
+    except OSError:
+        pass
+    return candidates
+
+
+def _output_signature(entry: os.DirEntry) -> Tuple[int, int, int]:
+    """(mtime_ns, size, inode) of an output file.
+
+    Size and inode catch rewrites that land within the filesystem's timestamp
+    resolution, which is one or two seconds on some filesystems.
+    """
+    st = entry.stat()
+    return st.st_mtime_ns, st.st_size, entry.inode()
+
+
+def _reported_candidates(paths: Iterable[str]) -> List[Tuple[str, str, int]]:
+    """List (stem, path, mtime_ns) for reported output files that still exist."""
+    candidates = []
+    for path in paths:
+        stem, ext = os.path.splitext(os.path.basename(path))
+        if ext not in OUTPUT_EXTENSIONS:
+            continue
+        try:
+            candidates.append((stem, path, os.stat(path).st_mtime_ns))
+        except OSError:
+            continue  # Removed again by the sketch
+    return candidates
+
+
+def _select_outputs(candidates: List[Tuple[str, str, int]]) -> Tuple[Path, List[Path]]:
+    """Pick the primary output and all outputs from one directory's files.
+
+    Args:
+        candidates: (stem, path, mtime_ns) for each output file
+
+    Returns:
+        tuple: (primary_output_path, all_output_files)
+    """
+    # Check for multi-page pattern (page_1.png, page_2.png, etc.)
+    pages = []
+    for stem, path, _ in candidates:
+        match = _PAGE_STEM_RE.fullmatch(stem)
+        if match:
+            pages.append((int(match.group(1)), path))
+
+    if pages:
+        # Sort page files by page number
+        pages.sort(key=lambda page: page[0])
+        page_files = [Path(path) for _, path in pages]
+        # Return first page as primary, all pages as list
+        return page_files[0], page_files
+    else:
+        # Single file output - return most recent as primary
+        _, newest, _ = max(candidates, key=lambda c: c[2])
+        primary_file = Path(newest)
+        return primary_file, [primary_file]
+
+
 class SketchRunner:
     """Manages sketch execution with safety and monitoring."""
 
-    def __init__(self, project_path: Path, timeout: float = 30.0):
+    def __init__(
+        self,
+        project_path: Path,
+        timeout: float = 30.0,
+        persistent_worker: Optional[bool] = None,
+        validation_cache_dir: Optional[Path] = None,
+    ):
         """Initialize sketch runner.
 
+        Sketches run in worker subprocesses. Persistent workers import DrawBot
+        once and are reused across runs; otherwise each run starts a new
+        interpreter.
+
         Args:
             project_path: Path to the project directory
             timeout: Maximum execution time in seconds
+            persistent_worker: Reuse worker processes between runs. Defaults
+                to True except on Windows, where pipes cannot be polled
+            validation_cache_dir: Directory for stored syntax check results.
+                Defaults to ``project_path / VALIDATION_CACHE_DIR``
         """
         self.project_path = project_path
         self.timeout = timeout
 
+        # Syntax check results shared across runs and processes
+        if validation_cache_dir is None:
+            validation_cache_dir = Path(project_path) / VALIDATION_CACHE_DIR
+        self._validation_cache = ValidationCache(validation_cache_dir)
+
+        # Output directories already created by this runner
+        self._ensured_dirs = set()
+
+        # Resolved on first use; the venv layout does not change at runtime
+        self._python_executable: Optional[str] = None
+
+        if persistent_worker is None:
+            persistent_worker = os.name != "nt"
+        self.persistent_worker = persistent_worker
+        self._idle_workers: List[subprocess.Popen] = []
+        self._workers_lock = threading.Lock()
+        weakref.finalize(self, _stop_workers, self._idle_workers)
+
     def run_sketch(
-        self, sketch_path: Path, output_dir: Optional[Path] = None
+        self,
+        sketch_path: Path,
+        output_dir: Optional[Path] = None,
+        stat_result: Optional[os.stat_result] = None,
     ) -> ExecutionResult:
         """Run a sketch and return execution results.
 
         Args:
             sketch_path: Path to the sketch file to execute
             output_dir: Optional custom output directory
+            stat_result: Result of a caller's ``os.stat`` of sketch_path,
+                which skips re-checking that the file exists
 
         Returns:
             ExecutionResult containing execution status and outputs
@@ -60,7 +216,7 @@ class SketchRunner:
         timestamp = datetime.now()
 
         # Validate sketch file exists
-        if not sketch_path.exists():
+        if stat_result is None and not sketch_path.exists():
             return ExecutionResult(
                 success=False,
                 error=f"Sketch file not found: {sketch_path}",
@@ -104,175 +260,70 @@ class SketchRunner:
     def _execute_with_subprocess(
         self, sketch_path: Path, output_dir: Path
     ) -> ExecutionResult:
-        """Execute sketch using subprocess for better isolation."""
-
-        # Determine the Python executable to use
-        python_executable = self._get_python_executable()
+        """Execute sketch in a worker subprocess for isolation."""
 
-        # Prepare environment
-        env = os.environ.copy()
-
-        # Create execution script that changes directory and runs the sketch
         # Ensure absolute paths
         sketch_path = sketch_path.resolve()
-        sketch_dir = sketch_path.parent
-        execution_script = f"""
-import os
-import sys
-import traceback
 
-# Change to sketch directory so relative paths work correctly
-os.chdir(r'{sketch_dir}')
-
-# Add project path to Python path for imports
-sys.path.insert(0, r'{self.project_path}')
-
-# Patch DrawBot for retina scaling and multi-page extraction
-def setup_drawbot_patches():
-    try:
-        import drawBot
-        from pathlib import Path
-
-        # Store original functions
-        _original_saveImage = drawBot.saveImage
-        _original_newPage = drawBot.newPage
-
-        # Track pages for multi-page documents
-        _page_count = 0
-        _current_sketch_name = Path(r'{sketch_path}').stem
-        _page_images = []  # Store individual pages as they're created
-
-        def patched_newPage(*args, **kwargs):
-            nonlocal _page_count, _page_images
-
-            # Before creating new page, save current page if we have content
-            if _page_count >= 0:  # Always save, including page 0 (first page)
-                try:
-                    page_filename = f"{{_current_sketch_name}}_page_{{_page_count + 1}}.png"
-                    page_path = Path(r'{sketch_path}').parent / page_filename
-                    _original_saveImage(str(page_path), imageResolution=216)
-                    _page_images.append(page_path)
-                    print(f"Saved page {{_page_count + 1}} to {{page_filename}}", file=sys.stderr)
-                except Exception as e:
-                    print(f"Warning: Could not save page {{_page_count + 1}}: {{e}}", file=sys.stderr)
-
-            _page_count += 1
-            return _original_newPage(*args, **kwargs)
-
-        def patched_saveImage(path, *args, **kwargs):
-            nonlocal _page_count, _page_images
-
-            # For PNG output, use high imageResolution for retina displays
-            if str(path).lower().endswith('.png'):
-                kwargs['imageResolution'] = 216
-
-            # If this is a PDF and we have multiple pages, save the final page first
-            if str(path).lower().endswith('.pdf') and _page_count >= 0:
-                try:
-                    # Save the final page
-                    page_filename = f"{{_current_sketch_name}}_page_{{_page_count + 1}}.png"
-                    page_path = Path(path).parent / page_filename
-                    _original_saveImage(str(page_path), imageResolution=216)
-                    _page_images.append(page_path)
-                    print(f"Saved final page {{_page_count + 1}} to {{page_filename}}", file=sys.stderr)
-                except Exception as e:
-                    print(f"Warning: Could not save final page: {{e}}", file=sys.stderr)
-
-            # Call original saveImage for the main output
-            result = _original_saveImage(path, *args, **kwargs)
-            return result
-
-        # Apply patches
-        drawBot.newPage = patched_newPage
-        drawBot.saveImage = patched_saveImage
-
-    except ImportError:
-        pass  # DrawBot not available, skip patching
-
-setup_drawbot_patches()
-
-# Create output directory if it doesn't exist
-output_dir = r'{output_dir}'
-os.makedirs(output_dir, exist_ok=True)
-
-try:
-    with open(r'{sketch_path}', 'r', encoding='utf-8') as f:
-        sketch_code = f.read()
-
-    # Create a clean namespace for execution
-    namespace = {{
-        '__name__': '__main__',
-        '__file__': r'{sketch_path}',
-    }}
-
-    # Execute the sketch
-    exec(sketch_code, namespace)
-
-except Exception as e:
-    print(f"ERROR: {{type(e).__name__}}: {{str(e)}}", file=sys.stderr)
-    traceback.print_exc(file=sys.stderr)
-    sys.exit(1)
-"""
+        # Create output directory if it doesn't exist, once per runner
+        output_key = os.path.abspath(output_dir)
+        if output_key not in self._ensured_dirs:
+            os.makedirs(output_key, exist_ok=True)
+            self._ensured_dirs.add(output_key)
+
+        # Places a sketch may write to, in order of preference
+        output_dirs = [output_dir, sketch_path.parent, sketch_path.parent / "output"]
+
+        # Files already there before the run are not reported as its output
+        previous_outputs = self._snapshot_outputs(output_dirs)
+        request = encode_frame(
+            {
+                "sketch_path": str(sketch_path),
+                "sketch_dir": str(sketch_path.parent),
+                "project_path": str(self.project_path),
+            }
+        )
 
         try:
-            # Run the execution script
-            process = subprocess.Popen(
-                [python_executable, "-c", execution_script],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                cwd=str(sketch_dir),
-                env=env,
-            )
-
-            # Wait for completion with timeout
             try:
-                stdout, stderr = process.communicate(timeout=self.timeout)
-                return_code = process.returncode
-
-                # Determine output path (look for generated files)
-                output_path, output_files = self._find_output_files(output_dir)
-
-                # If no files found in output dir, also check sketch directory
-                if not output_path:
-                    sketch_dir = sketch_path.parent
-                    output_path, output_files = self._find_output_files(sketch_dir)
-
-                # If still no files found, check sketch's output subdirectory
-                if not output_path:
-                    sketch_output_dir = sketch_path.parent / "output"
-                    output_path, output_files = self._find_output_files(
-                        sketch_output_dir
-                    )
-
-                if return_code == 0:
-                    return ExecutionResult(
-                        success=True,
-                        stdout=stdout if stdout else None,
-                        stderr=stderr if stderr else None,
-                        output_path=output_path,
-                        output_files=output_files,
-                    )
+                if self.persistent_worker:
+                    response = self._run_in_worker(request)
                 else:
-                    # Extract error from stderr
-                    error_msg = stderr if stderr else "Unknown execution error"
-                    return ExecutionResult(
-                        success=False,
-                        error=error_msg,
-                        stdout=stdout if stdout else None,
-                        stderr=stderr if stderr else None,
-                    )
-
+                    response = self._run_once(request)
             except subprocess.TimeoutExpired:
-                process.kill()
-                try:
-                    stdout, stderr = process.communicate(timeout=1.0)
-                except subprocess.TimeoutExpired:
-                    stdout, stderr = "", ""
+                return ExecutionResult(
+                    success=False, error="Sketch execution timed out"
+                )
 
+            stdout = response["stdout"]
+            stderr = response["stderr"]
+
+            # Determine output path (look for generated files), falling back
+            # to the sketch directory and then its output subdirectory. Files
+            # the worker saw DrawBot save belong to this run even when other
+            # runs write to the same directories
+            output_path, output_files = self._find_output_files(
+                output_dirs, previous_outputs, response["outputs"]
+            )
+            if response["ok"] and output_path is None:
+                # A file rewritten in place within the filesystem's timestamp
+                # resolution looks unchanged; report the newest output instead
+                output_path, output_files = self._find_output_files(output_dirs)
+
+            if response["ok"]:
+                return ExecutionResult(
+                    success=True,
+                    stdout=stdout if stdout else None,
+                    stderr=stderr if stderr else None,
+                    output_path=output_path,
+                    output_files=output_files,
+                )
+            else:
+                # Extract error from stderr
+                error_msg = stderr if stderr else "Unknown execution error"
                 return ExecutionResult(
                     success=False,
-                    error="Sketch execution timed out",
+                    error=error_msg,
                     stdout=stdout if stdout else None,
                     stderr=stderr if stderr else None,
                 )
@@ -282,49 +333,184 @@ except Exception as e:
                 success=False, error=f"Failed to execute sketch: {str(e)}"
             )
 
+    def _spawn_worker(self) -> subprocess.Popen:
+        """Start a sketch worker process."""
+        return subprocess.Popen(
+            [
+                self._get_python_executable(),
+                "-u",
+                "-c",
+                _WORKER_BOOTSTRAP,
+                str(WORKER_SCRIPT),
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            bufsize=0,
+        )
+
+    def _run_once(self, request: bytes) -> Dict[str, Any]:
+        """Run a single request in a fresh worker that exits afterwards.
+
+        Raises:
+            subprocess.TimeoutExpired: If the sketch exceeds the timeout
+        """
+        process = self._spawn_worker()
+        try:
+            stdout, _ = process.communicate(request, timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise
+
+        header = stdout[: REPLY_HEADER.size]
+        if len(header) < REPLY_HEADER.size:
+            raise RuntimeError(f"Sketch worker exited with code {process.returncode}")
+        return decode_reply(header, stdout[REPLY_HEADER.size :])
+
+    def _run_in_worker(self, request: bytes) -> Dict[str, Any]:
+        """Run a request on an idle persistent worker, starting one if needed.
+
+        A worker that times out or fails is killed and replaced on the next
+        request.
+
+        Raises:
+            subprocess.TimeoutExpired: If the sketch exceeds the timeout
+        """
+        worker = self._acquire_worker()
+        try:
+            worker.stdin.write(request)
+            deadline = time.monotonic() + self.timeout
+            header = self._read_reply(worker, REPLY_HEADER.size, deadline)
+            _, out_len, err_len, paths_len = REPLY_HEADER.unpack(header)
+            body = self._read_reply(worker, out_len + err_len + paths_len, deadline)
+        except BaseException:
+            _stop_workers([worker], kill=True)
+            raise
+
+        with self._workers_lock:
+            self._idle_workers.append(worker)
+        return decode_reply(header, body)
+
+    def _acquire_worker(self) -> subprocess.Popen:
+        """Take an idle live worker, or start a new one."""
+        with self._workers_lock:
+            while self._idle_workers:
+                worker = self._idle_workers.pop()
+                if worker.poll() is None:
+                    return worker
+        return self._spawn_worker()
+
+    def _read_reply(
+        self, worker: subprocess.Popen, size: int, deadline: float
+    ) -> bytearray:
+        """Read exactly size bytes from a worker before the deadline.
+
+        Bytes are read straight into a preallocated buffer as soon as the
+        pipe has data, so large outputs are neither re-copied nor left
+        stalling the worker on a full pipe.
+
+        Raises:
+            subprocess.TimeoutExpired: If the deadline passes first
+            RuntimeError: If the worker exits first
+        """
+        fd = worker.stdout.fileno()
+        data = bytearray(size)
+        view = memoryview(data)
+        received = 0
+        while received < size:
+            remaining = deadline - time.monotonic()
+            ready = remaining > 0 and select.select([fd], [], [], remaining)[0]
+            if not ready:
+                raise subprocess.TimeoutExpired(worker.args, self.timeout)
+            count = os.readv(fd, [view[received:]])
+            if not count:
+                raise RuntimeError("Sketch worker exited unexpectedly")
+            received += count
+        return data
+
+    def close(self):
+        """Stop idle worker processes.
+
+        Workers are also stopped when the runner is garbage collected or the
+        interpreter exits.
+        """
+        with self._workers_lock:
+            _stop_workers(self._idle_workers)
+
     def _find_output_files(
-        self, output_dir: Path
+        self,
+        output_dirs: Iterable[Path],
+        previous_outputs: Optional[Dict[str, Tuple[int, int, int]]] = None,
+        reported: Optional[List[str]] = None,
     ) -> tuple[Optional[Path], Optional[List[Path]]]:
-        """Find generated output files in the output directory.
+        """Find generated output files in the first directory that has any.
+
+        Args:
+            output_dirs: Directories to search, in order of preference; a
+                directory listed twice is only scanned once
+            previous_outputs: Snapshot from _snapshot_outputs taken before the
+                run; files it lists with an unchanged mtime, size and inode
+                are ignored
+            reported: Paths the worker saw the sketch save through DrawBot.
+                When any are given, only these count as output and the
+                directories are not compared against the snapshot
 
         Returns:
             tuple: (primary_output_path, all_output_files)
                    primary_output_path: Main output file (for backward compatibility)
                    all_output_files: List of all output files (for multi-page support)
         """
+        if previous_outputs is None:
+            previous_outputs = {}
+
+        # Reported paths grouped by directory, each file listed once
+        reported_by_dir: Dict[str, Dict[str, None]] = {}
+        for path in reported or ():
+            directory = os.path.realpath(os.path.dirname(path))
+            reported_by_dir.setdefault(directory, {})[path] = None
+
+        scanned = set()
+        for output_dir in output_dirs:
+            key = os.path.realpath(output_dir)
+            if key in scanned:
+                continue
+            scanned.add(key)
+
+            if reported_by_dir:
+                candidates = _reported_candidates(reported_by_dir.get(key, ()))
+            else:
+                candidates = []
+                for stem, entry in _output_candidates(output_dir):
+                    try:
+                        signature = _output_signature(entry)
+                    except OSError:
+                        continue  # Removed while scanning
+                    if previous_outputs.get(entry.path) != signature:
+                        candidates.append((stem, entry.path, signature[0]))
+            if candidates:
+                return _select_outputs(candidates)
+
+        return None, None
+
+    def _snapshot_outputs(
+        self, output_dirs: Iterable[Path]
+    ) -> Dict[str, Tuple[int, int, int]]:
+        """Record the output files already present.
+
+        Args:
+            output_dirs: Directories that will be searched after the run
 
-        # Common output extensions
-        output_extensions = [".png", ".jpg", ".jpeg", ".pdf", ".svg", ".gif", ".mp4"]
-
-        # Look for recently created files
-        if not output_dir.exists():
-            return None, None
-
-        output_files = []
-        for ext in output_extensions:
-            pattern = f"*{ext}"
-            matches = list(output_dir.glob(pattern))
-            output_files.extend(matches)
-
-        if not output_files:
-            return None, None
-
-        # Check for multi-page pattern (page_1.png, page_2.png, etc.)
-        page_files = [
-            f
-            for f in output_files
-            if f.stem.startswith("page_") and f.stem[5:].isdigit()
-        ]
-
-        if page_files:
-            # Sort page files by page number
-            page_files.sort(key=lambda f: int(f.stem[5:]))
-            # Return first page as primary, all pages as list
-            return page_files[0], page_files
-        else:
-            # Single file output - return most recent as primary
-            primary_file = max(output_files, key=lambda f: f.stat().st_mtime)
-            return primary_file, [primary_file]
+        Returns:
+            (mtime_ns, size, inode) keyed by file path
+        """
+        snapshot = {}
+        for output_dir in output_dirs:
+            for _, entry in _output_candidates(output_dir):
+                try:
+                    snapshot[entry.path] = _output_signature(entry)
+                except OSError:
+                    pass  # Removed while scanning
+        return snapshot
 
     def validate_sketch_before_run(self, sketch_path: Path) -> ExecutionResult:
         """Validate sketch syntax before execution.
@@ -343,20 +529,17 @@ except Exception as e:
             )
 
         try:
-            with open(sketch_path, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            # Try to compile the code
-            compile(content, str(sketch_path), "exec")
+            # Try to compile the code, unless this source was checked before
+            error = self._validation_cache.check(
+                sketch_path.read_bytes(), str(sketch_path)
+            )
+            if error is not None:
+                return ExecutionResult(
+                    success=False, error=error, sketch_path=sketch_path
+                )
 
             return ExecutionResult(success=True, sketch_path=sketch_path)
 
-        except SyntaxError as e:
-            return ExecutionResult(
-                success=False,
-                error=f"SyntaxError: {e.msg} at line {e.lineno}",
-                sketch_path=sketch_path,
-            )
         except Exception as e:
             return ExecutionResult(
                 success=False,
@@ -364,8 +547,60 @@ except Exception as e:
                 sketch_path=sketch_path,
             )
 
+    def validate_many(self, sketch_paths: List[Path]) -> List[ExecutionResult]:
+        """Validate several sketches, compiling uncached ones in parallel.
+
+        Args:
+            sketch_paths: Paths to sketch files
+
+        Returns:
+            One ExecutionResult per path, as from validate_sketch_before_run
+        """
+        results: List[Optional[ExecutionResult]] = [None] * len(sketch_paths)
+        readable = []
+        sources = []
+        for index, sketch_path in enumerate(sketch_paths):
+            try:
+                sources.append((sketch_path.read_bytes(), str(sketch_path)))
+                readable.append(index)
+            except FileNotFoundError:
+                results[index] = ExecutionResult(
+                    success=False,
+                    error=f"Sketch file not found: {sketch_path}",
+                    sketch_path=sketch_path,
+                )
+            except Exception as e:
+                results[index] = ExecutionResult(
+                    success=False,
+                    error=f"Validation error: {str(e)}",
+                    sketch_path=sketch_path,
+                )
+
+        outcomes = self._validation_cache.check_many(sources)
+        for index, outcome in zip(readable, outcomes):
+            sketch_path = sketch_paths[index]
+            if outcome is None:
+                results[index] = ExecutionResult(success=True, sketch_path=sketch_path)
+            elif isinstance(outcome, Exception):
+                results[index] = ExecutionResult(
+                    success=False,
+                    error=f"Validation error: {str(outcome)}",
+                    sketch_path=sketch_path,
+                )
+            else:
+                results[index] = ExecutionResult(
+                    success=False, error=outcome, sketch_path=sketch_path
+                )
+        return results
+
     def _get_python_executable(self) -> str:
         """Get the appropriate Python executable, preferring virtual environment if available."""
+        if self._python_executable is None:
+            self._python_executable = self._find_python_executable()
+        return self._python_executable
+
+    def _find_python_executable(self) -> str:
+        """Locate the Python executable for running sketches."""
 
         # Check if we're in a virtual environment
         if hasattr(sys, "real_prefix") or (
@@ -0,0 +1,359 @@
+"""
+Sketch worker - long-lived child process that executes sketches on request.
+
+Loaded by SketchRunner in a child interpreter, which calls main(). DrawBot is
+imported and patched once at startup, then each request runs one sketch in a
+fresh namespace. Requests are length-prefixed JSON frames on stdin and
+raw binary replies on stdout; the worker exits when stdin is closed.
+
+Only the standard library is used here, since the worker may run under a
+different interpreter (a project venv) than the server.
+"""
+
+import contextlib
+import io
+import json
+import os
+import struct
+import sys
+import traceback
+from collections import OrderedDict, deque
+from pathlib import Path
+from types import CodeType
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+# Frame header: payload length as an unsigned 32-bit big-endian integer
+FRAME_HEADER = struct.Struct(">I")
+
+# Reply header: success flag, then byte lengths of the captured stdout, the
+# captured stderr and the saved output paths, which follow in that order as
+# raw UTF-8 without any escaping; paths are separated by NUL bytes
+REPLY_HEADER = struct.Struct(">?III")
+
+# Resolution used for PNG output and extracted pages (retina scaling)
+IMAGE_RESOLUTION = 216
+
+# Maximum characters of stdout and of stderr kept per run; older output is
+# dropped first, so tracebacks at the end survive
+MAX_CAPTURED_OUTPUT = 1024 * 1024
+
+# Maximum number of compiled sketches kept by a worker
+CODE_CACHE_SIZE = 64
+
+# Compiled sketches keyed by (path, mtime_ns, size), least recently used first
+_code_cache: "OrderedDict[Tuple[str, int, int], CodeType]" = OrderedDict()
+
+
+def encode_frame(message: Dict[str, Any]) -> bytes:
+    """Serialize a message into a length-prefixed frame."""
+    payload = json.dumps(message).encode("utf-8")
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+def decode_frame(payload: bytes) -> Dict[str, Any]:
+    """Deserialize a frame payload (without its header)."""
+    return json.loads(payload.decode("utf-8"))
+
+
+def encode_reply(
+    ok: bool, stdout: str, stderr: str, outputs: Iterable[str] = ()
+) -> bytes:
+    """Serialize a run's outcome into a binary reply."""
+    out = stdout.encode("utf-8", "replace")
+    err = stderr.encode("utf-8", "replace")
+    paths = "\0".join(outputs).encode("utf-8", "surrogateescape")
+    return REPLY_HEADER.pack(ok, len(out), len(err), len(paths)) + out + err + paths
+
+
+def decode_reply(header: bytes, body: bytes) -> Dict[str, Any]:
+    """Deserialize a binary reply from its header and body."""
+    ok, out_len, err_len, _ = REPLY_HEADER.unpack(header)
+    err_end = out_len + err_len
+    paths = body[err_end:].decode("utf-8", "surrogateescape")
+    return {
+        "ok": ok,
+        "stdout": body[:out_len].decode("utf-8"),
+        "stderr": body[out_len:err_end].decode("utf-8"),
+        "outputs": paths.split("\0") if paths else [],
+    }
+
+
+def _read_exact(stream: BinaryIO, size: int) -> Optional[bytes]:
+    """Read exactly size bytes, or None if the stream ends first."""
+    data = b""
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+class _OutputTail(io.TextIOBase):
+    """Text stream keeping only the last ``limit`` characters written."""
+
+    def __init__(self, limit: int = MAX_CAPTURED_OUTPUT):
+        self.limit = limit
+        self._chunks: "deque[str]" = deque()
+        self._size = 0
+        self._dropped = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        written = len(text)
+        if written > self.limit:
+            self._dropped += written - self.limit
+            text = text[-self.limit :]
+        self._chunks.append(text)
+        self._size += len(text)
+        # Drop whole chunks while the rest still fills the limit
+        while self._size - len(self._chunks[0]) >= self.limit:
+            dropped = self._chunks.popleft()
+            self._size -= len(dropped)
+            self._dropped += len(dropped)
+        return written
+
+    def getvalue(self) -> str:
+        text = "".join(self._chunks)
+        dropped = self._dropped + max(0, len(text) - self.limit)
+        if not dropped:
+            return text
+        notice = f"[{dropped} earlier characters of output dropped]\n"
+        return notice + text[-self.limit :]
+
+
+class _PageState:
+    """Per-run state shared with the DrawBot patches.
+
+    ``outputs`` lists the absolute path of every file saved through DrawBot
+    during the run, so the runner can tell this run's output apart from
+    files other runs write to the same directories.
+    """
+
+    def __init__(self):
+        self.sketch_path = Path()
+        self.page_count = 0
+        self.page_images = []
+        self.outputs: List[str] = []
+
+    def reset(self, sketch_path: Path):
+        self.sketch_path = sketch_path
+        self.page_count = 0
+        self.page_images = []
+        self.outputs = []
+
+
+def _setup_drawbot_patches(state: _PageState) -> Any:
+    """Import DrawBot and patch it for retina scaling and page extraction.
+
+    Returns:
+        The drawBot module, or None if DrawBot is not installed
+    """
+    try:
+        import drawBot
+    except ImportError:
+        return None  # DrawBot not available, skip patching
+
+    # Store original functions
+    _original_saveImage = drawBot.saveImage
+    _original_newPage = drawBot.newPage
+
+    def save_page(directory: Path, label: str):
+        page_filename = f"{state.sketch_path.stem}_page_{state.page_count + 1}.png"
+        page_path = directory / page_filename
+        _original_saveImage(str(page_path), imageResolution=IMAGE_RESOLUTION)
+        state.page_images.append(page_path)
+        state.outputs.append(os.path.abspath(page_path))
+        print(
+            f"Saved {label} {state.page_count + 1} to {page_filename}", file=sys.stderr
+        )
+
+    def patched_newPage(*args, **kwargs):
+        # Save the page being finished before starting the next one. The
+        # opening newPage() has nothing to save yet, and the last page is
+        # saved by saveImage() when the sketch writes a PDF
+        if drawBot.pageCount() > 0:
+            try:
+                save_page(state.sketch_path.parent, "page")
+            except Exception as e:
+                print(
+                    f"Warning: Could not save page {state.page_count + 1}: {e}",
+                    file=sys.stderr,
+                )
+            state.page_count += 1
+
+        return _original_newPage(*args, **kwargs)
+
+    def patched_saveImage(path, *args, **kwargs):
+        # Only the extension decides the handling; animations call this once
+        # per frame, so avoid lowercasing the whole path
+        suffix = str(path)[-4:].lower()
+
+        # For PNG output, use high imageResolution for retina displays
+        if suffix == ".png":
+            kwargs["imageResolution"] = IMAGE_RESOLUTION
+
+        # If this is a PDF, save the final page as a PNG first
+        elif suffix == ".pdf":
+            try:
+                save_page(Path(path).parent, "final page")
+            except Exception as e:
+                print(f"Warning: Could not save final page: {e}", file=sys.stderr)
+
+        # Call original saveImage for the main output
+        result = _original_saveImage(path, *args, **kwargs)
+        state.outputs.append(os.path.abspath(path))
+        return result
+
+    # Apply patches
+    drawBot.newPage = patched_newPage
+    drawBot.saveImage = patched_saveImage
+    return drawBot
+
+
+def load_code(sketch_path: str) -> CodeType:
+    """Compile a sketch, reusing the code object while the file is unchanged.
+
+    Args:
+        sketch_path: Absolute path of the sketch
+
+    Returns:
+        Code object for the sketch source
+    """
+    st = os.stat(sketch_path)
+    key = (sketch_path, st.st_mtime_ns, st.st_size)
+    code = _code_cache.get(key)
+    if code is not None:
+        _code_cache.move_to_end(key)
+        return code
+
+    with open(sketch_path, "r", encoding="utf-8") as f:
+        sketch_code = f.read()
+    code = compile(sketch_code, sketch_path, "exec")
+
+    _code_cache[key] = code
+    if len(_code_cache) > CODE_CACHE_SIZE:
+        _code_cache.popitem(last=False)
+    return code
+
+
+def _is_under(path: Optional[str], roots) -> bool:
+    """Whether a module file lives below one of the given directories."""
+    if not path:
+        return False
+    # Modules found through a relative sys.path entry have relative paths
+    path = os.path.abspath(path)
+    return any(path.startswith(root) for root in roots)
+
+
+def run_request(
+    request: Dict[str, Any], state: _PageState, drawbot: Any
+) -> Dict[str, Any]:
+    """Execute one sketch and describe the outcome.
+
+    Args:
+        request: Frame with sketch_path, sketch_dir and project_path
+        state: Page state used by the DrawBot patches
+        drawbot: Patched drawBot module, or None
+
+    Returns:
+        Response frame with ok, stdout, stderr and the saved output paths
+    """
+    sketch_path = request["sketch_path"]
+    sketch_dir = request["sketch_dir"]
+    project_path = request["project_path"]
+
+    saved_cwd = os.getcwd()
+    saved_sys_path = list(sys.path)
+    saved_modules = set(sys.modules)
+    stdout = _OutputTail()
+    stderr = _OutputTail()
+    ok = True
+
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            # Change to sketch directory so relative paths work correctly
+            os.chdir(sketch_dir)
+
+            # Add project path to Python path for imports
+            sys.path.insert(0, project_path)
+
+            # Start every sketch from a blank drawing
+            state.reset(Path(sketch_path))
+            if drawbot is not None:
+                drawbot.newDrawing()
+
+            code = load_code(sketch_path)
+
+            # Create a clean namespace for execution
+            namespace = {"__name__": "__main__", "__file__": sketch_path}
+
+            # Execute the sketch
+            exec(code, namespace)
+
+        except SystemExit as e:
+            # Mirror interpreter exit semantics for sys.exit() in sketches
+            if e.code not in (None, 0):
+                ok = False
+                if not isinstance(e.code, int):
+                    print(e.code, file=sys.stderr)
+
+        except Exception as e:
+            ok = False
+            print(f"ERROR: {type(e).__name__}: {str(e)}", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
+
+        finally:
+            # Keep one sketch's directory, imports and path changes out of
+            # the next run
+            os.chdir(saved_cwd)
+            sys.path[:] = saved_sys_path
+            roots = (os.path.join(sketch_dir, ""), os.path.join(project_path, ""))
+            for name in set(sys.modules) - saved_modules:
+                module_file = getattr(sys.modules[name], "__file__", None)
+                if _is_under(module_file, roots):
+                    del sys.modules[name]
+
+    return {
+        "ok": ok,
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+        "outputs": state.outputs,
+    }
+
+
+def main():
+    """Serve sketch execution requests until stdin is closed."""
+    # Reserve the real stdout for frames; stray writes to fd 1 from C code go
+    # to stderr instead of corrupting the protocol
+    replies = os.fdopen(os.dup(1), "wb")
+    os.dup2(2, 1)
+
+    # Likewise reserve the real stdin for requests, so a sketch calling
+    # input() gets EOF instead of consuming request frames
+    requests = os.fdopen(os.dup(0), "rb")
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+
+    state = _PageState()
+    drawbot = _setup_drawbot_patches(state)
+
+    while True:
+        header = _read_exact(requests, FRAME_HEADER.size)
+        if header is None:
+            break
+        (size,) = FRAME_HEADER.unpack(header)
+        payload = _read_exact(requests, size)
+        if payload is None:
+            break
+
+        response = run_request(decode_frame(payload), state, drawbot)
+        replies.write(encode_reply(**response))
+        replies.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,17 @@ ThumbnailGenerator - Background task queue for progressive thumbnail generation.
 """
 
 import asyncio
+import functools
+import heapq
+import itertools
 import logging
 import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from .preview_engine import PreviewEngine
 
@@ -29,13 +32,15 @@ class ThumbnailTask:
     sketch_name: str
     sketch_path: Path
     priority: TaskPriority
-    created_at: datetime
+    # Epoch nanoseconds; cheaper to take and compare than a datetime
+    created_at_ns: int = field(default_factory=time.time_ns)
     attempts: int = 0
     max_attempts: int = 3
-    
-    def __post_init__(self):
-        if not hasattr(self, 'created_at') or self.created_at is None:
-            self.created_at = datetime.now()
+
+    @property
+    def created_at(self) -> datetime:
+        """Local time the task was created."""
+        return datetime.fromtimestamp(self.created_at_ns / 1e9)
 
 
 @dataclass
@@ -73,8 +78,11 @@ class ThumbnailGenerator:
         self.task_timeout = task_timeout
         self.retry_delay = retry_delay
         
-        # Task queue (priority queue implemented as sorted list)
-        self.task_queue: List[ThumbnailTask] = []
+        # Task queue: heap of (priority, created_at_ns, insertion order, task);
+        # the insertion counter keeps equal keys from comparing tasks
+        self.task_queue: List[Tuple[int, int, int, ThumbnailTask]] = []
+        self._queue_counter = itertools.count()
+        self._queued_names: Set[str] = set()
         self.queue_lock = threading.RLock()
         
         # Task management
@@ -85,6 +93,11 @@ class ThumbnailGenerator:
         self.workers: List[asyncio.Task] = []
         self.is_running = False
         self.stop_event = asyncio.Event()
+
+        # Set when tasks are queued (or on stop) so idle workers wake at once;
+        # tasks may be queued from other threads, hence the loop reference
+        self._task_available = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         
         # Callbacks for task completion
         self.completion_callbacks: List[Callable[[TaskResult], None]] = []
@@ -130,7 +143,7 @@ class ThumbnailGenerator:
         """
         with self.queue_lock:
             # Check if already queued
-            if any(task.sketch_name == sketch_name for task in self.task_queue):
+            if sketch_name in self._queued_names:
                 return False
             
             # Check if already being processed
@@ -151,11 +164,9 @@ class ThumbnailGenerator:
                 sketch_name=sketch_name,
                 sketch_path=sketch_path,
                 priority=priority,
-                created_at=datetime.now()
             )
             
-            self.task_queue.append(task)
-            self._sort_task_queue()
+            self._push_task(task)
             self.stats["total_tasks"] += 1
             
             self.logger.debug(f"Queued thumbnail task for {sketch_name} with priority {priority.name}")
@@ -193,9 +204,34 @@ class ThumbnailGenerator:
         self.logger.info(f"Queued {queued_count} thumbnail generation tasks")
         return queued_count
     
-    def _sort_task_queue(self):
-        """Sort task queue by priority and creation time."""
-        self.task_queue.sort(key=lambda task: (task.priority.value, task.created_at))
+    def _push_task(self, task: ThumbnailTask):
+        """Add a task to the queue, ordered by priority and creation time."""
+        with self.queue_lock:
+            heapq.heappush(
+                self.task_queue,
+                (
+                    task.priority.value,
+                    task.created_at_ns,
+                    next(self._queue_counter),
+                    task,
+                ),
+            )
+            self._queued_names.add(task.sketch_name)
+        self._wake_workers()
+
+    def _wake_workers(self):
+        """Wake idle workers, from the event loop or any other thread."""
+        loop = self._loop
+        if loop is None:
+            return  # Not started; workers check the queue when they start
+        try:
+            in_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            in_loop = False
+        if in_loop:
+            self._task_available.set()
+        elif not loop.is_closed():
+            loop.call_soon_threadsafe(self._task_available.set)
     
     def get_next_task(self) -> Optional[ThumbnailTask]:
         """Get the next task from the queue.
@@ -205,7 +241,9 @@ class ThumbnailGenerator:
         """
         with self.queue_lock:
             if self.task_queue:
-                return self.task_queue.pop(0)
+                task = heapq.heappop(self.task_queue)[-1]
+                self._queued_names.discard(task.sketch_name)
+                return task
             return None
     
     def get_queue_status(self) -> Dict[str, Any]:
@@ -215,10 +253,9 @@ class ThumbnailGenerator:
             Dictionary with queue statistics
         """
         with self.queue_lock:
-            queue_by_priority = {}
-            for priority in TaskPriority:
-                count = len([t for t in self.task_queue if t.priority == priority])
-                queue_by_priority[priority.name.lower()] = count
+            queue_by_priority = {priority.name.lower(): 0 for priority in TaskPriority}
+            for entry in self.task_queue:
+                queue_by_priority[entry[-1].priority.name.lower()] += 1
             
             return {
                 "total_queued": len(self.task_queue),
@@ -235,6 +272,7 @@ class ThumbnailGenerator:
         
         self.is_running = True
         self.stop_event.clear()
+        self._loop = asyncio.get_running_loop()
         self.stats["started_at"] = datetime.now()
         
         # Start worker tasks
@@ -251,6 +289,7 @@ class ThumbnailGenerator:
         
         self.is_running = False
         self.stop_event.set()
+        self._task_available.set()
         
         # Cancel all active tasks
         for task in self.active_tasks.values():
@@ -278,9 +317,13 @@ class ThumbnailGenerator:
                 # Get next task
                 task = self.get_next_task()
                 if not task:
-                    # No tasks available, wait a bit
-                    await asyncio.sleep(0.5)
-                    continue
+                    # No tasks available, sleep until one is queued. Clear
+                    # before re-checking so a task queued in between is seen
+                    self._task_available.clear()
+                    task = self.get_next_task()
+                    if not task:
+                        await self._task_available.wait()
+                        continue
                 
                 # Process the task
                 await self._process_task(task, worker_name)
@@ -328,10 +371,18 @@ class ThumbnailGenerator:
                 self._handle_task_completion(result)
                 return
             
-            # Execute the sketch to generate preview and thumbnail
-            preview_result = self.preview_engine.execute_sketch(
-                task.sketch_path, 
-                task.sketch_name
+            # Execute the sketch to generate preview and thumbnail. Execution
+            # blocks until the sketch finishes, so it runs in the loop's
+            # executor to keep the event loop (and other workers) going
+            loop = asyncio.get_running_loop()
+            preview_result = await loop.run_in_executor(
+                None,
+                functools.partial(
+                    self.preview_engine.execute_sketch,
+                    task.sketch_path,
+                    task.sketch_name,
+                    wait_for_thumbnail=True,
+                ),
             )
             
             execution_time = time.time() - start_time
@@ -351,9 +402,7 @@ class ThumbnailGenerator:
                 if task.attempts < task.max_attempts:
                     # Retry later
                     await asyncio.sleep(self.retry_delay)
-                    with self.queue_lock:
-                        self.task_queue.append(task)
-                        self._sort_task_queue()
+                    self._push_task(task)
                 else:
                     # Max attempts reached, mark as failed
                     result = TaskResult(
@@ -372,9 +421,7 @@ class ThumbnailGenerator:
                 # Retry later
                 self.logger.warning(f"Task {task.sketch_name} failed (attempt {task.attempts}), will retry: {e}")
                 await asyncio.sleep(self.retry_delay)
-                with self.queue_lock:
-                    self.task_queue.append(task)
-                    self._sort_task_queue()
+                self._push_task(task)
             else:
                 # Max attempts reached, mark as failed
                 self.logger.error(f"Task {task.sketch_name} failed permanently after {task.attempts} attempts: {e}")
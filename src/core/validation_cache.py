@@ -0,0 +1,225 @@
+"""
+ValidationCache - persistent sketch syntax check results keyed by content hash.
+"""
+
+import hashlib
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Union
+
+# Bump to invalidate every stored result, e.g. when the message format changes
+CACHE_VERSION = 1
+
+# Location of the cache inside a project, next to the preview cache
+VALIDATION_CACHE_DIR = Path("cache") / "validation"
+
+# Maximum number of stored results; the least recently used are pruned
+VALIDATION_CACHE_SIZE = 512
+
+# Stored in place of an error message for sources that compile
+_VALID = "ok"
+
+# Fewer uncached sources than this are compiled in-process, since handing
+# sources to worker processes costs more than compiling a handful of sketches
+PARALLEL_COMPILE_MIN = 8
+
+# Callers run inside a threaded server, so workers are not forked from it
+_POOL_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# Compile workers shared by every cache, started on first use
+_pool_lock = threading.Lock()
+_compile_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_compile_pool() -> ProcessPoolExecutor:
+    """Process pool compiling batches of uncached sources."""
+    global _compile_pool
+    with _pool_lock:
+        if _compile_pool is None:
+            _compile_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count(), mp_context=_POOL_CONTEXT
+            )
+        return _compile_pool
+
+
+def _discard_compile_pool(pool: ProcessPoolExecutor):
+    """Drop a crashed pool so the next batch starts a fresh one."""
+    global _compile_pool
+    with _pool_lock:
+        if _compile_pool is pool:
+            _compile_pool = None
+    pool.shutdown(wait=False)
+
+
+def _compile_source(source: bytes, filename: str) -> Optional[str]:
+    """Compile sketch source and describe its syntax error, if any.
+
+    Runs in pool workers, so it must stay a module-level function.
+
+    Raises:
+        UnicodeDecodeError: If the source is not valid UTF-8
+        ValueError: If the source cannot be compiled at all
+    """
+    content = source.decode("utf-8")
+    try:
+        compile(content, filename, "exec", dont_inherit=True)
+        return None
+    except SyntaxError as e:
+        return f"SyntaxError: {e.msg} at line {e.lineno}"
+
+
+class ValidationCache:
+    """Caches whether sketch sources compile, across processes and restarts.
+
+    Entries are keyed by the SHA-256 of the source bytes, so unchanged sketches
+    are never re-parsed, whichever path they are read from. Results are kept
+    per Python version, since the accepted syntax differs between versions.
+    Each edit stores a new entry, so the cache is capped at ``max_entries``
+    and the least recently used results are pruned when a new one is stored.
+    """
+
+    def __init__(self, cache_dir: Path, max_entries: int = VALIDATION_CACHE_SIZE):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding stored results, usually
+                ``project_path / VALIDATION_CACHE_DIR``
+            max_entries: Maximum number of stored results
+        """
+        py_version = f"py{sys.version_info[0]}{sys.version_info[1]}"
+        self.cache_dir = Path(cache_dir) / f"v{CACHE_VERSION}-{py_version}"
+        self.max_entries = max_entries
+
+    def check(self, source: bytes, filename: str) -> Optional[str]:
+        """Syntax-check sketch source, reusing a stored result when possible.
+
+        Args:
+            source: Raw bytes of the sketch file
+            filename: Name reported by the compiler
+
+        Returns:
+            None if the source compiles, otherwise the syntax error message
+
+        Raises:
+            UnicodeDecodeError: If the source is not valid UTF-8
+            ValueError: If the source cannot be compiled at all
+        """
+        entry = self.cache_dir / hashlib.sha256(source).hexdigest()
+        stored = self._lookup(entry)
+        if stored is not None:
+            return None if stored == _VALID else stored
+
+        error = _compile_source(source, filename)
+        self._store(entry, _VALID if error is None else error)
+        return error
+
+    def check_many(
+        self, sources: Sequence[Tuple[bytes, str]]
+    ) -> List[Union[None, str, Exception]]:
+        """Syntax-check several sources, compiling uncached ones in parallel.
+
+        Args:
+            sources: (source bytes, filename) pairs
+
+        Returns:
+            One result per source, as returned by check(), or the exception
+            check() would have raised for sources that cannot be compiled
+        """
+        results: List[Union[None, str, Exception]] = [None] * len(sources)
+        pending = []
+        for index, (source, filename) in enumerate(sources):
+            entry = self.cache_dir / hashlib.sha256(source).hexdigest()
+            stored = self._lookup(entry)
+            if stored is None:
+                pending.append((index, entry, source, filename))
+            elif stored != _VALID:
+                results[index] = stored
+
+        if len(pending) >= PARALLEL_COMPILE_MIN:
+            pool = None
+            try:
+                pool = _get_compile_pool()
+                futures = [
+                    pool.submit(_compile_source, source, filename)
+                    for _, _, source, filename in pending
+                ]
+                for (index, entry, _, _), future in zip(pending, futures):
+                    try:
+                        error = future.result()
+                    except (UnicodeDecodeError, ValueError) as e:
+                        results[index] = e
+                        continue
+                    self._store(entry, _VALID if error is None else error)
+                    results[index] = error
+                return results
+            except (BrokenProcessPool, OSError):
+                # No worker processes available - compile in-process
+                if pool is not None:
+                    _discard_compile_pool(pool)
+
+        for index, entry, source, filename in pending:
+            try:
+                error = _compile_source(source, filename)
+            except (UnicodeDecodeError, ValueError) as e:
+                results[index] = e
+                continue
+            self._store(entry, _VALID if error is None else error)
+            results[index] = error
+        return results
+
+    @staticmethod
+    def _lookup(entry: Path) -> Optional[str]:
+        """Stored result for an entry, or None if it was never stored."""
+        try:
+            result = entry.read_text(encoding="utf-8")
+        except OSError:
+            return None
+        # Mark the entry as recently used for pruning
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return result
+
+    def _store(self, entry: Path, result: str):
+        """Write a result atomically; the cache is best-effort."""
+        temp_path = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            temp_path.write_text(result, encoding="utf-8")
+            os.replace(temp_path, entry)
+        except OSError:
+            try:
+                temp_path.unlink()
+            except OSError:
+                pass
+            return
+        self._prune()
+
+    def _prune(self):
+        """Drop the least recently used results once over the size cap.
+
+        Prunes down to three quarters of the cap, so the directory is only
+        rescanned for deletion after a batch of new results.
+        """
+        try:
+            with os.scandir(self.cache_dir) as it:
+                entries = [e for e in it if not e.name.endswith(".tmp")]
+            if len(entries) <= self.max_entries:
+                return
+            entries.sort(key=lambda e: e.stat().st_mtime_ns)
+        except OSError:
+            return
+
+        for entry in entries[: len(entries) - self.max_entries * 3 // 4]:
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass  # Already removed by another process
@@ -21,6 +21,7 @@ class FileWatchIntegration:
         cache_dir: Path,
         preview_manager,
         debounce_delay: float = 0.3,
+        preview_engine: Optional[PreviewEngine] = None,
     ):
         """Initialize file watch integration.
 
@@ -29,6 +30,8 @@ class FileWatchIntegration:
             cache_dir: Path to preview cache directory
             preview_manager: LivePreviewManager instance for broadcasting
             debounce_delay: Delay for file change debouncing
+            preview_engine: Existing engine (and its cache and sketch
+                workers) to share instead of creating new ones
         """
         self.project_path = Path(project_path)
         self.cache_dir = Path(cache_dir)
@@ -37,8 +40,12 @@ class FileWatchIntegration:
 
         # Initialize components
         self.file_watcher = FileWatcher(debounce_delay=debounce_delay)
-        self.cache = PreviewCache(cache_dir)
-        self.preview_engine = PreviewEngine(project_path, self.cache)
+        if preview_engine is not None:
+            self.cache = preview_engine.cache
+            self.preview_engine = preview_engine
+        else:
+            self.cache = PreviewCache(cache_dir)
+            self.preview_engine = PreviewEngine(project_path, self.cache)
 
         # Track watched sketches
         self.watched_sketches: Set[str] = set()
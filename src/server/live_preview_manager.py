@@ -30,12 +30,19 @@ class ConnectionInfo:
 class LivePreviewManager:
     """Manages WebSocket connections and real-time preview updates."""
 
-    def __init__(self, project_path: Path, cache_dir: Path):
+    def __init__(
+        self,
+        project_path: Path,
+        cache_dir: Path,
+        cache: Optional[PreviewCache] = None,
+    ):
         """Initialize live preview manager.
 
         Args:
             project_path: Path to project directory
             cache_dir: Path to preview cache directory
+            cache: Existing cache for cache_dir to share instead of opening
+                a second one
         """
         self.project_path = Path(project_path)
         self.cache_dir = Path(cache_dir)
@@ -52,7 +59,7 @@ class LivePreviewManager:
         self.logger = logging.getLogger(__name__)
 
         # Initialize cache for preview metadata
-        self.cache = PreviewCache(cache_dir)
+        self.cache = cache if cache is not None else PreviewCache(cache_dir)
 
     async def connect_client(self, sketch_name: str, websocket: WebSocket):
         """Connect a client to a sketch room.
@@ -33,6 +33,9 @@ from .file_watch_integration import FileWatchIntegration
 from .live_preview_manager import LivePreviewManager
 from .security_middleware import SecurityConfig, SecurityMiddleware
 
+# Older platform MIME tables lack WebP, which thumbnails are encoded as
+mimetypes.add_type("image/webp", ".webp")
+
 
 class LivePreviewServer:
     """FastAPI-based live preview server."""
@@ -68,9 +71,16 @@ class LivePreviewServer:
         self.thumbnail_generator.add_completion_callback(self._on_thumbnail_completed)
 
         # Initialize live preview components
-        self.preview_manager = LivePreviewManager(project_path, cache_dir)
+        # One cache and engine serve every component, so they share the
+        # cache's in-memory index and the engine's sketch worker processes
+        self.preview_manager = LivePreviewManager(
+            project_path, cache_dir, cache=self.cache
+        )
         self.file_watch_integration = FileWatchIntegration(
-            project_path, cache_dir, self.preview_manager
+            project_path,
+            cache_dir,
+            self.preview_manager,
+            preview_engine=self.preview_engine,
         )
 
         # Server state
@@ -465,6 +475,8 @@ def create_app(server: LivePreviewServer) -> FastAPI:
     async def shutdown_event():
         """Clean up background services on server shutdown."""
         await server.thumbnail_generator.stop()
+        server.preview_engine.close()
+        server.cache.close()
 
     @app.get("/health")
     async def health_check():
@@ -720,9 +732,18 @@ def create_app(server: LivePreviewServer) -> FastAPI:
             raise HTTPException(status_code=400, detail="Invalid filename")
 
         image_path = server.cache_dir / filename
-
-        if not image_path.exists() or not image_path.is_file():
-            raise HTTPException(status_code=404, detail="Thumbnail not found")
+        # Thumbnails are rendered in the background after a preview is stored;
+        # until then, serve the full preview without letting clients cache it
+        cache_control = "public, max-age=3600"  # Cache thumbnails for 1 hour
+
+        if not image_path.is_file():
+            stem, _ = os.path.splitext(filename)
+            if not stem.endswith("_thumb"):
+                raise HTTPException(status_code=404, detail="Thumbnail not found")
+            image_path = server.cache_dir / f"{stem[: -len('_thumb')]}.png"
+            if not image_path.is_file():
+                raise HTTPException(status_code=404, detail="Thumbnail not found")
+            cache_control = "no-cache"
 
         # Generate ETag based on file content
         file_stat = image_path.stat()
@@ -743,7 +764,7 @@ def create_app(server: LivePreviewServer) -> FastAPI:
             media_type=content_type,
             headers={
                 "ETag": etag,
-                "Cache-Control": "public, max-age=3600",  # Cache thumbnails for 1 hour
+                "Cache-Control": cache_control,
                 "Last-Modified": datetime.fromtimestamp(file_stat.st_mtime).strftime(
                     "%a, %d %b %Y %H:%M:%S GMT"
                 ),
@@ -176,7 +176,7 @@ function updateThumbnailInCard(card, payload) {
             <a href="/sketch/${payload.sketch_name}" class="block relative overflow-hidden group thumbnail-fade-in">
                 <img src="${payload.thumbnail_url}" 
                      alt="${payload.sketch_name} preview"
-                     class="preview-card-image object-cover transition-transform duration-300 group-hover:scale-105 cursor-pointer"
+                     class="preview-card-image object-contain transition-transform duration-300 group-hover:scale-105 cursor-pointer"
                      onerror="this.parentElement.innerHTML='<div class=\\'thumbnail-placeholder thumbnail-error\\'><div class=\\'text-4xl mb-2\\'>⚠</div><div class=\\'text-sm text-gray-600\\'>Preview Error</div></div>'">
                 <div class="absolute inset-0 bg-black bg-opacity-0 group-hover:bg-opacity-20 transition-all duration-300 flex items-center justify-center">
                     <div class="opacity-0 group-hover:opacity-100 transition-opacity duration-300 bg-white bg-opacity-90 px-3 py-2 rounded-lg text-sm font-medium text-gray-800">
@@ -0,0 +1,68 @@
+"""
+Shared fixtures for the test suite.
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+from src.core import preview_cache
+
+# Minimal stand-in for DrawBot: tracks pages and writes placeholder files
+_STUB_DRAWBOT = """
+_pages = 0
+
+
+def newDrawing():
+    global _pages
+    _pages = 0
+
+
+def newPage(*args, **kwargs):
+    global _pages
+    _pages += 1
+
+
+def pageCount():
+    return _pages
+
+
+def saveImage(path, *args, **kwargs):
+    with open(path, "wb") as f:
+        f.write(f"page {_pages}".encode())
+"""
+
+
+@pytest.fixture(autouse=True)
+def close_preview_caches():
+    """Close the preview caches a test left open, stopping their threads."""
+    yield
+    for cache in list(preview_cache._live_caches):
+        cache.close()
+
+
+@pytest.fixture
+def stub_drawbot(tmp_path, monkeypatch):
+    """Make a stub drawBot module importable here and in worker processes.
+
+    Returns:
+        The stub module imported into this process
+    """
+    stub_dir = tmp_path / "stub_drawbot"
+    stub_dir.mkdir()
+    stub_path = stub_dir / "drawBot.py"
+    stub_path.write_text(_STUB_DRAWBOT)
+
+    pythonpath = os.environ.get("PYTHONPATH")
+    monkeypatch.setenv(
+        "PYTHONPATH",
+        str(stub_dir) if not pythonpath else f"{stub_dir}{os.pathsep}{pythonpath}",
+    )
+
+    spec = importlib.util.spec_from_file_location("drawBot", stub_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.setitem(sys.modules, "drawBot", module)
+    return module
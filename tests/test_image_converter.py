@@ -273,3 +273,57 @@ trailer<</Size 5/Root 1 0 R>>startxref 294 %%EOF"""
             # Should only have the output PNG file
             assert len(new_files) == 1
             assert list(new_files)[0] == result.png_path
+
+    def test_output_directory_created_once(self):
+        """Test output directory is only created on first use."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            converter = ImageConverter()
+            output_dir = Path(temp_dir) / "output"
+
+            pdf_data = b"""%PDF-1.4
+1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj
+2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj
+3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 400 400]/Contents 4 0 R>>endobj
+4 0 obj<</Length 44>>stream
+BT /F1 12 Tf 50 350 Td (Mkdir Test) Tj ET
+endstream endobj
+xref 0 5 0000000000 65535 f 0000000009 00000 n 0000000058 00000 n 0000000115 00000 n 0000000200 00000 n
+trailer<</Size 5/Root 1 0 R>>startxref 294 %%EOF"""
+
+            assert converter.convert_pdf_to_png(pdf_data, output_dir).success
+
+            with patch.object(Path, "mkdir") as mock_mkdir:
+                result = converter.convert_pdf_to_png(pdf_data, output_dir)
+
+            assert result.success
+            mock_mkdir.assert_not_called()
+
+    def test_convert_pdf_file_to_png(self):
+        """Test conversion from a PDF file on disk."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            converter = ImageConverter()
+
+            pdf_path = Path(temp_dir) / "sketch.pdf"
+            pdf_path.write_bytes(
+                b"""%PDF-1.4
+1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj
+2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj
+3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 400 400]/Contents 4 0 R>>endobj
+4 0 obj<</Length 44>>stream
+BT /F1 12 Tf 50 350 Td (File Test) Tj ET
+endstream endobj
+xref 0 5 0000000000 65535 f 0000000009 00000 n 0000000058 00000 n 0000000115 00000 n 0000000200 00000 n
+trailer<</Size 5/Root 1 0 R>>startxref 294 %%EOF"""
+            )
+
+            result = converter.convert_pdf_file_to_png(pdf_path, Path(temp_dir) / "out")
+
+            assert result.success
+            assert result.png_path.exists()
+
+            # Missing files should fail gracefully
+            result = converter.convert_pdf_file_to_png(
+                Path(temp_dir) / "missing.pdf", Path(temp_dir)
+            )
+            assert not result.success
+            assert "not found" in result.error.lower()
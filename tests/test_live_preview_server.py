@@ -34,6 +34,16 @@ class TestLivePreviewServer:
             assert "memory_usage_mb" in data
             assert "active_sketches" in data
 
+    def test_components_share_cache_and_engine(self):
+        """Test the server opens one cache and one preview engine."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir)
+            server = LivePreviewServer(project_path, project_path / "cache")
+
+            assert server.preview_manager.cache is server.cache
+            assert server.file_watch_integration.cache is server.cache
+            assert server.file_watch_integration.preview_engine is server.preview_engine
+
     def test_serve_preview_image(self):
         """Test GET /preview/{sketch_name}.png serves cached images."""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -57,6 +67,55 @@ class TestLivePreviewServer:
             assert response.headers["content-type"] == "image/png"
             assert response.content == image_data
 
+    def test_serve_thumbnail_image(self):
+        """Test GET /thumbnail/{filename} serves WebP thumbnails."""
+        import io
+
+        from PIL import Image
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir)
+            cache_dir = project_path / "cache"
+
+            buffer = io.BytesIO()
+            Image.new("RGB", (600, 400), (0, 128, 255)).save(buffer, "PNG")
+
+            cache = PreviewCache(cache_dir)
+            cache.store_preview("thumb_sketch", buffer.getvalue())
+            thumbnail_url = cache.generate_thumbnail_for_entry("thumb_sketch")
+            assert thumbnail_url.endswith(".webp")
+
+            server = LivePreviewServer(project_path, cache_dir)
+            app = create_app(server)
+            client = TestClient(app)
+
+            response = client.get(thumbnail_url)
+
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "image/webp"
+            assert response.content[8:12] == b"WEBP"
+
+    def test_queued_thumbnail_falls_back_to_preview(self):
+        """Test a thumbnail URL serves the preview until the thumbnail exists."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir)
+            cache_dir = project_path / "cache"
+
+            cache = PreviewCache(cache_dir)
+            result = cache.store_preview("queued_sketch", b"preview-bytes")
+            thumbnail_url = cache.get_thumbnail_url("queued_sketch", result.version)
+
+            server = LivePreviewServer(project_path, cache_dir)
+            app = create_app(server)
+            client = TestClient(app)
+
+            response = client.get(thumbnail_url)
+            assert response.status_code == 200
+            assert response.content == b"preview-bytes"
+            assert response.headers["cache-control"] == "no-cache"
+
+            assert client.get("/thumbnail/missing_thumb.webp").status_code == 404
+
     def test_sketch_status_endpoint(self):
         """Test GET /status/{sketch_name} returns execution status."""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -1,6 +1,7 @@
 """
 Tests for PreviewCache - Preview image storage and cleanup system.
 """
+import os
 import tempfile
 import threading
 import time
@@ -42,6 +43,64 @@ class TestPreviewCache:
             stored_data = entry.file_path.read_bytes()
             assert stored_data == image_data
 
+    def test_store_preview_from_path(self):
+        """Test previews can be stored by copying a file into the cache."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = PreviewCache(Path(temp_dir) / "cache")
+
+            source = Path(temp_dir) / "output.png"
+            source.write_bytes(b"file_backed_image_data")
+
+            result = cache.store_preview_from_path("file_sketch", source)
+
+            assert result.success
+            assert result.preview_path.read_bytes() == b"file_backed_image_data"
+            assert source.exists()
+
+            entry = cache.get_current_preview("file_sketch")
+            assert entry.file_size_bytes == len(b"file_backed_image_data")
+
+            empty = Path(temp_dir) / "empty.png"
+            empty.write_bytes(b"")
+            assert not cache.store_preview_from_path("file_sketch", empty).success
+            assert not cache.store_preview_from_path(
+                "file_sketch", Path(temp_dir) / "missing.png"
+            ).success
+
+    def test_failed_store_leaves_no_temp_file(self):
+        """Test a failed copy removes its partial temporary file."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = PreviewCache(Path(temp_dir) / "cache")
+            source = Path(temp_dir) / "output.png"
+            source.write_bytes(b"file_backed_image_data")
+
+            def failing_copy(src, dst):
+                Path(dst).write_bytes(b"partial")
+                raise OSError("disk full")
+
+            with patch("src.core.preview_cache.shutil.copyfile", failing_copy):
+                result = cache.store_preview_from_path("file_sketch", source)
+
+            assert not result.success
+            assert not list(cache.cache_dir.glob("*.tmp"))
+
+    def test_stale_temp_files_removed_on_startup(self):
+        """Test temporary files left by crashed writes are cleaned up."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_dir = Path(temp_dir) / "cache"
+            cache_dir.mkdir()
+            stale = [cache_dir / "a_v1_0.png.tmp", cache_dir / "b_v1_0.opt.tmp"]
+            for path in stale:
+                path.write_bytes(b"partial")
+                os.utime(path, (time.time() - 3600,) * 2)
+            fresh = cache_dir / "c_v1_0.png.tmp"
+            fresh.write_bytes(b"in progress")
+
+            PreviewCache(cache_dir)
+
+            assert not any(path.exists() for path in stale)
+            assert fresh.exists()
+
     def test_version_management(self):
         """Test versioned preview storage."""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -129,6 +188,23 @@ class TestPreviewCache:
             # Not all sketches should have entries (due to size limit)
             assert len(all_entries) < len(sketch_names)
 
+    def test_size_limit_evicts_oldest_first(self):
+        """Test size-based eviction removes the oldest entries and their files."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = PreviewCache(temp_dir, max_total_size_mb=4000 / (1024 * 1024))
+
+            for i in range(5):
+                cache.store_preview(f"sketch_{i}", b"x" * 1000)
+
+            remaining = [
+                name
+                for name in (f"sketch_{i}" for i in range(5))
+                if cache.get_current_preview(name)
+            ]
+            assert remaining == ["sketch_2", "sketch_3", "sketch_4"]
+            assert len(list(Path(temp_dir).glob("*.png"))) == 3
+            assert cache._total_bytes == 3000
+
     def test_concurrent_access_safety(self):
         """Test thread-safe cache operations."""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -262,3 +338,330 @@ class TestPreviewCache:
             assert (
                 f"v={result.version}" in result.preview_url
             )  # Version in query string
+
+    def test_thumbnail_generation(self):
+        """Test thumbnails are scaled down to the configured size."""
+        from PIL import Image
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = PreviewCache(temp_dir, thumbnail_size=(300, 200))
+
+            source = Path(temp_dir) / "source.png"
+            Image.new("RGB", (1200, 800), (255, 0, 0)).save(source)
+
+            result = cache.store_preview("thumb_sketch", source.read_bytes())
+            assert result.success
+
+            thumbnail_url = cache.generate_thumbnail_for_entry("thumb_sketch")
+            assert thumbnail_url is not None
+
+            entry = cache.get_current_preview("thumb_sketch")
+            with Image.open(entry.thumbnail_path) as thumb:
+                assert thumb.size == (300, 200)
+
+    def test_small_thumbnail_reuses_original(self):
+        """Test images smaller than the thumbnail size are not resampled."""
+        from PIL import Image
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = PreviewCache(temp_dir, thumbnail_size=(300, 200))
+
+            source = Path(temp_dir) / "small.png"
+            Image.new("RGB", (100, 50), (0, 0, 255)).save(source)
+
+            cache.store_preview("small_sketch", source.read_bytes())
+            assert cache.generate_thumbnail_for_entry("small_sketch") is not None
+
+            entry = cache.get_current_preview("small_sketch")
+            with Image.open(entry.thumbnail_path) as thumb:
+                assert thumb.size == (100, 50)
+
+    def test_thumbnails_keep_aspect_ratio(self):
+        """Test thumbnails are only letterboxed when requested."""
+        from PIL import Image
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = Path(temp_dir) / "wide.png"
+            Image.new("RGB", (1200, 300), (255, 0, 0)).save(source)
+
+            cache = PreviewCache(Path(temp_dir) / "plain", thumbnail_size=(300, 200))
+            cache.store_preview("wide_sketch", source.read_bytes())
+            assert cache.generate_thumbnail_for_entry("wide_sketch") is not None
+            with Image.open(
+                cache.get_current_preview("wide_sketch").thumbnail_path
+            ) as thumb:
+                assert thumb.size == (300, 75)
+
+            boxed = PreviewCache(
+                Path(temp_dir) / "boxed",
+                thumbnail_size=(300, 200),
+                letterbox_thumbnails=True,
+            )
+            boxed.store_preview("wide_sketch", source.read_bytes())
+            assert boxed.generate_thumbnail_for_entry("wide_sketch") is not None
+            with Image.open(
+                boxed.get_current_preview("wide_sketch").thumbnail_path
+            ) as thumb:
+                assert thumb.size == (300, 200)
+
+    def test_queued_thumbnails_generated_in_batch(self):
+        """Test queued thumbnail requests are rendered in the background."""
+        from PIL import Image
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = PreviewCache(temp_dir, thumbnail_size=(300, 200))
+
+            source = Path(temp_dir) / "batch.png"
+            Image.new("RGB", (600, 400), (0, 255, 0)).save(source)
+
+            versions = []
+            for i in range(3):
+                result = cache.store_preview(f"batch_sketch_{i}", source.read_bytes())
+                cache.queue_thumbnail(f"batch_sketch_{i}", result.version)
+                versions.append(result.version)
+
+            deadline = time.time() + 10
+            while time.time() < deadline:
+                entries = [
+                    cache.get_preview_version(f"batch_sketch_{i}", v)
+                    for i, v in enumerate(versions)
+                ]
+                if all(e.thumbnail_path for e in entries):
+                    break
+                time.sleep(0.05)
+
+            for entry in entries:
+                assert entry.thumbnail_path is not None
+                assert entry.thumbnail_path.exists()
+
+            cache.close()
+
+    def test_caches_share_thumbnail_pool(self):
+        """Test caches reuse one thumbnail pool that outlives any single cache."""
+        from PIL import Image
+
+        from src.core import preview_cache
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first = PreviewCache(Path(temp_dir) / "first")
+            second = PreviewCache(Path(temp_dir) / "second")
+
+            source = Path(temp_dir) / "shared.png"
+            Image.new("RGB", (600, 400), (0, 255, 0)).save(source)
+            for cache in (first, second):
+                cache.store_preview("shared_sketch", source.read_bytes())
+
+            assert first.generate_thumbnail_for_entry("shared_sketch")
+            pool = preview_cache._get_thumb_pool()
+            first.close()
+
+            assert first not in preview_cache._live_caches
+            assert second.generate_thumbnail_for_entry("shared_sketch")
+            assert preview_cache._get_thumb_pool() is pool
+
+    def test_queued_and_inline_thumbnail_share_one_file(self):
+        """Test racing thumbnail requests publish a single file at the predicted URL."""
+        from PIL import Image
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = PreviewCache(temp_dir, thumbnail_size=(300, 200))
+
+            source = Path(temp_dir) / "race.png"
+            Image.new("RGB", (600, 400), (0, 0, 255)).save(source)
+
+            result = cache.store_preview("race_sketch", source.read_bytes())
+            predicted_url = cache.get_thumbnail_url("race_sketch", result.version)
+
+            cache.queue_thumbnail("race_sketch", result.version)
+            thumbnail_url = cache.generate_thumbnail_for_entry(
+                "race_sketch", result.version
+            )
+            cache.close()
+
+            assert thumbnail_url == predicted_url
+            thumbnails = [
+                p for p in Path(cache.cache_dir).iterdir() if "_thumb" in p.name
+            ]
+            assert [p.name for p in thumbnails] == [thumbnail_url.rsplit("/", 1)[-1]]
+
+    def test_readers_do_not_block_each_other(self):
+        """Test lookups can run while another reader holds the lock."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = PreviewCache(temp_dir)
+            cache.store_preview("shared_sketch", b"shared_data")
+
+            lookups = []
+            with cache._rw.read_lock():
+                thread = threading.Thread(
+                    target=lambda: lookups.append(
+                        cache.get_current_preview("shared_sketch")
+                    )
+                )
+                thread.start()
+                thread.join(timeout=2)
+
+            assert not thread.is_alive()
+            assert lookups and lookups[0] is not None
+
+    def test_png_previews_are_recompressed(self):
+        """Test stored PNGs are optimized in the background."""
+        import io
+
+        from PIL import Image
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = PreviewCache(temp_dir)
+
+            buffer = io.BytesIO()
+            Image.new("RGB", (400, 400), (255, 255, 255)).save(
+                buffer, "PNG", compress_level=0
+            )
+            image_data = buffer.getvalue()
+
+            result = cache.store_preview("optimized_sketch", image_data)
+            assert result.success
+
+            # Wait for the background optimizer to finish
+            cache.close()
+
+            entry = cache.get_current_preview("optimized_sketch")
+            assert entry.file_size_bytes < len(image_data)
+            assert entry.file_size_bytes == entry.file_path.stat().st_size
+            with Image.open(entry.file_path) as img:
+                assert img.size == (400, 400)
+
+    def test_png_recompression_keeps_pixels_and_metadata(self):
+        """Test the Pillow optimizer keeps pixels, pHYs, ICC and text chunks."""
+        import io
+
+        from PIL import Image
+        from PIL.PngImagePlugin import PngInfo
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = PreviewCache(temp_dir)
+
+            original = Image.new("RGBA", (64, 64), (255, 255, 255, 255))
+            for x in range(64):
+                original.putpixel((x, x), (x * 4, 0, 255 - x * 4, 128))
+            text = PngInfo()
+            text.add_text("Software", "DrawBot")
+            buffer = io.BytesIO()
+            original.save(
+                buffer,
+                "PNG",
+                compress_level=0,
+                dpi=(216, 216),
+                icc_profile=b"fake icc profile",
+                pnginfo=text,
+            )
+            image_data = buffer.getvalue()
+
+            # Use the Pillow fallback even where oxipng is installed
+            with patch("src.core.preview_cache.shutil.which", return_value=None):
+                result = cache.store_preview("metadata_sketch", image_data)
+                assert result.success
+                cache.close()
+
+            entry = cache.get_current_preview("metadata_sketch")
+            assert entry.file_size_bytes < len(image_data)
+            with Image.open(entry.file_path) as img:
+                assert [round(d) for d in img.info["dpi"]] == [216, 216]
+                assert img.info["icc_profile"] == b"fake icc profile"
+                assert img.text["Software"] == "DrawBot"
+                assert img.convert("RGBA").tobytes() == original.tobytes()
+
+    def test_metadata_logged_without_flush(self):
+        """Test changes are persisted to the write-ahead log as they happen."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = PreviewCache(temp_dir)
+            for i in range(10):
+                cache.store_preview("logged_sketch", f"data_{i}".encode())
+
+            assert "logged_sketch" in cache.wal_file.read_text()
+
+            reopened = PreviewCache(temp_dir)
+            assert reopened.get_available_versions(
+                "logged_sketch"
+            ) == cache.get_available_versions("logged_sketch")
+
+    def test_metadata_log_compaction(self):
+        """Test a large log is compacted into the metadata snapshot."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch("src.core.preview_cache.WAL_COMPACT_BYTES", 500):
+                cache = PreviewCache(temp_dir)
+                for i in range(10):
+                    cache.store_preview(f"compact_sketch_{i}", b"data")
+
+                deadline = time.time() + 5
+                while time.time() < deadline and cache._dirty.is_set():
+                    time.sleep(0.05)
+
+            assert cache.metadata_file.exists()
+            assert cache.wal_file.stat().st_size < 500
+
+            reopened = PreviewCache(temp_dir)
+            for i in range(10):
+                assert reopened.get_current_preview(f"compact_sketch_{i}") is not None
+
+    def test_second_instance_keeps_first_instance_log(self):
+        """Test another instance on the directory never compacts the log."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first = PreviewCache(temp_dir)
+            first.store_preview("first_sketch", b"first")
+
+            second = PreviewCache(temp_dir)
+            assert second.get_current_preview("first_sketch") is not None
+
+            later = first.store_preview("later_sketch", b"later")
+            second.store_preview("second_sketch", b"second")
+            second._save_metadata()
+
+            assert "later_sketch" in first.wal_file.read_text()
+            first.close()
+            second.close()
+
+            reopened = PreviewCache(temp_dir)
+            assert reopened.get_current_preview("first_sketch") is not None
+            entry = reopened.get_current_preview("later_sketch")
+            assert entry is not None
+            assert entry.file_path == later.preview_path
+            assert later.preview_path.exists()
+
+    def test_cache_entry_timestamps(self):
+        """Test entries store epoch milliseconds and read legacy ISO dates."""
+        from datetime import datetime
+
+        entry = CacheEntry(
+            sketch_name="timed",
+            version=1700000000000,
+            file_path=Path("timed_v1700000000000.png"),
+            created_at_ms=1700000000000,
+            file_size_bytes=10,
+        )
+        assert entry.created_at == datetime.fromtimestamp(1700000000)
+
+        data = entry.to_dict()
+        assert data["created_at_ms"] == 1700000000000
+        assert CacheEntry.from_dict(data) == entry
+
+        legacy = dict(data)
+        del legacy["created_at_ms"]
+        legacy["created_at"] = datetime.fromtimestamp(1700000000).isoformat()
+        assert CacheEntry.from_dict(legacy).created_at_ms == 1700000000000
+
+    def test_total_cache_size_tracks_stores_and_evictions(self):
+        """Test the running size total matches the files kept on disk."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = PreviewCache(temp_dir, max_versions_per_sketch=2)
+
+            for i in range(4):
+                cache.store_preview("sized_sketch", b"x" * (1000 * (i + 1)))
+
+            on_disk = sum(
+                entry.file_path.stat().st_size
+                for entry in cache.entries["sized_sketch"]
+            )
+            assert cache.get_total_cache_size() == on_disk / (1024 * 1024)
+
+            cache.clear_cache()
+            assert cache.get_total_cache_size() == 0
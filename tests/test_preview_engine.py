@@ -1,8 +1,10 @@
 """
 Tests for PreviewEngine - Core preview execution system.
 """
+import os
 import tempfile
 import time
+from datetime import datetime
 from pathlib import Path
 from unittest.mock import Mock, patch
 
@@ -176,6 +178,159 @@ drawbot.saveImage('output.png')
                 len(temp_files_after) <= len(temp_files_before) + 3
             )  # Allow for preview + metadata
 
+    def test_startup_objects_frozen_only_on_request(self):
+        """Test building an engine leaves GC alone until startup is frozen."""
+        import gc
+
+        from src.core.preview_engine import freeze_startup_objects
+
+        gc.unfreeze()
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                cache = PreviewCache(temp_dir)
+                engine = PreviewEngine(Path(temp_dir), cache)
+                assert gc.get_freeze_count() == 0
+
+                freeze_startup_objects()
+                assert gc.get_freeze_count() > 0
+                assert engine.cache is cache
+                engine.close()
+                cache.close()
+        finally:
+            gc.unfreeze()
+
+    def test_gc_threshold_configurable(self):
+        """Test the engine only changes GC thresholds when asked to."""
+        import gc
+
+        original = gc.get_threshold()
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                cache = PreviewCache(temp_dir)
+                PreviewEngine(Path(temp_dir), cache).close()
+                assert gc.get_threshold() == original
+
+                engine = PreviewEngine(
+                    Path(temp_dir), cache, gc_threshold=(12345, 15, 15)
+                )
+                engine.close()
+                assert gc.get_threshold() == (12345, 15, 15)
+                cache.close()
+        finally:
+            gc.set_threshold(*original)
+
+    def test_multi_page_files_memoized_until_directory_changes(self):
+        """Test page listings are reused until a page file is added."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir)
+            sketch_folder = project_path / "sketches" / "pages"
+            sketch_folder.mkdir(parents=True)
+            for page in (2, 1, 10):
+                (sketch_folder / f"pages_page_{page}.png").write_bytes(b"page")
+            # Names that only resemble page files are ignored
+            (sketch_folder / "pages_page_01_v2.png").write_bytes(b"page")
+
+            cache = PreviewCache(project_path / "cache")
+            engine = PreviewEngine(project_path, cache)
+
+            with patch.object(
+                engine, "_find_multi_page_files", wraps=engine._find_multi_page_files
+            ) as scan:
+                first = engine.get_multi_page_files("pages")
+                second = engine.get_multi_page_files("pages")
+                assert scan.call_count == 1
+
+                (sketch_folder / "pages_page_3.png").write_bytes(b"page")
+                os.utime(sketch_folder, ns=(0, time.time_ns() + 1_000_000))
+                third = engine.get_multi_page_files("pages")
+                assert scan.call_count == 2
+
+            assert [f.name for f in first] == [
+                "pages_page_1.png",
+                "pages_page_2.png",
+                "pages_page_10.png",
+            ]
+            assert first == second
+            assert len(third) == 4
+
+    def test_sketch_listing_reused_until_cache_changes(self):
+        """Test the sketch listing is rebuilt only after cache changes."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = PreviewCache(temp_dir)
+            engine = PreviewEngine(Path(temp_dir), cache)
+
+            cache.store_preview("listed_sketch", b"listed_data")
+            first = engine.get_available_sketches_with_thumbnails()
+            second = engine.get_available_sketches_with_thumbnails()
+
+            assert [s["name"] for s in first] == ["listed_sketch"]
+            assert first[0] is second[0]
+            assert not first[0]["has_thumbnail"]
+
+            cache.store_preview("other_sketch", b"other_data")
+            third = engine.get_available_sketches_with_thumbnails()
+            assert {s["name"] for s in third} == {"listed_sketch", "other_sketch"}
+
+    def test_sketch_listing_drops_deleted_thumbnails(self):
+        """Test a thumbnail removed from disk is no longer listed."""
+        from PIL import Image
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = PreviewCache(temp_dir)
+            engine = PreviewEngine(Path(temp_dir), cache)
+
+            source = Path(temp_dir) / "listed.png"
+            Image.new("RGB", (600, 400), (255, 0, 0)).save(source)
+            cache.store_preview("listed_sketch", source.read_bytes())
+            cache.generate_thumbnail_for_entry("listed_sketch")
+
+            listed = engine.get_available_sketches_with_thumbnails()
+            assert listed[0]["has_thumbnail"]
+            assert "thumbnail_url" in listed[0]
+
+            thumbnail_path = cache.get_current_preview("listed_sketch").thumbnail_path
+            thumbnail_path.unlink()
+            os.utime(cache.cache_dir, ns=(0, time.time_ns() + 1_000_000))
+
+            relisted = engine.get_available_sketches_with_thumbnails()
+            assert not relisted[0]["has_thumbnail"]
+            assert "thumbnail_url" not in relisted[0]
+
+    def test_preview_result_uses_slots(self):
+        """Test PreviewResult stores its fields in slots, not an instance dict."""
+        result = PreviewResult(success=True, version=3)
+
+        assert not hasattr(result, "__dict__")
+        assert result.error is None
+        assert result == PreviewResult(success=True, version=3)
+        with pytest.raises(AttributeError):
+            result.unknown_field = 1
+
+    def test_preview_result_timestamp_built_from_ns(self):
+        """Test the result timestamp is derived from the recorded nanoseconds."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = PreviewCache(temp_dir)
+            engine = PreviewEngine(Path(temp_dir), cache)
+
+            before = time.time_ns()
+            result = engine.execute_sketch(Path(temp_dir) / "missing.py")
+
+            assert not result.success
+            assert result.timestamp_ns >= before
+            assert result.timestamp.timestamp() == pytest.approx(
+                result.timestamp_ns / 1e9
+            )
+            assert PreviewResult(success=True).timestamp is None
+
+    def test_preview_result_accepts_timestamp(self):
+        """Test PreviewResult can still be constructed from a datetime."""
+        timestamp = datetime(2024, 5, 17, 12, 30, 45, 123456)
+
+        result = PreviewResult(success=True, timestamp=timestamp)
+
+        assert result.timestamp == timestamp
+        assert result == PreviewResult(success=True, timestamp_ns=result.timestamp_ns)
+
     def test_virtual_environment_detection(self):
         """Test proper Python executable selection."""
         with tempfile.TemporaryDirectory() as temp_dir:
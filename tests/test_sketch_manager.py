@@ -4,6 +4,7 @@ Tests for sketch file management and operations.
 import os
 import shutil
 import tempfile
+import time
 from datetime import datetime
 from pathlib import Path
 
@@ -429,3 +430,176 @@ drawbot.size(400, 400)
 
             not_found2 = sm.find_sketch("wrong_name")
             assert not_found2 is None
+
+    def test_lists_examples_from_every_category(self):
+        """Test example categories are all scanned alongside flat sketches."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir)
+            sketches_dir = project_path / "sketches"
+            sketches_dir.mkdir()
+            (sketches_dir / "flat_sketch.py").write_text("# Flat sketch")
+
+            examples_dir = project_path / "examples"
+            for category in ("grids", "type", "color"):
+                category_dir = examples_dir / category
+                category_dir.mkdir(parents=True)
+                (category_dir / "demo.py").write_text("# Example")
+                (category_dir / "notes.txt").write_text("Not a sketch")
+            (examples_dir / "loose.py").write_text("# Not in a category")
+
+            from src.core.sketch_manager import SketchManager
+
+            sm = SketchManager(project_path)
+            all_sketches = sm.list_all_sketches()
+
+            names = {sketch["name"] for sketch in all_sketches}
+            assert names == {"flat_sketch", "grids_demo", "type_demo", "color_demo"}
+
+            grids = next(s for s in all_sketches if s["name"] == "grids_demo")
+            assert grids["path"] == examples_dir / "grids" / "demo.py"
+            assert grids["category"] == "Examples: Grids"
+            assert grids["source_type"] == "example"
+
+    def test_find_sketch_uses_index_until_directories_change(self):
+        """Test repeated lookups skip the directory walk until something changes."""
+        from unittest.mock import patch
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir)
+            sketches_dir = project_path / "sketches"
+            sketches_dir.mkdir()
+            (sketches_dir / "first.py").write_text("# First")
+
+            from src.core.sketch_manager import SketchManager
+
+            sm = SketchManager(project_path)
+
+            with patch.object(
+                sm, "list_all_sketches", wraps=sm.list_all_sketches
+            ) as listing:
+                assert sm.find_sketch("first") == sketches_dir / "first.py"
+                assert sm.find_sketch("first.py") == sketches_dir / "first.py"
+                assert listing.call_count == 1
+
+                # A new sketch is found even when it is not yet indexed
+                (sketches_dir / "second.py").write_text("# Second")
+                assert sm.find_sketch("second") == sketches_dir / "second.py"
+                assert listing.call_count == 2
+
+                # Deleted sketches are not returned from a stale index
+                (sketches_dir / "first.py").unlink()
+                assert sm.find_sketch("first") is None
+
+    def test_sketch_metadata_only_from_module_docstring(self):
+        """Test metadata comes from a leading docstring, not later strings."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sketch_path = Path(temp_dir) / "commented_sketch.py"
+            sketch_path.write_text(
+                "# A leading comment\n"
+                '"""\n'
+                "TITLE: Shouted Title\n"
+                "title: Ignored Duplicate\n"
+                "Tags: one,two\n"
+                '"""\n'
+            )
+            plain_path = Path(temp_dir) / "plain_sketch.py"
+            plain_path.write_text('x = 1\n"""Title: Not A Docstring"""\n')
+
+            from src.core.sketch_manager import SketchManager
+
+            sm = SketchManager(Path(temp_dir))
+            metadata = sm.get_sketch_metadata(sketch_path)
+            assert metadata["title"] == "Shouted Title"
+            assert metadata["tags"] == ["one", "two"]
+
+            plain = sm.get_sketch_metadata(plain_path)
+            assert plain["title"] == "Plain Sketch"
+            assert plain["tags"] == []
+
+    def test_syntax_check_cached_until_file_changes(self):
+        """Test syntax results are reused until the sketch is edited."""
+        from unittest.mock import patch
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sketch_path = Path(temp_dir) / "edited_sketch.py"
+            sketch_path.write_text("x = 1\n")
+
+            from src.core.sketch_manager import SketchManager
+
+            sm = SketchManager(Path(temp_dir))
+            assert sm.validate_sketch_syntax(sketch_path) is True
+
+            with patch("builtins.compile", side_effect=AssertionError) as compiler:
+                assert sm.validate_sketch_syntax(sketch_path) is True
+                assert compiler.call_count == 0
+
+            # Errors raised only when compiling are reported too
+            sketch_path.write_text("return 42\n")
+            assert sm.validate_sketch_syntax(sketch_path) is False
+
+            # Results are persisted under the project's cache directory
+            assert (Path(temp_dir) / "cache" / "validation").is_dir()
+
+    def test_list_all_sketches_reused_until_directories_change(self):
+        """Test the listing is cached until a sketch folder gains a file.
+
+        Subfolders are only rechecked once the listing TTL has passed.
+        """
+        from unittest.mock import patch
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir)
+            sketch_folder = project_path / "sketches" / "late_sketch"
+            sketch_folder.mkdir(parents=True)
+
+            from src.core import sketch_manager
+            from src.core.sketch_manager import SketchManager
+
+            sm = SketchManager(project_path)
+            assert sm.list_all_sketches() == []
+
+            scan_sketches = sketch_manager._scan_sketches_dir
+            with patch.object(
+                sketch_manager, "_scan_sketches_dir", wraps=scan_sketches
+            ) as scan:
+                assert sm.list_all_sketches() == []
+                assert scan.call_count == 0
+
+                # Only the sketch folder's mtime changes here
+                (sketch_folder / "late_sketch.py").write_text("# Late")
+                os.utime(sketch_folder, ns=(0, time.time_ns() + 1_000_000))
+                assert sm.list_all_sketches() == []
+                assert scan.call_count == 0
+
+                sm._all_sketches_checked -= sketch_manager.LISTING_TTL
+                listed = sm.list_all_sketches()
+                assert scan.call_count == 1
+
+                # New top-level sketches are listed without waiting
+                (project_path / "sketches" / "flat.py").write_text("# Flat")
+                os.utime(project_path / "sketches", ns=(0, time.time_ns() + 2_000_000))
+                relisted = sm.list_all_sketches()
+                assert scan.call_count == 2
+
+            assert [s["name"] for s in listed] == ["late_sketch"]
+            assert sorted(s["name"] for s in relisted) == ["flat", "late_sketch"]
+
+    def test_template_braces_kept_when_timestamp_filled(self):
+        """Test only the timestamp placeholder is substituted in templates."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir)
+            templates_dir = project_path / "templates"
+            templates_dir.mkdir()
+            (templates_dir / "braces.py").write_text(
+                '# Created: {timestamp}\ncolors = {"red": (1, 0, 0)}\n'
+                'label = f"{len(colors)} colors"\n'
+            )
+
+            from src.core.sketch_manager import SketchManager
+
+            sm = SketchManager(project_path)
+            content = sm.create_sketch("braces", template="braces").read_text()
+
+            assert "{timestamp}" not in content
+            assert 'colors = {"red": (1, 0, 0)}' in content
+            assert 'f"{len(colors)} colors"' in content
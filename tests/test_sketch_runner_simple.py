@@ -1,6 +1,7 @@
 """
 Simplified tests for sketch runner focusing on core functionality.
 """
+import os
 import tempfile
 import time
 from pathlib import Path
@@ -272,3 +273,475 @@ print("Sketch {i} completed")
                 output_file = project_path / f"sketch_{i}_output.txt"
                 assert output_file.exists()
                 assert output_file.read_text() == str(i * 2)
+
+    def test_persistent_worker_reused_between_runs(self):
+        """Test consecutive runs share one worker process."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir)
+            sketch_path = project_path / "pid_sketch.py"
+            sketch_path.write_text("import os\nprint(os.getpid())\n")
+
+            from src.core.sketch_runner import SketchRunner
+
+            runner = SketchRunner(project_path, persistent_worker=True)
+            try:
+                first = runner.run_sketch(sketch_path)
+                second = runner.run_sketch(sketch_path)
+            finally:
+                runner.close()
+
+            assert first.success and second.success
+            assert first.stdout == second.stdout
+
+    def test_persistent_worker_replaced_after_timeout(self):
+        """Test a worker killed by a timeout is replaced on the next run."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir)
+            slow_sketch = project_path / "slow_sketch.py"
+            slow_sketch.write_text("import time\ntime.sleep(3)\n")
+            quick_sketch = project_path / "quick_sketch.py"
+            quick_sketch.write_text("print('still working')\n")
+
+            from src.core.sketch_runner import SketchRunner
+
+            runner = SketchRunner(project_path, timeout=1.0, persistent_worker=True)
+            try:
+                timed_out = runner.run_sketch(slow_sketch)
+                result = runner.run_sketch(quick_sketch)
+            finally:
+                runner.close()
+
+            assert "timed out" in timed_out.error.lower()
+            assert result.success is True
+            assert "still working" in result.stdout
+
+    def test_persistent_worker_reloads_sketch_modules(self):
+        """Test helper modules next to a sketch are re-imported on each run."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir)
+            helper = project_path / "sketch_helper.py"
+            sketch_path = project_path / "uses_helper.py"
+            sketch_path.write_text("import sketch_helper\nprint(sketch_helper.VALUE)\n")
+
+            from src.core.sketch_runner import SketchRunner
+
+            runner = SketchRunner(project_path, persistent_worker=True)
+            try:
+                helper.write_text("VALUE = 'first'\n")
+                first = runner.run_sketch(sketch_path)
+                helper.write_text("VALUE = 'second'\n")
+                second = runner.run_sketch(sketch_path)
+            finally:
+                runner.close()
+
+            assert "first" in first.stdout
+            assert "second" in second.stdout
+
+    def test_worker_reuses_compiled_sketch_until_file_changes(self):
+        """Test sketch code objects are cached by path, mtime and size."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sketch_path = Path(temp_dir) / "cached_sketch.py"
+            sketch_path.write_text("x = 1\n")
+
+            from src.core.sketch_worker import load_code
+
+            first = load_code(str(sketch_path))
+            assert load_code(str(sketch_path)) is first
+
+            sketch_path.write_text("x = 22\n")
+            changed = load_code(str(sketch_path))
+            assert changed is not first
+
+            namespace = {}
+            exec(changed, namespace)
+            assert namespace["x"] == 22
+
+    def test_worker_reply_preserves_output_bytes(self):
+        """Test large and non-ASCII output survives the binary reply framing."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir)
+            sketch_path = project_path / "chatty_sketch.py"
+            sketch_path.write_text(
+                'print("ünïcødé \\"quoted\\" ✓")\nprint("x" * 200000)\n',
+                encoding="utf-8",
+            )
+
+            from src.core.sketch_runner import SketchRunner
+
+            for persistent in (True, False):
+                runner = SketchRunner(project_path, persistent_worker=persistent)
+                try:
+                    result = runner.run_sketch(sketch_path)
+                finally:
+                    runner.close()
+
+                assert result.success is True
+                lines = result.stdout.splitlines()
+                assert lines[0] == 'ünïcødé "quoted" ✓'
+                assert lines[1] == "x" * 200000
+
+    def test_worker_reply_carries_saved_output_paths(self):
+        """Test the paths a run saved survive the binary reply framing."""
+        from src.core.sketch_worker import REPLY_HEADER, decode_reply, encode_reply
+
+        for outputs in ([], ["/sketches/out.png", "/sketches/ünï_page_1.png"]):
+            reply = encode_reply(True, "out", "err", outputs)
+            decoded = decode_reply(
+                reply[: REPLY_HEADER.size], reply[REPLY_HEADER.size :]
+            )
+            assert decoded == {
+                "ok": True,
+                "stdout": "out",
+                "stderr": "err",
+                "outputs": outputs,
+            }
+
+    @pytest.mark.parametrize("pages", [1, 2, 5])
+    def test_worker_numbers_pages_from_one(self, stub_drawbot, tmp_path, pages):
+        """Test each newPage() and the final PDF save write one numbered page."""
+        from src.core.sketch_worker import (
+            _PageState,
+            _setup_drawbot_patches,
+            run_request,
+        )
+
+        sketch = tmp_path / "pages.py"
+        sketch.write_text(
+            "import drawBot\n"
+            f"for _ in range({pages}):\n"
+            "    drawBot.newPage(100, 100)\n"
+            "drawBot.saveImage('pages.pdf')\n"
+        )
+
+        state = _PageState()
+        drawbot = _setup_drawbot_patches(state)
+        response = run_request(
+            {
+                "sketch_path": str(sketch),
+                "sketch_dir": str(tmp_path),
+                "project_path": str(tmp_path),
+            },
+            state,
+            drawbot,
+        )
+
+        assert response["ok"], response["stderr"]
+        expected = [tmp_path / f"pages_page_{n}.png" for n in range(1, pages + 1)]
+        assert [page.name for page in state.page_images] == [p.name for p in expected]
+        for number, page in enumerate(expected, start=1):
+            assert page.read_text() == f"page {number}"
+        assert sorted(tmp_path.glob("pages_page_*.png")) == sorted(expected)
+        assert response["outputs"] == [str(p) for p in expected] + [
+            str(tmp_path / "pages.pdf")
+        ]
+
+    def test_python_executable_resolved_once(self):
+        """Test the interpreter lookup is memoized per runner."""
+        from unittest.mock import patch
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            from src.core.sketch_runner import SketchRunner
+
+            runner = SketchRunner(Path(temp_dir))
+            with patch.object(
+                runner, "_find_python_executable", wraps=runner._find_python_executable
+            ) as lookup:
+                first = runner._get_python_executable()
+                second = runner._get_python_executable()
+
+            assert first == second
+            assert lookup.call_count == 1
+
+    def test_validate_many_matches_single_validation(self):
+        """Test batch validation agrees with validating sketches one by one."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir)
+            from src.core.validation_cache import PARALLEL_COMPILE_MIN
+
+            # Enough sketches to go through the process pool
+            paths = []
+            for i in range(PARALLEL_COMPILE_MIN + 2):
+                sketch = project_path / f"sketch_{i}.py"
+                sketch.write_text(f"x = {i}\n" if i % 2 else f"x = ({i}\n")
+                paths.append(sketch)
+            paths.append(project_path / "missing.py")
+
+            from src.core.sketch_runner import SketchRunner
+
+            runner = SketchRunner(project_path)
+            batch = runner.validate_many(paths)
+
+            fresh = SketchRunner(project_path)
+            for path, result in zip(paths, batch):
+                single = fresh.validate_sketch_before_run(path)
+                assert result.sketch_path == path
+                assert result.success == single.success
+                assert result.error == single.error
+            assert [r.success for r in batch[:4]] == [False, True, False, True]
+            assert "not found" in batch[-1].error
+
+    def test_find_output_files_orders_pages_numerically(self):
+        """Test multi-page output is found in one pass and sorted by page."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_dir = Path(temp_dir)
+            for name in ("page_10.png", "page_2.png", "page_1.png", "notes.txt"):
+                (output_dir / name).write_bytes(b"")
+            (output_dir / "page_x.png").write_bytes(b"")
+
+            from src.core.sketch_runner import SketchRunner
+
+            runner = SketchRunner(output_dir)
+            primary, files = runner._find_output_files([output_dir])
+
+            assert [f.name for f in files] == [
+                "page_1.png",
+                "page_2.png",
+                "page_10.png",
+            ]
+            assert primary == output_dir / "page_1.png"
+            assert runner._find_output_files([output_dir / "missing"]) == (None, None)
+
+    def test_find_output_files_falls_back_in_order(self):
+        """Test later directories are used only when earlier ones have no output."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            empty_dir, first_dir, second_dir = (root / n for n in ("a", "b", "c"))
+            for directory in (empty_dir, first_dir, second_dir):
+                directory.mkdir()
+            (first_dir / "first.png").write_bytes(b"")
+            (second_dir / "second.png").write_bytes(b"")
+
+            from src.core.sketch_runner import SketchRunner
+
+            runner = SketchRunner(root)
+            primary, files = runner._find_output_files(
+                [empty_dir, root / "missing", empty_dir, first_dir, second_dir]
+            )
+
+            assert primary == first_dir / "first.png"
+            assert files == [primary]
+
+    def test_find_output_files_ignores_files_from_earlier_runs(self):
+        """Test unchanged files recorded before a run are not reported."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_dir = Path(temp_dir)
+            stale = output_dir / "stale.png"
+            stale.write_bytes(b"old")
+
+            from src.core.sketch_runner import SketchRunner
+
+            runner = SketchRunner(output_dir)
+            snapshot = runner._snapshot_outputs([output_dir])
+            assert runner._find_output_files([output_dir], snapshot) == (None, None)
+
+            # Rewritten and newly created files both count as output
+            fresh = output_dir / "fresh.png"
+            fresh.write_bytes(b"new")
+            primary, files = runner._find_output_files([output_dir], snapshot)
+            assert files == [fresh]
+
+            os.utime(stale, ns=(0, snapshot[str(stale)][0] + 1))
+            fresh.unlink()
+            assert runner._find_output_files([output_dir], snapshot)[0] == stale
+
+    def test_find_output_files_sees_rewrite_within_one_timestamp(self):
+        """Test a rewrite keeping the old mtime still counts when its size changes."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_dir = Path(temp_dir)
+            output = output_dir / "sketch_output.png"
+            output.write_bytes(b"old")
+
+            from src.core.sketch_runner import SketchRunner
+
+            runner = SketchRunner(output_dir)
+            snapshot = runner._snapshot_outputs([output_dir])
+
+            # As on a filesystem with coarse timestamps
+            mtime_ns = output.stat().st_mtime_ns
+            output.write_bytes(b"rewritten")
+            os.utime(output, ns=(mtime_ns, mtime_ns))
+
+            assert runner._find_output_files([output_dir], snapshot)[0] == output
+
+    def test_unchanged_looking_rewrite_still_reported(self):
+        """Test a successful run reports the newest output if none looks new."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir).resolve()
+            output = project_path / "sketch_output.png"
+            output.write_bytes(b"old")
+            sketch_path = project_path / "rewrite.py"
+            # Same size, inode and mtime as before the run
+            sketch_path.write_text(
+                "import os\n"
+                "st = os.stat('sketch_output.png')\n"
+                "with open('sketch_output.png', 'r+b') as f:\n"
+                "    f.write(b'new')\n"
+                "os.utime('sketch_output.png', ns=(st.st_atime_ns, st.st_mtime_ns))\n"
+            )
+
+            from src.core.sketch_runner import SketchRunner
+
+            runner = SketchRunner(project_path)
+            try:
+                result = runner.run_sketch(sketch_path)
+            finally:
+                runner.close()
+
+            assert result.success is True
+            assert result.output_path == output
+            assert output.read_bytes() == b"new"
+
+    def test_captured_output_keeps_latest_output(self):
+        """Test verbose sketches keep only the tail of their output."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir)
+            sketch_path = project_path / "verbose_sketch.py"
+            sketch_path.write_text(
+                "for i in range(3):\n"
+                "    print(str(i) * (1024 * 1024))\n"
+                "raise ValueError('last words')\n"
+            )
+
+            from src.core.sketch_runner import SketchRunner
+            from src.core.sketch_worker import MAX_CAPTURED_OUTPUT
+
+            for persistent in (True, False):
+                runner = SketchRunner(project_path, persistent_worker=persistent)
+                try:
+                    result = runner.run_sketch(sketch_path)
+                finally:
+                    runner.close()
+
+                assert result.success is False
+                assert "earlier characters of output dropped" in result.stdout
+                assert len(result.stdout) < MAX_CAPTURED_OUTPUT + 100
+                assert result.stdout.rstrip().endswith("2" * 1000)
+                assert "last words" in result.stderr
+
+    def test_output_directory_created_once_per_runner(self):
+        """Test a missing output directory is created by the runner once."""
+        from unittest.mock import patch
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir)
+            sketch_path = project_path / "quiet_sketch.py"
+            sketch_path.write_text("x = 1\n")
+            output_dir = project_path / "output"
+
+            from src.core import sketch_runner
+            from src.core.sketch_runner import SketchRunner
+
+            runner = SketchRunner(project_path)
+            try:
+                with patch.object(
+                    sketch_runner.os, "makedirs", wraps=os.makedirs
+                ) as makedirs:
+                    for _ in range(2):
+                        result = runner.run_sketch(sketch_path, output_dir=output_dir)
+                        assert result.success is True
+            finally:
+                runner.close()
+
+            assert output_dir.is_dir()
+            assert makedirs.call_count == 1
+
+    def test_sketch_reading_stdin_does_not_break_worker(self):
+        """Test input() in a sketch cannot consume the worker's requests."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir)
+            reader = project_path / "reader.py"
+            reader.write_text("import sys\nprint(repr(sys.stdin.read()))\ninput()\n")
+            greeter = project_path / "greeter.py"
+            greeter.write_text("print('still serving')\n")
+
+            from src.core.sketch_runner import SketchRunner
+
+            runner = SketchRunner(project_path, timeout=5.0, persistent_worker=True)
+            try:
+                result = runner.run_sketch(reader)
+                assert result.success is False
+                assert result.stdout.strip() == "''"
+                assert "EOFError" in result.stderr
+
+                for _ in range(2):
+                    result = runner.run_sketch(greeter)
+                    assert result.success is True
+                    assert result.stdout.strip() == "still serving"
+            finally:
+                runner.close()
+
+    def test_worker_restores_working_directory(self):
+        """Test a run leaves the worker in the directory it started in."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sketch_dir = Path(temp_dir).resolve() / "elsewhere"
+            sketch_dir.mkdir()
+            sketch_path = sketch_dir / "wander.py"
+            sketch_path.write_text(
+                "import os\nos.chdir(os.path.dirname(os.getcwd()))\n"
+            )
+
+            from src.core.sketch_worker import _PageState, run_request
+
+            before = os.getcwd()
+            response = run_request(
+                {
+                    "sketch_path": str(sketch_path),
+                    "sketch_dir": str(sketch_dir),
+                    "project_path": str(sketch_dir),
+                },
+                _PageState(),
+                None,
+            )
+
+            assert response["ok"] is True
+            assert os.getcwd() == before
+
+    def test_concurrent_runs_sharing_output_dir_keep_own_outputs(self, stub_drawbot):
+        """Test overlapping runs saving to one directory only report their files."""
+        import threading
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir).resolve()
+            # Each sketch waits for the other to start, so the runs overlap;
+            # "first" saves early but finishes last, after "second" has saved
+            # a newer file to the same directory
+            for name, other, before, after in (
+                ("first", "second", 0, 0.6),
+                ("second", "first", 0.2, 0),
+            ):
+                (project_path / f"{name}.py").write_text(
+                    "import os, time\n"
+                    "import drawBot\n"
+                    f"open({name + '.started'!r}, 'w').close()\n"
+                    "deadline = time.monotonic() + 10\n"
+                    f"while not os.path.exists({other + '.started'!r}):\n"
+                    "    assert time.monotonic() < deadline, 'runs did not overlap'\n"
+                    "    time.sleep(0.01)\n"
+                    f"time.sleep({before})\n"
+                    f"drawBot.saveImage({name + '.png'!r})\n"
+                    f"time.sleep({after})\n"
+                )
+
+            from src.core.sketch_runner import SketchRunner
+
+            runner = SketchRunner(project_path)
+            results = {}
+
+            def run(name):
+                results[name] = runner.run_sketch(project_path / f"{name}.py")
+
+            try:
+                threads = [
+                    threading.Thread(target=run, args=(name,))
+                    for name in ("first", "second")
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            finally:
+                runner.close()
+
+            for name in ("first", "second"):
+                assert results[name].success is True, results[name].error
+                assert [p.name for p in results[name].output_files] == [f"{name}.png"]
@@ -0,0 +1,159 @@
+"""
+Tests for ThumbnailGenerator - Background thumbnail task queue.
+"""
+import asyncio
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.core.preview_cache import PreviewCache
+from src.core.preview_engine import PreviewEngine, PreviewResult
+from src.core.thumbnail_generator import TaskPriority, ThumbnailGenerator
+
+
+class TestThumbnailGenerator:
+    """Test suite for ThumbnailGenerator functionality."""
+
+    def test_tasks_dequeued_by_priority_then_age(self):
+        """Test the queue yields higher priorities first, oldest first within one."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir)
+            cache = PreviewCache(project_path / "cache")
+            engine = PreviewEngine(project_path, cache)
+            generator = ThumbnailGenerator(engine)
+            try:
+                queued = [
+                    ("background", TaskPriority.LOW),
+                    ("example_a", TaskPriority.MEDIUM),
+                    ("sketch_a", TaskPriority.HIGH),
+                    ("example_b", TaskPriority.MEDIUM),
+                    ("sketch_b", TaskPriority.HIGH),
+                ]
+                for name, priority in queued:
+                    path = project_path / f"{name}.py"
+                    assert generator.queue_sketch(name, path, priority, force=True)
+
+                # Names already waiting in the queue are not queued twice
+                assert not generator.queue_sketch(
+                    "example_a", project_path / "example_a.py", force=True
+                )
+
+                status = generator.get_queue_status()
+                assert status["total_queued"] == 5
+                assert status["by_priority"] == {"high": 2, "medium": 2, "low": 1}
+
+                order = []
+                while True:
+                    task = generator.get_next_task()
+                    if task is None:
+                        break
+                    order.append(task.sketch_name)
+
+                assert order == [
+                    "sketch_a",
+                    "sketch_b",
+                    "example_a",
+                    "example_b",
+                    "background",
+                ]
+                # A dequeued name can be queued again
+                assert generator.queue_sketch(
+                    "sketch_a", project_path / "sketch_a.py", force=True
+                )
+            finally:
+                engine.close()
+                cache.close()
+
+    @pytest.mark.asyncio
+    async def test_idle_workers_wake_when_tasks_are_queued(self):
+        """Test queued tasks are picked up without waiting for a poll interval."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir)
+            cache = PreviewCache(project_path / "cache")
+            engine = PreviewEngine(project_path, cache)
+            generator = ThumbnailGenerator(engine)
+            processed = asyncio.Queue()
+
+            async def record(task, worker_name):
+                processed.put_nowait(task.sketch_name)
+
+            try:
+                with patch.object(generator, "_process_task", side_effect=record):
+                    await generator.start()
+                    await asyncio.sleep(0.05)  # Let the workers go idle
+
+                    generator.queue_sketch(
+                        "from_loop", project_path / "a.py", force=True
+                    )
+                    assert await asyncio.wait_for(processed.get(), 0.2) == "from_loop"
+
+                    # Queued from another thread, as sync endpoints may do
+                    thread = threading.Thread(
+                        target=generator.queue_sketch,
+                        args=("from_thread", project_path / "b.py"),
+                        kwargs={"force": True},
+                    )
+                    thread.start()
+                    thread.join()
+                    assert await asyncio.wait_for(processed.get(), 0.2) == "from_thread"
+
+                    await asyncio.wait_for(generator.stop(), 1.0)
+            finally:
+                engine.close()
+                cache.close()
+
+    @pytest.mark.asyncio
+    async def test_workers_execute_sketches_concurrently(self):
+        """Test sketch execution does not block the event loop or other workers."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir)
+            cache = PreviewCache(project_path / "cache")
+            engine = PreviewEngine(project_path, cache)
+            generator = ThumbnailGenerator(engine, max_concurrent_tasks=2)
+            finished = asyncio.Queue()
+            generator.add_completion_callback(finished.put_nowait)
+
+            def slow_execute(sketch_path, sketch_name, wait_for_thumbnail=False):
+                time.sleep(0.3)
+                return PreviewResult(success=True, thumbnail_url=f"/{sketch_name}")
+
+            try:
+                for name in ("first", "second"):
+                    sketch_path = project_path / f"{name}.py"
+                    sketch_path.write_text("x = 1\n")
+                    generator.queue_sketch(name, sketch_path, force=True)
+
+                with patch.object(engine, "execute_sketch", side_effect=slow_execute):
+                    started = time.monotonic()
+                    await generator.start()
+                    # The loop stays responsive while both sketches run
+                    await asyncio.sleep(0.1)
+                    assert time.monotonic() - started < 0.25
+
+                    results = [
+                        await asyncio.wait_for(finished.get(), 1.0) for _ in range(2)
+                    ]
+                    assert time.monotonic() - started < 0.55
+                    await generator.stop()
+
+                assert all(result.success for result in results)
+                assert {r.thumbnail_url for r in results} == {"/first", "/second"}
+            finally:
+                engine.close()
+                cache.close()
+
+    def test_task_creation_time_kept_in_nanoseconds(self):
+        """Test tasks record creation in epoch nanoseconds with a datetime view."""
+        from datetime import datetime
+
+        from src.core.thumbnail_generator import ThumbnailTask
+
+        before = time.time_ns()
+        task = ThumbnailTask("sketch", Path("sketch.py"), TaskPriority.HIGH)
+
+        assert before <= task.created_at_ns <= time.time_ns()
+        assert task.created_at == datetime.fromtimestamp(task.created_at_ns / 1e9)
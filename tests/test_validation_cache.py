@@ -0,0 +1,83 @@
+"""
+Tests for ValidationCache - persistent syntax check results.
+"""
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from src.core import validation_cache
+from src.core.validation_cache import ValidationCache
+
+
+class TestValidationCache:
+    """Test suite for ValidationCache functionality."""
+
+    def test_reports_syntax_errors(self):
+        """Test valid sources return None and invalid ones a message."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = ValidationCache(Path(temp_dir))
+
+            assert cache.check(b"x = 1\n", "valid.py") is None
+            error = cache.check(b"x = (\n", "invalid.py")
+            assert error.startswith("SyntaxError:")
+            assert "at line 1" in error
+
+    def test_results_persist_across_instances(self):
+        """Test a new cache for the same directory skips compiling known sources."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_dir = Path(temp_dir) / "validation"
+            first_error = ValidationCache(cache_dir).check(b"def (:\n", "a.py")
+
+            reopened = ValidationCache(cache_dir)
+            with patch("builtins.compile", side_effect=AssertionError) as compiler:
+                # Same content under another name is a cache hit too
+                assert reopened.check(b"def (:\n", "b.py") == first_error
+                assert compiler.call_count == 0
+
+    def test_least_recently_used_results_pruned(self):
+        """Test the cache stays bounded and keeps recently used results."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = ValidationCache(Path(temp_dir), max_entries=4)
+
+            cache.check(b"kept = 0\n", "kept.py")
+            for i in range(1, 4):
+                cache.check(f"x = {i}\n".encode(), "edit.py")
+            for entry in cache.cache_dir.iterdir():
+                os.utime(entry, ns=(0, 0))
+            # Reading a result marks it as recently used
+            cache.check(b"kept = 0\n", "kept.py")
+
+            # A fifth result goes over the cap and prunes down to three
+            cache.check(b"x = 4\n", "edit.py")
+            assert len(list(cache.cache_dir.iterdir())) == 3
+
+            with patch("builtins.compile", side_effect=AssertionError):
+                assert cache.check(b"kept = 0\n", "kept.py") is None
+                assert cache.check(b"x = 4\n", "edit.py") is None
+
+    def test_check_many_reports_undecodable_sources(self):
+        """Test sources that cannot be compiled are returned as exceptions."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = ValidationCache(Path(temp_dir))
+
+            results = cache.check_many([(b"x = 1\n", "a.py"), (b"\xff\xfe", "b.py")])
+
+            assert results[0] is None
+            assert isinstance(results[1], UnicodeDecodeError)
+
+    def test_check_many_batches_share_one_pool(self):
+        """Test large batches reuse one worker pool across caches and calls."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            count = validation_cache.PARALLEL_COMPILE_MIN
+            pools = []
+            for batch in range(2):
+                cache = ValidationCache(Path(temp_dir) / f"cache_{batch}")
+                sources = [
+                    (f"x = {batch}, {i}\n".encode(), f"s{i}.py") for i in range(count)
+                ]
+                assert cache.check_many(sources) == [None] * count
+                pools.append(validation_cache._compile_pool)
+
+            assert pools[0] is not None
+            assert pools[0] is pools[1]